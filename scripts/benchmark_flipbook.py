@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Time build_flipbook.py at several --jobs settings and check the outputs match."""
+import argparse
+import filecmp
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BUILD_SCRIPT = ROOT / "scripts" / "build_flipbook.py"
+
+
+def default_jobs() -> list[int]:
+    cores = os.cpu_count() or 1
+    jobs = [1]
+    while jobs[-1] * 2 <= cores:
+        jobs.append(jobs[-1] * 2)
+    if jobs[-1] != cores:
+        jobs.append(cores)
+    return jobs
+
+
+def same_tree(left: Path, right: Path) -> bool:
+    comparison = filecmp.dircmp(left, right)
+    if comparison.left_only or comparison.right_only or comparison.funny_files:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(left, right, comparison.common_files, shallow=False)
+    if mismatch or errors:
+        return False
+    return all(same_tree(left / sub, right / sub) for sub in comparison.common_dirs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parallel flipbook builds")
+    parser.add_argument("--input", required=True, help="Path to source PDF")
+    parser.add_argument("--jobs", type=int, nargs="+", default=None, help="Job counts to time (default: 1, 2, 4, ... cores)")
+    parser.add_argument("--dpi", type=int, default=150, help="DPI for PDF rendering")
+    parser.add_argument("--format", default="jpg", help="Image format: jpg|png|webp")
+    parser.add_argument("--render-window", type=int, default=4, help="Pages rendered per poppler call")
+    args = parser.parse_args()
+
+    job_counts = args.jobs or default_jobs()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for jobs in job_counts:
+            out_dir = Path(tmp) / f"jobs-{jobs}" / "benchmark"
+            cmd = [
+                sys.executable,
+                str(BUILD_SCRIPT),
+                "--input", args.input,
+                "--out", str(out_dir),
+                "--title", "Benchmark",
+                "--format", args.format,
+                "--dpi", str(args.dpi),
+                "--render-window", str(args.render_window),
+                "--thumbs",
+                "--jobs", str(jobs),
+            ]
+            start = time.perf_counter()
+            subprocess.check_call(cmd, stdout=subprocess.DEVNULL)
+            results.append((jobs, time.perf_counter() - start, out_dir))
+
+        baseline_jobs, baseline, baseline_dir = results[0]
+        print(f"{'jobs':>5} {'seconds':>9} {'speedup':>8}  output")
+        for jobs, elapsed, out_dir in results:
+            identical = "identical" if same_tree(baseline_dir, out_dir) else "DIFFERS"
+            print(f"{jobs:>5} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x  {identical} to jobs={baseline_jobs}")
+
+
+if __name__ == "__main__":
+    main()
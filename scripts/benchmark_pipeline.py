@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Benchmark the data and flipbook pipelines on synthetic inputs and compare with a baseline.
+
+Every case runs the real script in a subprocess on seeded, generated inputs
+and reads wall time and peak RSS per stage from the run_metrics.json the
+script writes. Each scale is run twice. The cold run has fresh caches and a
+full rebuild; the warm run repeats it with the caches the cold run left.
+Results are compared with a stored baseline, and the suite exits non-zero
+when a stage got slower or bigger than the thresholds allow.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PYTHON_DIR = ROOT / "scripts" / "python"
+GENERATE_SCRIPT = PYTHON_DIR / "generate_json.py"
+BUILD_SCRIPT = ROOT / "scripts" / "build_flipbook.py"
+DEFAULT_WORK_DIR = ROOT / "data" / "private" / "benchmarks"
+RESULTS_VERSION = 1
+
+sys.path.insert(0, str(PYTHON_DIR))
+from synthetic_operations import generate_operations, write_workbook  # noqa: E402
+from synthetic_pdf import BASE_PAGES, write_pdf  # noqa: E402
+
+
+def machine() -> dict:
+    import polars as pl
+
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+    }
+
+
+def scale_label(scale: float) -> str:
+    return f"{scale:g}x"
+
+
+def workbook_input(work_dir: Path, scale: float, seed: int) -> dict:
+    """Generate the workbook for a scale once per seed; later runs reuse it"""
+    stem = f"operations-{scale_label(scale)}-seed{seed}"
+    path = work_dir / "inputs" / f"{stem}.xlsx"
+    meta_path = path.with_suffix(".json")
+    cache_dir = work_dir / "inputs" / f"{stem}.cache"
+    if path.exists() and meta_path.exists():
+        return {**json.loads(meta_path.read_text(encoding="utf-8")), "path": path, "cacheDir": cache_dir}
+
+    start = time.perf_counter()
+    df = generate_operations(scale, seed)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    kind = write_workbook(df, str(path), str(cache_dir))
+    meta = {"rows": df.height, "kind": kind}
+    meta_path.write_text(json.dumps(meta) + "\n", encoding="utf-8")
+    print(f"Generated {df.height} rows ({kind}) in {time.perf_counter() - start:.1f}s: {path.name}")
+    return {**meta, "path": path, "cacheDir": cache_dir}
+
+
+def pdf_input(work_dir: Path, scale: float, seed: int) -> dict:
+    pages = max(1, round(BASE_PAGES * scale))
+    path = work_dir / "inputs" / f"catalog-{scale_label(scale)}-seed{seed}.pdf"
+    if not path.exists():
+        start = time.perf_counter()
+        write_pdf(path, pages, seed)
+        print(f"Generated {pages} pages in {time.perf_counter() - start:.1f}s: {path.name}")
+    return {"rows": pages, "path": path}
+
+
+def read_metrics(path: Path) -> dict:
+    metrics = json.loads(path.read_text(encoding="utf-8"))
+    if metrics["summary"].get("status") != "ok":
+        raise RuntimeError(f"{metrics['script']} finished with status {metrics['summary'].get('status')} ({path})")
+    return {
+        "wallSeconds": metrics["wallSeconds"],
+        "peakRssMb": metrics["peakRssMb"],
+        "stages": {
+            stage["name"]: {"wallSeconds": stage["wallSeconds"], "peakRssMb": stage["peakRssMb"]}
+            for stage in metrics["stages"]
+        },
+        "caches": {name: counts["hitRate"] for name, counts in metrics["caches"].items()},
+    }
+
+
+def run_logged(cmd: list[str], log_path: Path, env: dict | None = None) -> None:
+    with open(log_path, "w", encoding="utf-8") as log:
+        code = subprocess.call(cmd, stdout=log, stderr=subprocess.STDOUT, env=env)
+    if code:
+        raise RuntimeError(f"{Path(cmd[1]).name} exited with {code}; see {log_path}")
+
+
+def bench_data(work_dir: Path, scale: float, seed: int) -> dict:
+    workbook = workbook_input(work_dir, scale, seed)
+    run_dir = work_dir / "runs" / f"data-{scale_label(scale)}"
+    shutil.rmtree(run_dir, ignore_errors=True)
+    (run_dir / "logs").mkdir(parents=True)
+    env = {
+        **os.environ,
+        "EXCEL_PATH": str(workbook["path"]),
+        "EXCEL_CACHE_DIR": str(workbook["cacheDir"]),
+        "OUTPUT_DIR": str(run_dir / "out"),
+        "LOG_DIR": str(run_dir / "logs"),
+        "RESOLUTION_CACHE_JSON": str(run_dir / "resolution_cache.json"),
+        "SKIP_GITHUB_PUSH": "true",
+    }
+    results = {}
+    for phase in ("cold", "warm"):
+        metrics_path = run_dir / f"{phase}.run_metrics.json"
+        phase_env = {**env, "RUN_METRICS_JSON": str(metrics_path)}
+        if phase == "cold":
+            # A seeded cache stands in for a workbook Excel can't hold, so it can't be re-parsed
+            phase_env["FULL_REBUILD"] = "true"
+            phase_env["REFRESH_EXCEL_CACHE"] = "true" if workbook["kind"] == "xlsx" else "false"
+        run_logged([sys.executable, str(GENERATE_SCRIPT)], run_dir / f"{phase}.log", phase_env)
+        results[f"data:{scale_label(scale)}:{phase}"] = {"rows": workbook["rows"], "input": workbook["kind"], **read_metrics(metrics_path)}
+    return results
+
+
+def bench_flipbook(work_dir: Path, scale: float, seed: int, jobs: int) -> dict:
+    pdf = pdf_input(work_dir, scale, seed)
+    run_dir = work_dir / "runs" / f"flipbook-{scale_label(scale)}"
+    shutil.rmtree(run_dir, ignore_errors=True)
+    run_dir.mkdir(parents=True)
+    results = {}
+    for phase in ("cold", "warm"):
+        metrics_path = run_dir / f"{phase}.run_metrics.json"
+        cmd = [
+            sys.executable,
+            str(BUILD_SCRIPT),
+            "--input", str(pdf["path"]),
+            "--out", str(run_dir / "out" / "benchmark"),
+            "--title", "Benchmark",
+            "--thumbs",
+            "--thumb-atlas",
+            "--jobs", str(jobs),
+            "--metrics", str(metrics_path),
+        ]
+        run_logged(cmd, run_dir / f"{phase}.log")
+        results[f"flipbook:{scale_label(scale)}:{phase}"] = {"rows": pdf["rows"], **read_metrics(metrics_path)}
+    return results
+
+
+def regressions(current: dict, baseline: dict, args) -> list[str]:
+    """Stages (and run totals) slower or bigger than the baseline by more than the thresholds"""
+    found = []
+    for case, result in current["cases"].items():
+        previous = baseline["cases"].get(case)
+        if not previous:
+            continue
+        pairs = [("total", result, previous)] + [
+            (name, stage, previous["stages"][name])
+            for name, stage in result["stages"].items()
+            if name in previous["stages"]
+        ]
+        for name, now, before in pairs:
+            seconds, base_seconds = now["wallSeconds"], before["wallSeconds"]
+            if seconds > base_seconds * (1 + args.threshold) and seconds - base_seconds > args.min_seconds:
+                found.append(f"{case} {name}: {base_seconds:.2f}s -> {seconds:.2f}s ({seconds / max(base_seconds, 1e-9) - 1:+.0%})")
+            memory, base_memory = now["peakRssMb"], before["peakRssMb"]
+            if memory > base_memory * (1 + args.memory_threshold) and memory - base_memory > args.min_mb:
+                found.append(f"{case} {name}: {base_memory:.0f} MB -> {memory:.0f} MB ({memory / max(base_memory, 1e-9) - 1:+.0%})")
+    return found
+
+
+def print_results(current: dict, baseline: dict | None) -> None:
+    print(f"{'case':<24} {'rows':>9} {'seconds':>9} {'peak MB':>8} {'baseline s':>11} {'change':>8}")
+    for case, result in current["cases"].items():
+        previous = (baseline or {}).get("cases", {}).get(case)
+        before = f"{previous['wallSeconds']:>11.2f} {result['wallSeconds'] / max(previous['wallSeconds'], 1e-9) - 1:>+8.0%}" if previous else f"{'-':>11} {'':>8}"
+        print(f"{case:<24} {result['rows']:>9} {result['wallSeconds']:>9.2f} {result['peakRssMb']:>8.0f} {before}")
+        slowest = sorted(result["stages"].items(), key=lambda item: -item[1]["wallSeconds"])[:3]
+        print("    slowest: " + ", ".join(f"{name} {stage['wallSeconds']:.2f}s" for name, stage in slowest))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the data and flipbook pipelines on synthetic inputs")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100, 1000], help="Workbook sizes as multiples of today's rows")
+    parser.add_argument("--pdf-scales", type=float, nargs="+", default=[1, 10], help=f"PDF sizes as multiples of {BASE_PAGES} pages")
+    parser.add_argument("--skip-data", action="store_true", help="Skip the generate_json.py cases")
+    parser.add_argument("--skip-flipbook", action="store_true", help="Skip the build_flipbook.py cases")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the synthetic inputs")
+    parser.add_argument("--jobs", type=int, default=0, help="build_flipbook.py worker processes (0 = one per CPU core)")
+    parser.add_argument("--work-dir", default=str(DEFAULT_WORK_DIR), help="Generated inputs, run outputs and results")
+    parser.add_argument("--baseline", default=None, help="Baseline results to compare with (default: <work-dir>/baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline instead of failing on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown per stage (0.25 = 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed peak RSS growth per stage")
+    parser.add_argument("--min-mb", type=float, default=64, help="Ignore peak RSS growth smaller than this many MB")
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir)
+    baseline_path = Path(args.baseline) if args.baseline else work_dir / "baseline.json"
+    current = {"version": RESULTS_VERSION, "seed": args.seed, "machine": machine(), "cases": {}}
+    for scale in [] if args.skip_data else args.scales:
+        print(f"Data pipeline at {scale_label(scale)}...")
+        current["cases"].update(bench_data(work_dir, scale, args.seed))
+    for scale in [] if args.skip_flipbook else args.pdf_scales:
+        print(f"Flipbook build at {scale_label(scale)}...")
+        current["cases"].update(bench_flipbook(work_dir, scale, args.seed, args.jobs))
+
+    results_path = work_dir / "results.json"
+    results_path.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else None
+    if baseline and baseline.get("seed") != args.seed:
+        print(f"⚠️  Baseline was generated with seed {baseline.get('seed')}; ignoring it")
+        baseline = None
+    print_results(current, baseline)
+
+    if args.update_baseline or baseline is None:
+        merged = {**current, "cases": {**(baseline or {}).get("cases", {}), **current["cases"]}}
+        baseline_path.write_text(json.dumps(merged, indent=2) + "\n", encoding="utf-8")
+        print(f"✅ Stored baseline at {baseline_path}")
+        return
+
+    if baseline["machine"] != current["machine"]:
+        print(f"⚠️  Baseline was recorded on a different machine ({baseline['machine']['platform']}, {baseline['machine']['cpus']} CPUs)")
+    found = regressions(current, baseline, args)
+    if found:
+        print("❌ Regressions against the baseline:")
+        for line in found:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"✅ No stage regressed by more than {args.threshold:.0%} (time) / {args.memory_threshold:.0%} (memory)")
+
+
+if __name__ == "__main__":
+    main()
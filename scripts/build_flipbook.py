@@ -1,13 +1,44 @@
 import argparse
+import hashlib
+import math
+import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import date
 import json
+import sys
+import xml.etree.ElementTree as ET
 
+import numpy as np
 from pdf2image import convert_from_path
+from PIL import Image
 from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+from flipbook_encoding import encode_image, save_image
+from flipbook_facets import FACETS_FILE, validation_issues, write_facet_index
+from flipbook_search import SEARCH_INDEX_FILE, build_search_index, extract_page_range, read_search_index
+
+# Stage metrics are shared with the data pipeline in scripts/python
+sys.path.insert(0, str(Path(__file__).resolve().parent / "python"))
+from run_metrics import PROFILE_MODES, RunMetrics  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
 
 SUPPORTED_FORMATS = {"jpg", "jpeg", "png", "webp"}
+VARIANT_FORMATS = {"avif", "webp", "jpg", "png"}
+VARIANTS_DIR = "variants"
+TILES_DIR = "tiles"
+DZI_NAMESPACE = "http://schemas.microsoft.com/deepzoom/2008"
+FINGERPRINTS_FILE = "fingerprints.json"
+ATLAS_DIR = "atlas"
+# Sprite sheets stay within what every browser decodes comfortably
+ATLAS_MAX_SIZE = 4096
+# Bump when rendering or encoding changes so every page is rebuilt
+RENDER_VERSION = 2
+# Longest side the page is reduced to before picking its placeholder color
+PLACEHOLDER_SIZE = 64
 
 
 def parse_args():
@@ -21,7 +52,95 @@ def parse_args():
     parser.add_argument("--page-digits", type=int, default=4, help="Zero pad length for page filenames")
     parser.add_argument("--thumbs", action="store_true", help="Generate thumbnail images")
     parser.add_argument("--thumb-width", type=int, default=320, help="Thumbnail width in pixels")
-    return parser.parse_args()
+    parser.add_argument("--thumb-atlas", action="store_true", help="Also pack the thumbnails into sprite sheets (needs --thumbs)")
+    parser.add_argument("--atlas-format", choices=["webp", "jpg"], default="webp", help="Image format of the thumbnail sprite sheets")
+    parser.add_argument(
+        "--render-window",
+        type=int,
+        default=4,
+        help="Pages rendered per poppler call; only this many pages are held in memory (0 = whole PDF at once)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes rendering page ranges in parallel (0 = one per CPU core)",
+    )
+    parser.add_argument("--full-rebuild", action="store_true", help="Re-render every page even if unchanged")
+    parser.add_argument(
+        "--variant-widths",
+        default="",
+        help="Comma-separated widths for responsive page variants, e.g. 320,768,1280,2048 (default: none)",
+    )
+    parser.add_argument(
+        "--variant-formats",
+        default="avif,webp,jpg",
+        help="Comma-separated variant formats, best first (avif is skipped if Pillow can't encode it)",
+    )
+    parser.add_argument("--tiles", action="store_true", help="Generate a Deep Zoom (DZI) tile pyramid per page")
+    parser.add_argument("--tile-dpi", type=int, default=400, help="DPI of the render the tile pyramid is cut from")
+    parser.add_argument("--tile-size", type=int, default=256, help="Tile edge length in pixels")
+    parser.add_argument("--tile-overlap", type=int, default=1, help="Pixels each tile overlaps its neighbours")
+    parser.add_argument(
+        "--encode-mode",
+        choices=["fixed", "optimize", "search"],
+        default="fixed",
+        help="fixed: quality 90; optimize: progressive/optimized, no metadata; search: lowest quality meeting --target-ssim",
+    )
+    parser.add_argument("--target-ssim", type=float, default=0.98, help="SSIM against the lossless render required in search mode")
+    parser.add_argument("--min-quality", type=int, default=40, help="Lowest quality the search may pick")
+    parser.add_argument("--max-page-bytes", type=int, default=0, help="Byte budget per page image in search mode (0 = none)")
+    parser.add_argument(
+        "--report-savings",
+        action="store_true",
+        help="Also encode every image at fixed quality to report the bytes saved (doubles encode time outside fixed mode)",
+    )
+    parser.add_argument(
+        "--metrics",
+        default=None,
+        help="Where to write run_metrics.json (default: data/private/metrics/flipbook-<docKey>.run_metrics.json)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cpu",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile each stage with cProfile (cpu, the default) or tracemalloc (memory); reports go next to the metrics file",
+    )
+    args = parser.parse_args()
+    if args.thumb_atlas and not args.thumbs:
+        parser.error("--thumb-atlas needs --thumbs")
+    return args
+
+
+def avif_supported() -> bool:
+    try:
+        import pillow_avif  # noqa: F401  (plugin for Pillow builds without AVIF)
+    except ImportError:
+        pass
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+
+def parse_variants(args) -> tuple[list[int], list[str]]:
+    """Validate --variant-widths/--variant-formats; returns (widths descending, formats)"""
+    widths = sorted({int(width) for width in args.variant_widths.split(",") if width.strip()}, reverse=True)
+    if any(width <= 0 for width in widths):
+        raise ValueError(f"Variant widths must be positive: {args.variant_widths}")
+    formats = []
+    for fmt in (f.strip().lower() for f in args.variant_formats.split(",") if f.strip()):
+        fmt = "jpg" if fmt == "jpeg" else fmt
+        if fmt not in VARIANT_FORMATS:
+            raise ValueError(f"Unsupported variant format: {fmt}")
+        if fmt == "avif" and not avif_supported():
+            print("⚠️  Pillow can't encode AVIF here, skipping AVIF variants")
+            continue
+        if fmt not in formats:
+            formats.append(fmt)
+    if widths and not formats:
+        raise ValueError("No usable variant formats")
+    return widths, formats
 
 
 def ensure_empty_dir(path: Path):
@@ -31,61 +150,547 @@ def ensure_empty_dir(path: Path):
             item.unlink()
 
 
-def save_image(image, out_path: Path, fmt: str):
-    if fmt == "webp":
-        image.save(out_path, "WEBP", quality=90)
-    elif fmt in {"jpg", "jpeg"}:
-        image.save(out_path, "JPEG", quality=90)
+def prune_outputs(out_dir: Path, managed_dirs: list[str], keep: set[str]):
+    """Remove files under `managed_dirs` not in `keep` (pages past the new end, old formats or sizes).
+
+    Tiles under `tiles/<stem>_files/` are kept while `tiles/<stem>.dzi` is.
+    """
+    tile_prefixes = tuple(path[: -len(".dzi")] + "_files/" for path in keep if path.endswith(".dzi"))
+    for name in managed_dirs:
+        root = out_dir / name
+        if not root.exists():
+            continue
+        for item in sorted(root.rglob("*"), reverse=True):
+            relative = item.relative_to(out_dir).as_posix()
+            if item.is_file() and relative not in keep and not relative.startswith(tile_prefixes):
+                item.unlink()
+            elif item.is_dir() and not any(item.iterdir()):
+                item.rmdir()
+        if not any(root.iterdir()):
+            root.rmdir()
+
+
+def copy_if_changed(source: Path, target: Path):
+    """Copy a file unless the target already has the same bytes (keeps its mtime)"""
+    if target.exists() and file_sha256(target) == file_sha256(source):
+        return
+    shutil.copyfile(source, target)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_pdf_object(obj, digest, seen: dict):
+    """Feed a canonical serialization of a PDF object graph into `digest`.
+
+    Indirect references are followed (object numbers don't matter, only content),
+    and /Parent links are skipped so a page never pulls in the whole page tree.
+    """
+    if isinstance(obj, IndirectObject):
+        key = (obj.idnum, obj.generation)
+        if key in seen:
+            digest.update(b"@%d" % seen[key])
+            return
+        seen[key] = len(seen)
+        obj = obj.get_object()
+
+    if isinstance(obj, StreamObject):
+        digest.update(b"stream")
+        _hash_pdf_object(DictionaryObject({k: v for k, v in obj.items() if k != "/Length"}), digest, seen)
+        data = obj._data if isinstance(obj._data, bytes) else obj.get_data()
+        digest.update(b"%d:" % len(data) + data)
+    elif isinstance(obj, DictionaryObject):
+        digest.update(b"<<")
+        for key in sorted(obj.keys()):
+            if key == "/Parent":
+                continue
+            digest.update(str(key).encode("utf-8"))
+            _hash_pdf_object(obj.raw_get(key), digest, seen)
+        digest.update(b">>")
+    elif isinstance(obj, ArrayObject):
+        digest.update(b"[")
+        for item in obj:
+            _hash_pdf_object(item, digest, seen)
+        digest.update(b"]")
     else:
-        image.save(out_path, fmt.upper())
+        digest.update(repr(obj).encode("utf-8") + b";")
 
 
-def build_flipbook():
-    args = parse_args()
+def page_fingerprints(pdf_reader: PdfReader, settings: dict) -> list[str]:
+    """Hash each page's content streams, resources and geometry together with the render settings"""
+    settings_key = json.dumps(settings, sort_keys=True).encode("utf-8")
+    fingerprints = []
+    for page in pdf_reader.pages:
+        digest = hashlib.sha256(settings_key)
+        _hash_pdf_object(page.indirect_reference or page, digest, {})
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+def read_fingerprints(out_dir: Path) -> list[str]:
+    try:
+        data = json.loads((out_dir / FINGERPRINTS_FILE).read_text(encoding="utf-8"))
+        return list(data.get("pages", []))
+    except (OSError, ValueError):
+        return []
+
+
+def page_ranges(pages: list[int], window: int):
+    """Group page numbers into (first, last) runs of consecutive pages, at most `window` long"""
+    if window <= 0:
+        window = max(len(pages), 1)
+    ranges = []
+    for page in sorted(pages):
+        if ranges and page == ranges[-1][1] + 1 and page - ranges[-1][0] < window:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+    return ranges
+
+
+def iter_rendered_pages(source_pdf: Path, first_page: int, last_page: int, dpi: int, window: int):
+    """Yield (page number, image) pairs, rendering `window` pages at a time.
+
+    Each image is closed once the caller moves on, so peak memory is bounded by
+    the window size instead of the page count.
+    """
+    for first, last in page_ranges(list(range(first_page, last_page + 1)), window):
+        images = convert_from_path(str(source_pdf), dpi=dpi, first_page=first, last_page=last)
+        try:
+            for offset, image in enumerate(images):
+                yield first + offset, image
+                image.close()
+        finally:
+            images.clear()
+
+
+def dominant_color(image) -> str:
+    """Most common color of a page as `#rrggbb`, for the viewer's placeholder.
+
+    Pixels are bucketed to 5 bits per channel on a small copy of the page, and
+    the winning bucket's mean color is returned.
+    """
+    factor = max(1, max(image.size) // PLACEHOLDER_SIZE)
+    small = image.convert("RGB").reduce(factor)
+    pixels = np.asarray(small, dtype=np.uint32).reshape(-1, 3)
+    small.close()
+    buckets = pixels >> 3
+    keys = (buckets[:, 0] << 10) | (buckets[:, 1] << 5) | buckets[:, 2]
+    top = np.bincount(keys, minlength=1 << 15).argmax()
+    red, green, blue = np.rint(pixels[keys == top].mean(axis=0)).astype(int)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def read_page_info(out_dir: Path, filename: str, args) -> dict:
+    """Placeholder metadata for a page from the files on disk (pages built before it was recorded)"""
+    stem = filename.rsplit(".", 1)[0]
+    page_path = out_dir / "pages" / filename
+    with Image.open(page_path) as image:
+        info = {"width": image.width, "height": image.height, "bytes": page_path.stat().st_size}
+        image.draft("RGB", (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        info["color"] = dominant_color(image)
+    if args.thumbs:
+        thumb_path = out_dir / "thumbs" / filename
+        with Image.open(thumb_path) as thumb:
+            info["thumb"] = {"width": thumb.width, "height": thumb.height, "bytes": thumb_path.stat().st_size}
+    if args.widths:
+        info["variants"] = []
+        for width in sorted(args.widths):
+            paths = {fmt: out_dir / VARIANTS_DIR / str(width) / f"{stem}.{fmt}" for fmt in args.formats}
+            with Image.open(paths[args.formats[0]]) as variant:
+                size = variant.size
+            info["variants"].append({
+                "width": size[0],
+                "height": size[1],
+                "bytes": {fmt: path.stat().st_size for fmt, path in paths.items()},
+            })
+    return info
+
+
+def scaled_height(width: int, height: int, target_width: int) -> int:
+    """Height of a width x height image resized to target_width (shared so thumbnail and variant sizes agree)"""
+    return max(1, round(height * target_width / width))
+
+
+def make_thumbnail(image, thumb_width: int):
+    width, height = image.size
+    if width > thumb_width:
+        return image.resize((thumb_width, scaled_height(width, height, thumb_width)))
+    return image
+
+
+def write_variants(page, variants_dir: Path, stem: str, widths: list[int], formats: list[str], encoding: dict, measure_baseline: bool = False) -> tuple[int, int, list[dict]]:
+    """Encode the page at each width (largest first) in every variant format.
+
+    Each size is downsampled from the previous, larger one rather than from the
+    full page. Widths at or above the page width reuse the page as is.
+    Returns (bytes written, bytes at the default fixed encoding, per-width
+    dimensions and byte sizes in ascending width order).
+    """
+    written = baseline = 0
+    sizes = []
+    current = page
+    for width in widths:
+        if width < current.width:
+            height = scaled_height(page.width, page.height, width)
+            resized = current.resize((width, height), Image.LANCZOS)
+            if current is not page:
+                current.close()
+            current = resized
+        variant = {"width": current.width, "height": current.height, "bytes": {}}
+        for fmt in formats:
+            size, default_size = save_image(current, variants_dir / str(width) / f"{stem}.{fmt}", fmt, encoding, measure_baseline=measure_baseline)
+            variant["bytes"][fmt] = size
+            written += size
+            baseline += default_size
+        sizes.append(variant)
+    if current is not page:
+        current.close()
+    return written, baseline, sizes[::-1]
+
+
+def atlas_layout(thumb_sizes: list[tuple[int, int]]) -> tuple[list[dict], list[list[int]]]:
+    """Shelf-pack thumbnails, in page order, into sheets of at most ATLAS_MAX_SIZE px.
+
+    Returns the sheet sizes and, per page, [sheet, x, y, width, height].
+    """
+    columns = max(1, ATLAS_MAX_SIZE // max(width for width, _ in thumb_sizes))
+    sheets = []
+    placements = []
+    for start in range(0, len(thumb_sizes), columns):
+        row = thumb_sizes[start:start + columns]
+        row_height = max(height for _, height in row)
+        if not sheets or sheets[-1]["height"] + row_height > ATLAS_MAX_SIZE:
+            sheets.append({"width": 0, "height": 0})
+        sheet = sheets[-1]
+        x = 0
+        for width, height in row:
+            placements.append([len(sheets) - 1, x, sheet["height"], width, height])
+            x += width
+        sheet["width"] = max(sheet["width"], x)
+        sheet["height"] += row_height
+    return sheets, placements
+
+
+def write_thumb_atlases(out_dir: Path, filenames: list[str], thumb_sizes: list[tuple[int, int]], fmt: str, optimized: bool) -> dict:
+    """Pack the thumbnails into sprite sheets under atlas/; returns the manifest entry.
+
+    Sheets are only rewritten when their bytes change, and stale sheets are removed.
+    """
+    layout, placements = atlas_layout(thumb_sizes)
+    atlas_dir = out_dir / ATLAS_DIR
+    atlas_dir.mkdir(parents=True, exist_ok=True)
+    sheets = []
+    for index, size in enumerate(layout):
+        sheet = {"file": f"thumbs-{index}.{fmt}", **size}
+        with Image.new("RGB", (sheet["width"], sheet["height"]), "white") as canvas:
+            for filename, (sheet_index, x, y, _, _) in zip(filenames, placements):
+                if sheet_index == index:
+                    with Image.open(out_dir / "thumbs" / filename) as thumb:
+                        canvas.paste(thumb.convert("RGB"), (x, y))
+            data = encode_image(canvas, fmt, optimized=optimized)
+        sheet_path = atlas_dir / sheet["file"]
+        if not sheet_path.exists() or sheet_path.read_bytes() != data:
+            sheet_path.write_bytes(data)
+        sheet["bytes"] = len(data)
+        sheets.append(sheet)
+
+    keep = {sheet["file"] for sheet in sheets}
+    for path in atlas_dir.iterdir():
+        if path.name not in keep:
+            path.unlink()
+    return {"path": ATLAS_DIR, "format": fmt, "sheets": sheets, "pages": placements}
+
+
+def dzi_levels(width: int, height: int, tile_size: int) -> list[dict]:
+    """Size and tile grid of every pyramid level; level 0 is 1x1, the last is full size"""
+    max_level = math.ceil(math.log2(max(width, height, 1)))
+    levels = []
+    for level in range(max_level + 1):
+        scale = 2 ** (max_level - level)
+        level_width = max(1, math.ceil(width / scale))
+        level_height = max(1, math.ceil(height / scale))
+        levels.append({
+            "level": level,
+            "width": level_width,
+            "height": level_height,
+            "columns": math.ceil(level_width / tile_size),
+            "rows": math.ceil(level_height / tile_size),
+        })
+    return levels
+
+
+def write_tiles(image, tiles_dir: Path, stem: str, tile_size: int, overlap: int, fmt: str, encoding: dict, measure_baseline: bool = False) -> tuple[int, int]:
+    """Cut a DZI pyramid (`<stem>_files/<level>/<col>_<row>.<fmt>` plus `<stem>.dzi`).
+
+    Each level is the previous one halved, so the full render is only read once.
+    Tiles are too many to quality-search, so `search` encodes them as `optimize`.
+    """
+    if encoding["mode"] == "search":
+        encoding = {**encoding, "mode": "optimize"}
+    written = baseline = 0
+    files_dir = tiles_dir / f"{stem}_files"
+    if files_dir.exists():
+        shutil.rmtree(files_dir)
+
+    levels = dzi_levels(image.width, image.height, tile_size)
+    current = image
+    for spec in reversed(levels):
+        if (current.width, current.height) != (spec["width"], spec["height"]):
+            reduced = current.reduce(2)
+            if current is not image:
+                current.close()
+            current = reduced
+        level_dir = files_dir / str(spec["level"])
+        level_dir.mkdir(parents=True, exist_ok=True)
+        for column in range(spec["columns"]):
+            for row in range(spec["rows"]):
+                left = max(column * tile_size - overlap, 0)
+                top = max(row * tile_size - overlap, 0)
+                right = min((column + 1) * tile_size + overlap, current.width)
+                bottom = min((row + 1) * tile_size + overlap, current.height)
+                tile = current.crop((left, top, right, bottom))
+                size, default_size = save_image(tile, level_dir / f"{column}_{row}.{fmt}", fmt, encoding, measure_baseline=measure_baseline)
+                written += size
+                baseline += default_size
+    if current is not image:
+        current.close()
+
+    # Written last: its presence means the pyramid is complete
+    root = ET.Element("Image", {
+        "xmlns": DZI_NAMESPACE,
+        "Format": fmt,
+        "Overlap": str(overlap),
+        "TileSize": str(tile_size),
+    })
+    ET.SubElement(root, "Size", {"Width": str(image.width), "Height": str(image.height)})
+    ET.ElementTree(root).write(tiles_dir / f"{stem}.dzi", encoding="UTF-8", xml_declaration=True)
+    return written, baseline
+
+
+def read_dzi_size(path: Path) -> tuple[int, int]:
+    size = ET.parse(path).getroot().find(f"{{{DZI_NAMESPACE}}}Size")
+    return int(size.get("Width")), int(size.get("Height"))
+
+
+def page_outputs(index: int, args) -> list[str]:
+    """Paths (relative to the output directory) written for one page"""
     fmt = args.format.lower()
-    if fmt not in SUPPORTED_FORMATS:
-        raise ValueError(f"Unsupported format: {fmt}")
+    stem = f"{index:0{args.page_digits}d}"
+    outputs = [f"pages/{stem}.{fmt}"]
+    if args.thumbs:
+        outputs.append(f"thumbs/{stem}.{fmt}")
+    for width in args.widths:
+        outputs.extend(f"{VARIANTS_DIR}/{width}/{stem}.{variant_fmt}" for variant_fmt in args.formats)
+    if args.tiles:
+        # The tiles themselves live under tiles/<stem>_files/ (see prune_outputs)
+        outputs.append(f"{TILES_DIR}/{stem}.dzi")
+    return outputs
 
-    source_pdf = Path(args.input)
-    if not source_pdf.exists():
-        raise FileNotFoundError(f"Source PDF not found: {source_pdf}")
 
-    out_dir = Path(args.out)
+def render_page_range(source_pdf: Path, first_page: int, last_page: int, out_dir: Path, args) -> list[dict]:
+    """Render, encode and save pages first_page..last_page.
+
+    Returns one record per page with its filename, the bytes written (and the
+    bytes the default fixed encoding would have taken, with --report-savings) and the page's manifest
+    metadata. Runs in a worker process when --jobs is greater than 1.
+    """
+    fmt = args.format.lower()
+    render_dpi = max(args.dpi, args.tile_dpi) if args.tiles else args.dpi
+    written = []
+    for index, render in iter_rendered_pages(source_pdf, first_page, last_page, render_dpi, args.render_window):
+        filename = f"{index:0{args.page_digits}d}.{fmt}"
+        stem = filename.rsplit(".", 1)[0]
+        record = {"page": index, "file": filename, "bytes": 0, "baselineBytes": 0}
+
+        def count(sizes):
+            record["bytes"] += sizes[0]
+            record["baselineBytes"] += sizes[1]
+
+        if args.tiles:
+            count(write_tiles(render, out_dir / TILES_DIR, stem, args.tile_size, args.tile_overlap, fmt, args.encoding, args.report_savings))
+        if render_dpi != args.dpi:
+            # Page image and its derivatives come from the same high-DPI render
+            scale = args.dpi / render_dpi
+            page = render.resize((round(render.width * scale), round(render.height * scale)), Image.LANCZOS)
+        else:
+            page = render
+        page_sizes = save_image(page, out_dir / "pages" / filename, fmt, args.encoding, args.max_page_bytes, args.report_savings)
+        count(page_sizes)
+        info = {"width": page.width, "height": page.height, "bytes": page_sizes[0], "color": dominant_color(page)}
+
+        if args.thumbs:
+            # resize() already returns a new image, no need to copy the page first
+            thumb = make_thumbnail(page, args.thumb_width)
+            thumb_sizes = save_image(thumb, out_dir / "thumbs" / filename, fmt, args.encoding, measure_baseline=args.report_savings)
+            count(thumb_sizes)
+            info["thumb"] = {"width": thumb.width, "height": thumb.height, "bytes": thumb_sizes[0]}
+            if thumb is not page:
+                thumb.close()
+
+        if args.widths:
+            *variant_sizes, info["variants"] = write_variants(page, out_dir / VARIANTS_DIR, stem, args.widths, args.formats, args.encoding, args.report_savings)
+            count(variant_sizes)
+        record["info"] = info
+        if page is not render:
+            page.close()
+        written.append(record)
+    return written
+
+
+def map_page_ranges(worker, source_pdf: Path, ranges: list[tuple[int, int]], jobs: int, *worker_args) -> list:
+    """Call worker(source_pdf, first, last, *worker_args) for each range across `jobs` processes.
+
+    Results are concatenated in page order, so they match a sequential run.
+    """
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if jobs == 1 or len(ranges) <= 1:
+        return [item for first, last in ranges for item in worker(source_pdf, first, last, *worker_args)]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(ranges))) as pool:
+        futures = [pool.submit(worker, source_pdf, first, last, *worker_args) for first, last in ranges]
+        return [item for future in futures for item in future.result()]
+
+
+def render_pages(source_pdf: Path, pages: list[int], out_dir: Path, args) -> list[dict]:
+    """Render the given pages, spreading page ranges across `args.jobs` processes"""
+    ranges = page_ranges(pages, args.render_window)
+    return map_page_ranges(render_page_range, source_pdf, ranges, args.jobs, out_dir, args)
+
+
+def extract_texts(source_pdf: Path, pages: list[int], jobs: int) -> dict[int, tuple[list[str], str]]:
+    """Extract the words of the given pages, one contiguous share of pages per process"""
+    workers = jobs if jobs > 0 else (os.cpu_count() or 1)
+    # Each range re-parses the PDF, so use as few ranges as there are workers
+    ranges = page_ranges(pages, math.ceil(len(pages) / workers) if pages else 1)
+    extracted = map_page_ranges(extract_page_range, source_pdf, ranges, jobs)
+    return dict(zip(sorted(pages), extracted))
+
+
+def write_flipbook(args, source_pdf: Path, out_dir: Path, run_metrics: RunMetrics) -> dict:
+    """Render stale pages and write the search index, facets and manifest; returns the run summary"""
+    fmt = args.format.lower()
     pages_dir = out_dir / "pages"
     thumbs_dir = out_dir / "thumbs"
 
     out_dir.mkdir(parents=True, exist_ok=True)
-    ensure_empty_dir(pages_dir)
-    if args.thumbs:
-        ensure_empty_dir(thumbs_dir)
+    if args.full_rebuild:
+        ensure_empty_dir(pages_dir)
+        if args.thumbs:
+            ensure_empty_dir(thumbs_dir)
 
-    shutil.copyfile(source_pdf, out_dir / "source.pdf")
+    copy_if_changed(source_pdf, out_dir / "source.pdf")
 
-    pdf_reader = PdfReader(str(source_pdf))
-    page_count = len(pdf_reader.pages)
+    with run_metrics.stage("fingerprint"):
+        pdf_reader = PdfReader(str(source_pdf))
+        page_count = len(pdf_reader.pages)
 
-    pages = convert_from_path(str(source_pdf), dpi=args.dpi)
+        # Only re-render pages whose content or render settings changed
+        settings = {
+            "renderVersion": RENDER_VERSION,
+            "dpi": args.dpi,
+            "format": fmt,
+            "pageDigits": args.page_digits,
+            "thumbs": args.thumbs,
+            "thumbWidth": args.thumb_width if args.thumbs else None,
+            "variantWidths": args.widths,
+            "variantFormats": args.formats if args.widths else [],
+            "tiles": [args.tile_dpi, args.tile_size, args.tile_overlap] if args.tiles else None,
+            "encoding": {**args.encoding, "maxPageBytes": args.max_page_bytes} if args.encode_mode != "fixed" else None,
+        }
+        fingerprints = page_fingerprints(pdf_reader, settings)
+        if args.widths:
+            rendered_width = max(round(float(page.mediabox.width) * args.dpi / 72) for page in pdf_reader.pages)
+            oversized = [width for width in args.widths if width > rendered_width]
+            if oversized:
+                print(f"⚠️  Variant widths {sorted(oversized)} exceed the {rendered_width}px render at {args.dpi} DPI; raise --dpi to fill them")
+        previous = [] if args.full_rebuild else read_fingerprints(out_dir)
+        outputs = {index: page_outputs(index, args) for index in range(1, page_count + 1)}
+        stale = [
+            index
+            for index, fingerprint in enumerate(fingerprints, start=1)
+            if index > len(previous)
+            or previous[index - 1] != fingerprint
+            or not all((out_dir / path).exists() for path in outputs[index])
+        ]
 
-    if len(pages) != page_count:
-        page_count = len(pages)
+    managed_dirs = ["pages", VARIANTS_DIR, TILES_DIR] + (["thumbs"] if args.thumbs else [])
+    prune_outputs(out_dir, managed_dirs, {path for paths in outputs.values() for path in paths})
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    if args.thumbs:
+        thumbs_dir.mkdir(parents=True, exist_ok=True)
+    for width in args.widths:
+        (out_dir / VARIANTS_DIR / str(width)).mkdir(parents=True, exist_ok=True)
+    if args.tiles:
+        (out_dir / TILES_DIR).mkdir(parents=True, exist_ok=True)
 
-    for index, page in enumerate(pages, start=1):
-        filename = f"{index:0{args.page_digits}d}.{fmt}"
-        save_image(page, pages_dir / filename, fmt)
+    with run_metrics.stage("render", rows_in=len(stale)) as stage:
+        rendered = render_pages(source_pdf, stale, out_dir, args)
+        stage["rowsOut"] = len(rendered)
+    run_metrics.cache("pages", hits=page_count - len(stale), misses=len(stale))
+    print(f"Rendered {len(rendered)} of {page_count} pages ({page_count - len(rendered)} unchanged)")
+    if rendered:
+        written = sum(record["bytes"] for record in rendered)
+        if args.encode_mode != "fixed" and args.report_savings:
+            baseline = sum(record["baselineBytes"] for record in rendered)
+            saved = baseline - written
+            print(
+                f"Encoded {written / 1e6:.2f} MB ({args.encode_mode}); "
+                f"saved {saved / 1e6:.2f} MB ({saved / baseline:.1%}) vs. fixed quality"
+            )
+        else:
+            print(f"Encoded {written / 1e6:.2f} MB ({args.encode_mode})")
 
-        if args.thumbs:
-            thumb = page.copy()
-            width, height = thumb.size
-            if width > args.thumb_width:
-                ratio = args.thumb_width / width
-                thumb = thumb.resize((args.thumb_width, int(height * ratio)))
-            save_image(thumb, thumbs_dir / filename, fmt)
+    if len(rendered) != len(stale):
+        raise RuntimeError(f"Expected {len(stale)} rendered pages, got {len(rendered)}")
+
+    # Text only needs extracting for re-rendered pages and pages the old index doesn't cover
+    with run_metrics.stage("search_index", rows_in=page_count):
+        search_path = out_dir / SEARCH_INDEX_FILE
+        texts = {} if args.full_rebuild else read_search_index(search_path)
+        stale_set = set(stale)
+        texts = {page: text for page, text in texts.items() if page <= page_count and page not in stale_set}
+        missing = [index for index in range(1, page_count + 1) if index not in texts]
+        texts.update(extract_texts(source_pdf, missing, args.jobs))
+        search_index = build_search_index([texts[index] for index in range(1, page_count + 1)])
+        search_text = json.dumps(search_index, separators=(",", ":"), ensure_ascii=False) + "\n"
+        if not search_path.exists() or search_path.read_text(encoding="utf-8") != search_text:
+            search_path.write_text(search_text, encoding="utf-8")
+        print(f"Indexed {len(search_index['terms'])} terms ({len(missing)} pages extracted)")
+    run_metrics.cache("text", hits=page_count - len(missing), misses=len(missing))
 
     if args.tags:
         tags_path = Path(args.tags)
         if not tags_path.exists():
             raise FileNotFoundError(f"Tags file not found: {tags_path}")
-        shutil.copyfile(tags_path, out_dir / "tags.csv")
+        with run_metrics.stage("facets"):
+            copy_if_changed(tags_path, out_dir / "tags.csv")
+            facets = write_facet_index(out_dir / "tags.csv", out_dir / FACETS_FILE)
+            print(f"Indexed {sum(len(values) for values in facets['facets'].values())} facet values over {len(facets['pages'])} pages")
+            for issue in validation_issues(facets):
+                print(f"⚠️  Tags: {issue}")
+
+    with run_metrics.stage("page_info", rows_in=page_count):
+        manifest_path = out_dir / "manifest.json"
+        try:
+            previous_manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            previous_manifest = {}
+
+        # Unchanged pages keep the metadata recorded when they were rendered
+        page_info = {record["page"]: record["info"] for record in rendered}
+        previous_info = previous_manifest.get("pages") or []
+        for index in range(1, page_count + 1):
+            if index not in page_info:
+                if index <= len(previous_info) and previous_info[index - 1]:
+                    page_info[index] = previous_info[index - 1]
+                else:
+                    page_info[index] = read_page_info(out_dir, f"{index:0{args.page_digits}d}.{fmt}", args)
 
     manifest = {
         "docKey": out_dir.name,
@@ -95,11 +700,90 @@ def build_flipbook():
         "pageExtension": fmt,
         "pagesPath": "pages",
         "sourcePdf": "source.pdf",
+        "searchIndex": SEARCH_INDEX_FILE,
         "updatedAt": date.today().isoformat(),
+        "pages": [page_info[index] for index in range(1, page_count + 1)],
     }
+    if args.tags:
+        manifest["facets"] = FACETS_FILE
+    if args.widths:
+        manifest["variants"] = {
+            "path": VARIANTS_DIR,
+            "widths": sorted(args.widths),
+            "formats": args.formats,
+        }
+    if args.thumb_atlas:
+        with run_metrics.stage("atlas", rows_in=page_count):
+            filenames = [f"{index:0{args.page_digits}d}.{fmt}" for index in range(1, page_count + 1)]
+            thumb_sizes = [(page_info[index]["thumb"]["width"], page_info[index]["thumb"]["height"]) for index in range(1, page_count + 1)]
+            manifest["thumbAtlas"] = write_thumb_atlases(out_dir, filenames, thumb_sizes, args.atlas_format, args.encode_mode != "fixed")
+            atlas = manifest["thumbAtlas"]
+            print(f"Packed {page_count} thumbnails into {len(atlas['sheets'])} sheet(s) ({sum(sheet['bytes'] for sheet in atlas['sheets']) / 1e3:.0f} KB)")
+    elif (out_dir / ATLAS_DIR).exists():
+        shutil.rmtree(out_dir / ATLAS_DIR)
+    if args.tiles:
+        # Pages usually share a size, so each distinct pyramid is listed once
+        with run_metrics.stage("tiles", rows_in=page_count):
+            pyramids = []
+            page_pyramids = []
+            for index in range(1, page_count + 1):
+                width, height = read_dzi_size(out_dir / TILES_DIR / f"{index:0{args.page_digits}d}.dzi")
+                pyramid = {"width": width, "height": height, "levels": dzi_levels(width, height, args.tile_size)}
+                if pyramid not in pyramids:
+                    pyramids.append(pyramid)
+                page_pyramids.append(pyramids.index(pyramid))
+            manifest["tiles"] = {
+                "path": TILES_DIR,
+                "format": fmt,
+                "tileSize": args.tile_size,
+                "overlap": args.tile_overlap,
+                "dpi": max(args.dpi, args.tile_dpi),
+                "pyramids": pyramids,
+                "pages": page_pyramids,
+            }
+
+    if not rendered and previous_manifest:
+        # Nothing re-rendered: keep the previous date so the manifest only changes with content
+        if {**previous_manifest, "updatedAt": None} == {**manifest, "updatedAt": None}:
+            manifest["updatedAt"] = previous_manifest.get("updatedAt", manifest["updatedAt"])
+    manifest_text = json.dumps(manifest, indent=2) + "\n"
+    if not manifest_path.exists() or manifest_path.read_text(encoding="utf-8") != manifest_text:
+        manifest_path.write_text(manifest_text, encoding="utf-8")
+
+    # Written last: until it is, the pages of an interrupted build still count as stale,
+    # so their manifest entries and search text are rebuilt instead of copied from the old ones
+    fingerprints_path = out_dir / FINGERPRINTS_FILE
+    fingerprints_text = json.dumps({"settings": settings, "pages": fingerprints}, indent=2) + "\n"
+    if not fingerprints_path.exists() or fingerprints_path.read_text(encoding="utf-8") != fingerprints_text:
+        fingerprints_path.write_text(fingerprints_text, encoding="utf-8")
 
-    manifest_path = out_dir / "manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return {"status": "ok", "pageCount": page_count, "renderedPages": len(rendered), "extractedPages": len(missing)}
+
+
+def build_flipbook():
+    args = parse_args()
+    fmt = args.format.lower()
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    args.widths, args.formats = parse_variants(args)
+    args.encoding = {"mode": args.encode_mode, "targetSsim": args.target_ssim, "minQuality": args.min_quality}
+    if args.encode_mode != "search":
+        args.max_page_bytes = 0
+
+    source_pdf = Path(args.input)
+    if not source_pdf.exists():
+        raise FileNotFoundError(f"Source PDF not found: {source_pdf}")
+
+    out_dir = Path(args.out)
+    run_metrics = RunMetrics("build_flipbook", args.profile)
+    metrics_path = Path(args.metrics) if args.metrics else ROOT / "data" / "private" / "metrics" / f"flipbook-{out_dir.name}.run_metrics.json"
+    summary = {"status": "failed"}
+    try:
+        summary = write_flipbook(args, source_pdf, out_dir, run_metrics)
+    finally:
+        run_metrics.write(str(metrics_path), summary)
+        print("\n".join(run_metrics.summary_lines()))
+        print(f"Wrote run metrics to {metrics_path}")
 
     print(f"✅ Built flipbook for {args.title} at {out_dir}")
 
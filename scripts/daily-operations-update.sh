@@ -3,7 +3,7 @@ set -euo pipefail
 
 REPO_DIR="/Users/rthatha/Projects/Petromac/Website"
 LOG_FILE="$HOME/Library/Logs/petromac-data-update.log"
-DATA_FILE="public/data/operations_data.json"
+DATA_DIR="public/data"
 EMAIL_LOG_FILE="data/email-log.jsonl"
 
 log() {
@@ -28,11 +28,11 @@ if ! pnpm data:operations >> "$LOG_FILE" 2>&1; then
   exit 1
 fi
 
-# Check if the operations data file or email log changed
+# Check if the published data (artifacts, sidecars, manifest) or email log changed
 FILES_TO_COMMIT=""
 
-if ! git diff --quiet "$DATA_FILE" 2>/dev/null; then
-  FILES_TO_COMMIT="$DATA_FILE"
+if [ -n "$(git status --porcelain -- "$DATA_DIR" 2>/dev/null)" ]; then
+  FILES_TO_COMMIT="$DATA_DIR"
 fi
 
 if [ -f "$EMAIL_LOG_FILE" ] && ! git diff --quiet "$EMAIL_LOG_FILE" 2>/dev/null; then
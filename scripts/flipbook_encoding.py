@@ -0,0 +1,122 @@
+"""Image encoding for flipbook assets.
+
+`fixed` mode encodes at one quality per format (the historical behaviour).
+`optimize` keeps those qualities but adds the optimizations below.
+`search` mode binary-searches each image for the lowest quality whose SSIM
+against the lossless render meets a target, optionally capped by a byte
+budget. It also turns on progressive/optimized encoding and writes no
+EXIF/ICC metadata.
+"""
+import io
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_QUALITY = {"jpg": 90, "jpeg": 90, "webp": 90, "avif": 60}
+MAX_QUALITY = 95
+SSIM_BLOCK = 8
+
+
+def encode_image(image, fmt: str, quality: int | None = None, optimized: bool = False) -> bytes:
+    """Encode to bytes; `optimized` adds progressive/optimize flags and drops metadata"""
+    buffer = io.BytesIO()
+    if fmt == "avif":
+        options = {"quality": quality or DEFAULT_QUALITY[fmt]}
+        if optimized:
+            options.update(speed=4, exif=b"", icc_profile=None)
+        image.save(buffer, "AVIF", **options)
+    elif fmt == "webp":
+        options = {"quality": quality or DEFAULT_QUALITY[fmt]}
+        if optimized:
+            options.update(method=6, exif=b"", icc_profile=None)
+        image.save(buffer, "WEBP", **options)
+    elif fmt in {"jpg", "jpeg"}:
+        options = {"quality": quality or DEFAULT_QUALITY[fmt]}
+        if optimized:
+            options.update(optimize=True, progressive=True, exif=b"", icc_profile=None)
+        image.save(buffer, "JPEG", **options)
+    else:
+        options = {"optimize": True, "icc_profile": None} if optimized else {}
+        image.save(buffer, fmt.upper(), **options)
+    return buffer.getvalue()
+
+
+def _luma(image) -> np.ndarray:
+    return np.asarray(image.convert("L"), dtype=np.float64)
+
+
+def ssim(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean SSIM over non-overlapping 8x8 blocks of two luma arrays"""
+    height = reference.shape[0] // SSIM_BLOCK * SSIM_BLOCK
+    width = reference.shape[1] // SSIM_BLOCK * SSIM_BLOCK
+    if height == 0 or width == 0:
+        return 1.0 if np.array_equal(reference, candidate) else 0.0
+
+    shape = (height // SSIM_BLOCK, SSIM_BLOCK, width // SSIM_BLOCK, SSIM_BLOCK)
+    x = reference[:height, :width].reshape(shape)
+    y = candidate[:height, :width].reshape(shape)
+    mu_x = x.mean(axis=(1, 3))
+    mu_y = y.mean(axis=(1, 3))
+    var_x = x.var(axis=(1, 3))
+    var_y = y.var(axis=(1, 3))
+    cov = (x * y).mean(axis=(1, 3)) - mu_x * mu_y
+
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    index = ((2 * mu_x * mu_y + c1) * (2 * cov + c2)) / ((mu_x ** 2 + mu_y ** 2 + c1) * (var_x + var_y + c2))
+    return float(index.mean())
+
+
+def search_quality(image, fmt: str, target_ssim: float, max_bytes: int = 0, min_quality: int = 40) -> bytes:
+    """Lowest quality meeting `target_ssim`, then lowered further if over `max_bytes`"""
+    reference = _luma(image)
+    probes: dict[int, bytes] = {}
+
+    def encoded(quality: int) -> bytes:
+        if quality not in probes:
+            probes[quality] = encode_image(image, fmt, quality, optimized=True)
+        return probes[quality]
+
+    def meets_target(quality: int) -> bool:
+        with Image.open(io.BytesIO(encoded(quality))) as decoded:
+            return ssim(reference, _luma(decoded)) >= target_ssim
+
+    low, high = min_quality, MAX_QUALITY
+    if meets_target(low):
+        high = low
+    while low < high:
+        middle = (low + high) // 2
+        if meets_target(middle):
+            high = middle
+        else:
+            low = middle + 1
+    quality = high
+
+    if max_bytes > 0:
+        while quality > min_quality and len(encoded(quality)) > max_bytes:
+            quality = max(min_quality, quality - 5)
+    return encoded(quality)
+
+
+def save_image(image, out_path, fmt: str, encoding: dict | None = None, max_bytes: int = 0, measure_baseline: bool = False) -> tuple[int, int]:
+    """Write an image; returns (bytes written, bytes the default fixed encoding would take).
+
+    `encoding` is {"mode": "fixed"|"optimize"|"search", "targetSsim": float, "minQuality": int}.
+    Lossless formats are only optimized, never searched. Outside `fixed` mode the
+    baseline costs a second encode, so it is only measured with `measure_baseline`
+    (0 otherwise).
+    """
+    if not encoding or encoding["mode"] == "fixed":
+        data = encode_image(image, fmt)
+        return _write(out_path, data), len(data)
+    if encoding["mode"] == "optimize" or fmt not in DEFAULT_QUALITY:
+        data = encode_image(image, fmt, optimized=True)
+    else:
+        data = search_quality(image, fmt, encoding["targetSsim"], max_bytes, encoding["minQuality"])
+    return _write(out_path, data), len(encode_image(image, fmt)) if measure_baseline else 0
+
+
+def _write(out_path, data: bytes) -> int:
+    with open(out_path, "wb") as f:
+        f.write(data)
+    return len(data)
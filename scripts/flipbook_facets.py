@@ -0,0 +1,239 @@
+"""Facet index for filtering success stories (`facets.json`).
+
+    {
+      "version": 1,
+      "pages": [4, 5, 6, ...],
+      "facets": {
+        "areas": [{"value": "APAC", "count": 7, "pages": [4, 12, ...]}, ...],
+        ...
+      },
+      "pairs": {
+        "areas|category1": [{"values": ["APAC", "Centralization"], "count": 2}, ...],
+        ...
+      },
+      "validation": {"unknownAreas": [], "unknownCompanies": [], ...}
+    }
+
+Values are normalized the way `successStories.shared.ts` parses `tags.csv`.
+Each field is read from the first non-empty of its accepted header names
+(`Page Number`, `Category1`, `Technology`, ...). Area, WL Co and Device cells
+are split on `,`, `;` and `+` and mapped to the known areas, companies and
+technologies. Page and Year are read as leading integers, like `parseInt`.
+Year, Country and the categories are used as is. Counts are distinct pages.
+A filter is then a union of the selected values' page lists within a facet,
+intersected across facets. `validation` is the report `buildValidationReport`
+gives for the same rows, so the viewer can still warn about tags it couldn't
+map without parsing `tags.csv`.
+"""
+import argparse
+import json
+from pathlib import Path
+
+import polars as pl
+
+FACETS_FILE = "facets.json"
+FACETS_VERSION = 1
+
+KNOWN_AREAS = ["APAC", "MENA", "EUR", "LAM", "NAM", "AFR"]
+MULTI_VALUE_DELIMITERS = r"[,;+]"
+
+# Accepted header names per field, in priority order (same lists as successStories.shared.ts)
+FIELD_CANDIDATES = {
+    "Page": ["Page", "page", "PAGE", "Page Number", "PageNumber", "page_number", "pageNo", "PageNo"],
+    "Area": ["Area", "area"],
+    "WL Co": ["WL Co", "WLCO", "wlco", "wl co", "company", "Company"],
+    "Device": ["Device", "device", "Technology", "Tech"],
+    "Country": ["Country", "country"],
+    "Category 1": ["Category 1", "Category1", "category1"],
+    "Category 2": ["Category 2", "Category2", "category2"],
+    "Year": ["Year", "year"],
+}
+
+# Facet pairs with precomputed co-occurrence counts
+FACET_PAIRS = [
+    ("areas", "category1"),
+    ("areas", "companies"),
+    ("areas", "techs"),
+    ("companies", "techs"),
+    ("years", "areas"),
+]
+
+
+def pick_field(columns: list[str], candidates: list[str]) -> pl.Expr:
+    """First non-empty value among the candidate columns present (null if none)"""
+    present = [pl.when(pl.col(name) != "").then(pl.col(name)) for name in candidates if name in columns]
+    return pl.coalesce(present) if present else pl.lit(None, dtype=pl.Utf8)
+
+
+def parse_int(value: pl.Expr) -> pl.Expr:
+    """Leading integer of a string, as parseInt reads it (null if there is none)"""
+    return value.str.extract(r"^([+-]?\d+)").cast(pl.Int64, strict=False)
+
+
+def split_values(column: str) -> pl.Expr:
+    return pl.col(column).str.replace_all(MULTI_VALUE_DELIMITERS, ",").str.split(",")
+
+
+def normalize_area(value: pl.Expr) -> pl.Expr:
+    upper = value.str.to_uppercase()
+    return pl.when(upper.is_in(KNOWN_AREAS)).then(upper)
+
+
+def normalize_company(value: pl.Expr) -> pl.Expr:
+    upper = value.str.to_uppercase()
+    return (
+        pl.when(upper.is_in(["SLB", "SCHLUMBERGER"])).then(pl.lit("SLB"))
+        .when(upper.is_in(["HAL", "HALLIBURTON"])).then(pl.lit("HAL"))
+        .when(upper.is_in(["BHI", "BAKER HUGHES"])).then(pl.lit("BHI"))
+        .otherwise(pl.lit("Other"))
+    )
+
+
+def normalize_tech(value: pl.Expr) -> pl.Expr:
+    lower = value.str.to_lowercase()
+    return (
+        pl.when(lower.str.contains("pathfinder", literal=True)).then(pl.lit("Pathfinder"))
+        .when(lower.str.contains("focus", literal=True) & lower.str.contains("oh", literal=True)).then(pl.lit("Focus-OH"))
+        .when(lower.str.contains("focus", literal=True) & lower.str.contains("ch", literal=True)).then(pl.lit("Focus-CH"))
+        .when(lower.str.contains("wireline express", literal=True)).then(pl.lit("Wireline Express"))
+        .when(lower.str.contains("thor", literal=True)).then(pl.lit("THOR"))
+        .otherwise(None)
+    )
+
+
+# Multi-value facets: (source column, value normalizer, validation report key)
+MULTI_FACETS = {
+    "areas": ("Area", normalize_area, "unknownAreas"),
+    "companies": ("WL Co", normalize_company, "unknownCompanies"),
+    "techs": ("Device", normalize_tech, "unknownTechnologies"),
+}
+
+
+def facet_values(tags: pl.LazyFrame) -> pl.LazyFrame:
+    """Long (page, facet, value) frame with one row per distinct page/value"""
+    value = pl.col("value")
+    year = parse_int(pl.col("Year"))
+    single = {
+        "years": pl.when(year > 0).then(year.cast(pl.Utf8)),
+        "countries": pl.col("Country"),
+        "category1": pl.col("Category 1"),
+        "category2": pl.col("Category 2"),
+    }
+
+    frames = []
+    for facet, (source, normalize, _) in MULTI_FACETS.items():
+        frames.append(
+            tags.select("Page", split_values(source).alias("value"))
+            .explode("value")
+            .with_columns(value.str.strip_chars())
+            .filter(value != "")
+            .select("Page", pl.lit(facet).alias("facet"), normalize(value).alias("value"))
+        )
+    for facet, expr in single.items():
+        frames.append(tags.select("Page", pl.lit(facet).alias("facet"), expr.alias("value")))
+    return pl.concat(frames).drop_nulls("value").filter(value != "").unique()
+
+
+def unmapped_values(tags: pl.LazyFrame) -> list[pl.LazyFrame]:
+    """Per multi-value facet, the distinct non-empty cells none of whose parts map to a known value"""
+    part = pl.element().str.strip_chars()
+    frames = []
+    for source, normalize, _ in MULTI_FACETS.values():
+        mapped = (
+            split_values(source)
+            .list.eval(part.filter(part != ""))
+            .list.eval(normalize(pl.element()))
+            .list.drop_nulls()
+            .list.len()
+        )
+        frames.append(tags.filter(pl.col(source).is_not_null() & (mapped == 0)).select(pl.col(source).unique().sort()))
+    return frames
+
+
+def read_tags(tags_csv: Path) -> pl.LazyFrame:
+    """Rows of a tags CSV with a positive page, one column per field under its canonical name"""
+    raw = (
+        pl.scan_csv(tags_csv, infer_schema=False)
+        .rename(lambda name: name.lstrip("\ufeff").strip())
+        .with_columns(pl.all().str.strip_chars())
+    )
+    columns = raw.collect_schema().names()
+    return (
+        raw.select([pick_field(columns, candidates).alias(field) for field, candidates in FIELD_CANDIDATES.items()])
+        .with_columns(parse_int(pl.col("Page")).alias("Page"))
+        .filter(pl.col("Page") > 0)
+    )
+
+
+def build_facet_index(tags_csv: Path) -> dict:
+    tags = read_tags(tags_csv)
+    values = facet_values(tags)
+    pair_keys = pl.LazyFrame(FACET_PAIRS, schema=["facet", "facet_right"], orient="row")
+
+    pages, by_value, by_pair, *unmapped = pl.collect_all([
+        tags.select(pl.col("Page").unique().sort()),
+        values.group_by("facet", "value")
+        .agg(pl.col("Page").sort().alias("pages"))
+        .with_columns(pl.col("pages").list.len().alias("count"))
+        .sort("facet", "value"),
+        values.join(values, on="Page")
+        .join(pair_keys, on=["facet", "facet_right"])
+        .group_by("facet", "facet_right", "value", "value_right")
+        .agg(pl.col("Page").n_unique().alias("count"))
+        .sort("facet", "facet_right", "value", "value_right"),
+        *unmapped_values(tags),
+    ])
+
+    facets: dict[str, list] = {}
+    for row in by_value.iter_rows(named=True):
+        facets.setdefault(row["facet"], []).append({"value": row["value"], "count": row["count"], "pages": row["pages"]})
+    pairs: dict[str, list] = {f"{a}|{b}": [] for a, b in FACET_PAIRS}
+    for row in by_pair.iter_rows(named=True):
+        pairs[f"{row['facet']}|{row['facet_right']}"].append(
+            {"values": [row["value"], row["value_right"]], "count": row["count"]}
+        )
+    # Rows without a positive page are dropped above, as the TS parser drops them
+    validation = {key: frame.to_series().to_list() for (_, _, key), frame in zip(MULTI_FACETS.values(), unmapped)}
+    validation.update({"invalidPages": [], "missingPageRows": 0})
+    return {
+        "version": FACETS_VERSION,
+        "pages": pages["Page"].to_list(),
+        "facets": facets,
+        "pairs": pairs,
+        "validation": validation,
+    }
+
+
+def validation_issues(index: dict) -> list[str]:
+    """One line per kind of tag the index couldn't map (empty when the tags are clean)"""
+    report = index["validation"]
+    labels = {"unknownAreas": "areas", "unknownCompanies": "companies", "unknownTechnologies": "technologies"}
+    issues = [f"Unknown {label}: {', '.join(report[key])}" for key, label in labels.items() if report[key]]
+    if report["missingPageRows"]:
+        issues.append(f"Rows without a page: {report['missingPageRows']}")
+    return issues
+
+
+def write_facet_index(tags_csv: Path, out_path: Path) -> dict:
+    """Write facets.json for a tags CSV, only touching the file when it changes"""
+    index = build_facet_index(tags_csv)
+    text = json.dumps(index, separators=(",", ":"), ensure_ascii=False) + "\n"
+    if not out_path.exists() or out_path.read_text(encoding="utf-8") != text:
+        out_path.write_text(text, encoding="utf-8")
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write the success stories facet index from a tags CSV")
+    parser.add_argument("--tags", required=True, help="Path to tags CSV")
+    parser.add_argument("--out", required=True, help="Path to facets.json")
+    args = parser.parse_args()
+
+    index = write_facet_index(Path(args.tags), Path(args.out))
+    print(f"✅ Wrote {args.out} ({sum(len(values) for values in index['facets'].values())} facet values, {len(index['pages'])} pages)")
+    for issue in validation_issues(index):
+        print(f"⚠️  {issue}")
+
+
+if __name__ == "__main__":
+    main()
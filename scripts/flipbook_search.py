@@ -0,0 +1,90 @@
+"""Inverted text index for searching flipbooks offline (`search_index.json`).
+
+    {
+      "version": 1,
+      "pageCount": 62,
+      "snippets": ["Leading text of page 1...", ...],
+      "terms": {"norway": [[3, 12, 40], [7, 5]], ...}
+    }
+
+Each term maps to `[page, position, ...]` lists, pages ascending. Positions
+count words from the start of the page, so a phrase is a run of consecutive
+positions on one page. Words are accent-folded (NFKD, combining marks dropped),
+casefolded runs of letters and digits; a client has to split queries the same way.
+The index inverts back to each page's words exactly, so an incremental build
+only extracts text from the pages that changed.
+"""
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+from pypdf import PdfReader
+
+SEARCH_INDEX_FILE = "search_index.json"
+SEARCH_INDEX_VERSION = 1
+SNIPPET_CHARS = 160
+WORD = re.compile(r"[^\W_]+")
+
+
+def normalize_words(text: str) -> list[str]:
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).casefold()
+    return WORD.findall(folded)
+
+
+def make_snippet(text: str) -> str:
+    collapsed = " ".join(text.split())
+    if len(collapsed) <= SNIPPET_CHARS:
+        return collapsed
+    return collapsed[:SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+
+
+def extract_page_range(source_pdf: Path, first_page: int, last_page: int) -> list[tuple[list[str], str]]:
+    """Words and snippet of pages first_page..last_page; runs in a worker process when --jobs > 1"""
+    reader = PdfReader(str(source_pdf))
+    pages = []
+    for index in range(first_page, last_page + 1):
+        try:
+            text = reader.pages[index - 1].extract_text() or ""
+        except Exception as e:
+            print(f"⚠️  Could not extract text from page {index}: {e}")
+            text = ""
+        pages.append((normalize_words(text), make_snippet(text)))
+    return pages
+
+
+def read_search_index(path: Path) -> dict[int, tuple[list[str], str]]:
+    """Recover each page's words and snippet from a previous index (empty if unusable)"""
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if index.get("version") != SEARCH_INDEX_VERSION:
+        return {}
+
+    positioned: dict[int, list[tuple[int, str]]] = {page: [] for page in range(1, index["pageCount"] + 1)}
+    for term, postings in index["terms"].items():
+        for page, *positions in postings:
+            positioned[page].extend((position, term) for position in positions)
+    return {
+        page: ([term for _, term in sorted(words)], index["snippets"][page - 1])
+        for page, words in positioned.items()
+    }
+
+
+def build_search_index(pages: list[tuple[list[str], str]]) -> dict:
+    """Invert per-page words (page 1 first) into the search index payload"""
+    terms: dict[str, list[list[int]]] = {}
+    for page, (words, _) in enumerate(pages, start=1):
+        positions: dict[str, list[int]] = {}
+        for position, word in enumerate(words):
+            positions.setdefault(word, []).append(position)
+        for word, word_positions in positions.items():
+            terms.setdefault(word, []).append([page] + word_positions)
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "pageCount": len(pages),
+        "snippets": [snippet for _, snippet in pages],
+        "terms": dict(sorted(terms.items())),
+    }
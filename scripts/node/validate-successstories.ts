@@ -1,10 +1,38 @@
 import path from 'path';
 import { buildValidationReport, parseSuccessStoriesTagsCsv } from '../../src/features/success-stories/services/successStories.shared';
+import type { SuccessStoriesFacetIndex, SuccessStoryRow } from '../../src/features/success-stories/types';
 import fs from 'fs/promises';
 
+// The facet index is normalized in Python; check it agrees with the TS parse of tags.csv
+function findFacetMismatches(data: SuccessStoryRow[], index: SuccessStoriesFacetIndex): string[] {
+  const expected = new Map<string, Set<number>>();
+  data.forEach((row) => {
+    (['areas', 'companies', 'techs'] as const).forEach((facet) => {
+      row[facet].forEach((value) => {
+        const key = `${facet}:${value}`;
+        if (!expected.has(key)) expected.set(key, new Set());
+        expected.get(key)?.add(row.page);
+      });
+    });
+  });
+
+  const actual = new Map<string, number[]>();
+  (['areas', 'companies', 'techs'] as const).forEach((facet) => {
+    (index.facets[facet] ?? []).forEach((entry) => actual.set(`${facet}:${entry.value}`, entry.pages));
+  });
+
+  const keys = new Set([...expected.keys(), ...actual.keys()]);
+  return Array.from(keys)
+    .filter((key) => {
+      const want = Array.from(expected.get(key) ?? []).sort((a, b) => a - b);
+      return want.join(',') !== (actual.get(key) ?? []).join(',');
+    })
+    .sort();
+}
+
 async function validate() {
-  const csvPath = path.join(process.cwd(), 'public', 'flipbooks', 'success-stories', 'tags.csv');
-  const csvText = await fs.readFile(csvPath, 'utf-8');
+  const baseDir = path.join(process.cwd(), 'public', 'flipbooks', 'success-stories');
+  const csvText = await fs.readFile(path.join(baseDir, 'tags.csv'), 'utf-8');
   const data = parseSuccessStoriesTagsCsv(csvText);
   const report = buildValidationReport(data);
 
@@ -19,6 +47,23 @@ async function validate() {
     return;
   }
 
+  const facetsPath = path.join(baseDir, 'facets.json');
+  const facetsText = await fs.readFile(facetsPath, 'utf-8').catch(() => null);
+  if (facetsText) {
+    const index = JSON.parse(facetsText) as SuccessStoriesFacetIndex;
+    const mismatches = findFacetMismatches(data, index);
+    if (mismatches.length) {
+      console.warn('[validate:successstories] facets.json disagrees with tags.csv for', mismatches);
+      process.exitCode = 1;
+      return;
+    }
+    if (JSON.stringify(index.validation) !== JSON.stringify(report)) {
+      console.warn('[validate:successstories] facets.json validation report is stale', index.validation);
+      process.exitCode = 1;
+      return;
+    }
+  }
+
   console.log('[validate:successstories] OK');
 }
 
@@ -0,0 +1,178 @@
+"""Content-addressed publishing of generated data artifacts.
+
+`write_artifact` writes a file only if its content hash differs from the copy
+on disk. Next to it, it writes precompressed `.gz` (and `.br` when the
+optional `brotli` package is installed) sidecars. `write_manifest` records
+each artifact's hash, size and record count in `data_manifest.json`. Clients
+can poll that small file and fetch a payload only when its hash changes.
+`write_artifact_chunks` does the same for content produced in chunks. It
+streams the chunks to a temp file and hashes them as they go, so a large
+payload is never held in memory.
+`git_blob_sha` matches the SHA GitHub reports for a file, so unchanged
+files are never pushed again.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import struct
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+MANIFEST_VERSION = 1
+READ_BLOCK = 1 << 20
+
+def sha256_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+def git_blob_sha(content: bytes) -> str:
+    """SHA-1 of the git blob object for this content (what the GitHub API reports)"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+def file_sha256(path: str) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(READ_BLOCK), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def _atomic_write(path: str, content: bytes):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def compressed_variants(content: bytes) -> Dict[str, bytes]:
+    """Deterministic gzip (and brotli if available) encodings of the content"""
+    variants = {"gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli_available():
+        import brotli
+        variants["br"] = brotli.compress(content, quality=11)
+    return variants
+
+def compress_file(path: str, out_path: str, ext: str):
+    """Stream a file into a deterministic gzip or brotli sidecar (same bytes as compressed_variants)"""
+    tmp_path = f"{out_path}.tmp"
+    with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+        if ext == "gz":
+            # Header, raw deflate stream and trailer laid out exactly as gzip.compress does
+            dst.write(gzip.compress(b"", compresslevel=9, mtime=0)[:10])
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+            crc = size = 0
+            for block in iter(lambda: src.read(READ_BLOCK), b""):
+                crc = zlib.crc32(block, crc)
+                size += len(block)
+                dst.write(compressor.compress(block))
+            dst.write(compressor.flush())
+            dst.write(struct.pack("<LL", crc, size & 0xFFFFFFFF))
+        else:
+            import brotli
+            compressor = brotli.Compressor(quality=11)
+            for block in iter(lambda: src.read(READ_BLOCK), b""):
+                dst.write(compressor.process(block))
+            dst.write(compressor.finish())
+    os.replace(tmp_path, out_path)
+
+def existing_sidecars(path: str) -> Dict[str, str]:
+    return {ext: f"{path}.{ext}" for ext in ("gz", "br") if os.path.exists(f"{path}.{ext}")}
+
+def write_artifact(path: str, content: bytes, records: Optional[int] = None, precompress: bool = True) -> Dict[str, Any]:
+    """Write an artifact and its sidecars unless the content is unchanged"""
+    digest = sha256_bytes(content)
+    entry: Dict[str, Any] = {"sha256": digest, "bytes": len(content)}
+    if records is not None:
+        entry["records"] = records
+
+    sidecars = existing_sidecars(path) if precompress else {}
+    changed = file_sha256(path) != digest
+    if precompress:
+        # Rebuild sidecars when the artifact changed or one is missing
+        expected = {"gz", "br"} if brotli_available() else {"gz"}
+        if changed or not expected.issubset(sidecars):
+            for stale in sidecars.values():
+                os.remove(stale)
+            sidecars = {}
+            for ext, data in compressed_variants(content).items():
+                _atomic_write(f"{path}.{ext}", data)
+                sidecars[ext] = f"{path}.{ext}"
+        for ext, sidecar in sidecars.items():
+            entry[ext] = {"bytes": os.path.getsize(sidecar)}
+
+    if changed:
+        _atomic_write(path, content)
+        logging.info(f"Wrote {os.path.basename(path)} ({len(content)} bytes, sha256 {digest[:12]})")
+    else:
+        logging.info(f"{os.path.basename(path)} unchanged (sha256 {digest[:12]}), skipping write")
+
+    entry["changed"] = changed
+    entry["files"] = [path] + list(sidecars.values())
+    return entry
+
+def write_artifact_chunks(path: str, chunks: Iterable[bytes], records: Optional[int] = None, precompress: bool = True) -> Dict[str, Any]:
+    """write_artifact for content produced in chunks, streamed through a temp file and renamed into place"""
+    digest = hashlib.sha256()
+    size = 0
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    digest = digest.hexdigest()
+    entry: Dict[str, Any] = {"sha256": digest, "bytes": size}
+    if records is not None:
+        entry["records"] = records
+
+    changed = file_sha256(path) != digest
+    sidecars = existing_sidecars(path) if precompress else {}
+    if precompress:
+        expected = {"gz", "br"} if brotli_available() else {"gz"}
+        if changed or not expected.issubset(sidecars):
+            for stale in sidecars.values():
+                os.remove(stale)
+            sidecars = {}
+            for ext in [ext for ext in ("gz", "br") if ext in expected]:
+                compress_file(tmp_path, f"{path}.{ext}", ext)
+                sidecars[ext] = f"{path}.{ext}"
+        for ext, sidecar in sidecars.items():
+            entry[ext] = {"bytes": os.path.getsize(sidecar)}
+
+    if changed:
+        os.replace(tmp_path, path)
+        logging.info(f"Wrote {os.path.basename(path)} ({size} bytes, sha256 {digest[:12]})")
+    else:
+        os.remove(tmp_path)
+        logging.info(f"{os.path.basename(path)} unchanged (sha256 {digest[:12]}), skipping write")
+
+    entry["changed"] = changed
+    entry["files"] = [path] + list(sidecars.values())
+    return entry
+
+def write_manifest(path: str, entries: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Write data_manifest.json describing the published artifacts"""
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "artifacts": {
+            name: {k: v for k, v in entry.items() if k not in ("changed", "files")}
+            for name, entry in sorted(entries.items())
+        },
+    }
+    content = (json.dumps(manifest, separators=(",", ":"), sort_keys=True) + "\n").encode("utf-8")
+    return write_artifact(path, content, precompress=False)
@@ -0,0 +1,66 @@
+"""Compact column-oriented JSON encoding for operations data.
+
+The legacy `operations_data.json` is an array of records that repeats every
+column name on every row. The columnar payload stores each column once:
+
+    {
+      "format": "operations-columnar",
+      "version": 1,
+      "rowCount": 3214,
+      "columns": [
+        {"name": "Month", "encoding": "plain", "values": [6, 10, ...]},
+        {"name": "Country", "encoding": "dictionary",
+         "dictionary": ["New Zealand", ...], "codes": [0, 0, ...]}
+      ]
+    }
+
+Low-cardinality columns of any type (strings, categoricals, numbers, booleans)
+are dictionary encoded. Null is stored in the dictionary like any other value
+(older files used a null code instead). All other columns are stored as plain
+arrays. Decoding gives records identical to the legacy file; see
+`src/lib/operationsColumnar.ts`.
+"""
+import json
+from typing import Any, Dict
+
+import polars as pl
+
+FORMAT_NAME = "operations-columnar"
+FORMAT_VERSION = 1
+
+# A column is dictionary encoded when it has at most this many distinct values per row
+DICTIONARY_MAX_RATIO = 0.5
+
+def encode_column(series: pl.Series) -> Dict[str, Any]:
+    """Encode one column as a plain array or a dictionary plus integer codes"""
+    if series.dtype == pl.Categorical:
+        series = series.cast(pl.String)
+    if series.len() > 0:
+        dictionary = series.unique(maintain_order=True)
+        if dictionary.len() <= DICTIONARY_MAX_RATIO * series.len():
+            mapping = dictionary.to_frame().with_row_index("code")
+            codes = (
+                series.to_frame()
+                .join(mapping, on=series.name, how="left", nulls_equal=True, maintain_order="left")
+                .get_column("code")
+            )
+            return {
+                "name": series.name,
+                "encoding": "dictionary",
+                "dictionary": dictionary.to_list(),
+                "codes": codes.to_list(),
+            }
+    return {"name": series.name, "encoding": "plain", "values": series.to_list()}
+
+def encode_frame(df: pl.DataFrame) -> Dict[str, Any]:
+    """Build the columnar payload for a frame, preserving column order"""
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "rowCount": df.height,
+        "columns": [encode_column(df[column]) for column in df.columns],
+    }
+
+def dumps(df: pl.DataFrame) -> str:
+    """Serialize a frame to compact columnar JSON"""
+    return json.dumps(encode_frame(df), separators=(",", ":"), ensure_ascii=False, allow_nan=False)
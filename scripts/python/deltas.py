@@ -0,0 +1,222 @@
+"""Record-level deltas between consecutive operations_data builds.
+
+Each build that changes `operations_data.json` gets a version number. The
+diff against the previous build is written as a small patch file:
+
+    {
+      "format": "operations-delta",
+      "version": 1,
+      "from": 41, "to": 42,
+      "keyColumns": ["Year", "Month", "Country", "Location", "Operator", "Well"],
+      "rowCount": 3216,
+      "baseSha256": "...", "sha256": "...",
+      "deleted": [["2024", 5, "Norway", "Stavanger", "Equinor", "31/2-A-1", 0]],
+      "updated": [{"key": [...], "record": {...}}],
+      "inserted": [{"index": 3214, "record": {...}}]
+    }
+
+Records have no ID, so a row is keyed by KEY_COLUMNS plus its occurrence
+among rows with the same key values, in file order. The diff hash-joins the
+previous and current frames on that key in Polars. A row counts as updated
+when its content hash differs; kept rows that moved relative to each other
+are sent as a delete plus an insert. `operations_deltas.json` lists the last
+DELTA_CHAIN_LENGTH patches, so a client on version N can catch up with a few
+small files (see `src/lib/operationsDeltas.ts`). When there is no usable base
+or a patch would touch most rows, a new chain starts and clients fetch the
+full file.
+"""
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import polars as pl
+
+from artifacts import file_sha256, write_artifact
+
+DELTA_FORMAT = "operations-delta"
+CHAIN_FORMAT = "operations-delta-chain"
+DELTA_VERSION = 1
+
+KEY_COLUMNS = ["Year", "Month", "Country", "Location", "Operator", "Well"]
+OCCURRENCE = "_occurrence"
+INDEX = "_index"
+ROW_HASH = "_hash"
+
+# Above this share of changed rows, a patch isn't worth it and the chain restarts
+MAX_DELTA_RATIO = 0.5
+
+def keyed(df: pl.DataFrame) -> pl.LazyFrame:
+    """Add the stable row key, the row position and a content hash to a frame"""
+    return df.lazy().with_columns(
+        pl.int_range(pl.len(), dtype=pl.UInt32).alias(INDEX),
+        pl.int_range(pl.len(), dtype=pl.UInt32).over(KEY_COLUMNS).alias(OCCURRENCE),
+        pl.struct(df.columns).hash(seed=0).alias(ROW_HASH),
+    )
+
+def diff_frames(previous: pl.DataFrame, current: pl.DataFrame) -> Dict[str, pl.DataFrame]:
+    """Split the change between two builds into deleted, updated and inserted rows"""
+    missing = [column for column in KEY_COLUMNS if column not in current.columns or column not in previous.columns]
+    if missing:
+        raise ValueError(f"Missing key columns for delta: {missing}")
+
+    keys = KEY_COLUMNS + [OCCURRENCE]
+    old = keyed(previous)
+    new = keyed(current)
+    old_index = pl.col(f"{INDEX}_old").cast(pl.Int64)
+    # Kept rows must stay in their old relative order; rows that moved are sent as delete + insert
+    matched = (
+        new.join(old.select(keys + [INDEX, ROW_HASH]), on=keys, how="inner", suffix="_old", nulls_equal=True)
+        .sort(INDEX)
+        .with_columns((old_index > old_index.cum_max().shift(1).fill_null(-1)).alias("_in_order"))
+    )
+    moved = matched.filter(~pl.col("_in_order"))
+
+    deleted, updated, inserted = pl.collect_all([
+        pl.concat([
+            old.join(new, on=keys, how="anti", nulls_equal=True).select(keys + [INDEX]),
+            moved.select(keys + [pl.col(f"{INDEX}_old").alias(INDEX)]),
+        ]).sort(INDEX).select(keys),
+        matched.filter(pl.col("_in_order") & (pl.col(ROW_HASH) != pl.col(f"{ROW_HASH}_old"))).select([OCCURRENCE] + current.columns),
+        pl.concat([
+            new.join(old, on=keys, how="anti", nulls_equal=True).select([INDEX] + current.columns),
+            moved.select([INDEX] + current.columns),
+        ]).sort(INDEX),
+    ])
+    return {"deleted": deleted, "updated": updated, "inserted": inserted}
+
+def build_delta(changes: Dict[str, pl.DataFrame], columns: List[str], base_version: int, base_sha: str, sha: str, row_count: int) -> Dict[str, Any]:
+    """Delta payload for the change from base_version to base_version + 1"""
+    keys = KEY_COLUMNS + [OCCURRENCE]
+    updated = changes["updated"]
+    inserted = changes["inserted"]
+    return {
+        "format": DELTA_FORMAT,
+        "version": DELTA_VERSION,
+        "from": base_version,
+        "to": base_version + 1,
+        "keyColumns": KEY_COLUMNS,
+        "rowCount": row_count,
+        "baseSha256": base_sha,
+        "sha256": sha,
+        "deleted": [list(row) for row in changes["deleted"].rows()],
+        "updated": [
+            {"key": list(key), "record": record}
+            for key, record in zip(updated.select(keys).rows(), updated.select(columns).to_dicts())
+        ],
+        "inserted": [
+            {"index": index, "record": record}
+            for index, record in zip(inserted[INDEX].to_list(), inserted.select(columns).to_dicts())
+        ],
+    }
+
+def read_previous_build(path: str, schema: pl.Schema) -> Optional[pl.DataFrame]:
+    """Parse the previously published records with the current schema"""
+    try:
+        previous = pl.read_json(path)
+        if set(previous.columns) != set(schema.names()):
+            return None
+        return previous.select(schema.names()).cast(dict(schema))
+    except Exception as e:
+        logging.warning(f"Could not read previous build for delta: {e}")
+        return None
+
+def load_chain(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            chain = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if chain.get("format") != CHAIN_FORMAT or chain.get("version") != DELTA_VERSION:
+        return None
+    return chain
+
+def load_previous_build(data_path: str, chain_path: str, schema: pl.Schema) -> Optional[pl.DataFrame]:
+    """The published records the chain's current version points at, if the file on disk still matches it.
+
+    Call before the new build overwrites `data_path`.
+    """
+    chain = load_chain(chain_path)
+    if chain is None or file_sha256(data_path) != chain["sha256"]:
+        return None
+    return read_previous_build(data_path, schema)
+
+def delta_path(delta_dir: str, version: int) -> str:
+    return os.path.join(delta_dir, f"operations_delta.{version}.json")
+
+def publish_delta(
+    previous: Optional[pl.DataFrame],
+    current: pl.DataFrame,
+    sha: str,
+    chain_path: str,
+    delta_dir: str,
+    chain_length: int,
+) -> Dict[str, Any]:
+    """Write the delta for this build and update the chain index.
+
+    `previous` comes from load_previous_build and `sha` is the SHA-256 of the
+    records file just written. Returns the chain's artifact entry, with any new
+    delta files added to its `files` so they are published too, and the current
+    data version.
+    """
+    chain = load_chain(chain_path)
+    delta_files = []
+
+    if chain is not None and chain["sha256"] == sha:
+        logging.info(f"Operations data unchanged at version {chain['current']}, no delta")
+    else:
+        changes = diff_frames(previous, current) if chain is not None and previous is not None else None
+        if changes is not None and sum(frame.height for frame in changes.values()) > MAX_DELTA_RATIO * current.height:
+            logging.info("Delta touches most rows, publishing a full build instead")
+            changes = None
+
+        version = chain["current"] + 1 if chain is not None else 1
+        deltas = list(chain["deltas"]) if chain is not None else []
+        if changes is None:
+            # No usable base (first run, hand-edited file or schema change) or too large
+            logging.info(f"Starting a new delta chain at version {version}")
+            deltas = []
+        else:
+            delta = build_delta(changes, current.columns, chain["current"], chain["sha256"], sha, current.height)
+            content = json.dumps(delta, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+            os.makedirs(delta_dir, exist_ok=True)
+            entry = write_artifact(delta_path(delta_dir, version), content)
+            delta_files.extend(entry["files"])
+            deltas.append({
+                "from": delta["from"],
+                "to": delta["to"],
+                "file": os.path.relpath(delta_path(delta_dir, version), os.path.dirname(chain_path)).replace(os.sep, "/"),
+                "sha256": entry["sha256"],
+                "bytes": entry["bytes"],
+                "deleted": len(delta["deleted"]),
+                "updated": len(delta["updated"]),
+                "inserted": len(delta["inserted"]),
+            })
+            logging.info(
+                f"Delta v{delta['from']} -> v{delta['to']}: {len(delta['inserted'])} inserted, "
+                f"{len(delta['updated'])} updated, {len(delta['deleted'])} deleted ({entry['bytes']} bytes)"
+            )
+
+        chain = {
+            "format": CHAIN_FORMAT,
+            "version": DELTA_VERSION,
+            "current": version,
+            "sha256": sha,
+            "deltas": deltas[-chain_length:] if chain_length > 0 else [],
+        }
+
+    prune_deltas(delta_dir, {d["to"] for d in chain["deltas"]})
+    content = json.dumps(chain, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    entry = write_artifact(chain_path, content, precompress=False)
+    entry["files"] = entry["files"] + delta_files
+    entry["dataVersion"] = chain["current"]
+    return entry
+
+def prune_deltas(delta_dir: str, keep: set):
+    """Remove delta files (and their sidecars) that fell off the chain"""
+    if not os.path.isdir(delta_dir):
+        return
+    for name in os.listdir(delta_dir):
+        parts = name.split(".")
+        if len(parts) >= 3 and parts[0] == "operations_delta" and parts[1].isdigit() and int(parts[1]) not in keep:
+            os.remove(os.path.join(delta_dir, name))
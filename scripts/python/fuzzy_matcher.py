@@ -0,0 +1,158 @@
+"""Indexed fuzzy matching against the reference country and city lists.
+
+`FuzzyMatcher.match(value)` returns exactly what
+`difflib.get_close_matches(value, choices, n=1, cutoff=cutoff)` would, but a
+trigram inverted index first short-lists the choices that can still reach the
+cutoff, so only a handful of strings are scored with `SequenceMatcher`.
+
+The short-list is lossless. A score of at least `cutoff` needs
+M >= cutoff * (len(a) + len(b)) / 2 matched characters. That bounds the length
+of a viable choice, and it also gives a minimum number of trigrams the two
+strings must share: every unmatched character removes at most 3 of the
+query's trigrams. Choices below either bound cannot match and are skipped.
+
+Run `python fuzzy_matcher.py` to check the index against difflib on the
+reference lists; `tests/test_fuzzy_matcher.py` runs the same check under pytest.
+"""
+import math
+import random
+import sys
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher, get_close_matches
+from typing import Iterable, List, Optional
+
+NGRAM_SIZE = 3
+DEFAULT_CUTOFF = 0.85
+
+def ngrams(value: str, size: int = NGRAM_SIZE) -> Counter:
+    """Count the overlapping n-grams of a string"""
+    return Counter(value[i:i + size] for i in range(len(value) - size + 1))
+
+class FuzzyMatcher:
+    """Trigram-indexed equivalent of difflib.get_close_matches(n=1)"""
+
+    def __init__(self, choices: Iterable[str], cutoff: float = DEFAULT_CUTOFF, size: int = NGRAM_SIZE):
+        self.choices: List[str] = list(choices)
+        self.cutoff = cutoff
+        self.size = size
+        self._exact = set(self.choices)
+        self._by_length = defaultdict(list)
+        self._postings = defaultdict(list)
+
+        for index, choice in enumerate(self.choices):
+            self._by_length[len(choice)].append(index)
+            for gram, count in ngrams(choice, size).items():
+                self._postings[gram].append((index, count))
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._exact
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def _viable_length(self, query_len: int, choice_len: int) -> bool:
+        # ratio = 2M / (la + lb) and M <= min(la, lb)
+        return 2 * min(query_len, choice_len) >= self.cutoff * (query_len + choice_len) - 1e-9
+
+    def _min_shared(self, query_len: int, choice_len: int) -> int:
+        matched = math.ceil(self.cutoff * (query_len + choice_len) / 2 - 1e-9)
+        deletions = query_len - matched
+        insertions = choice_len - matched
+        return (query_len - self.size + 1) - self.size * deletions - (self.size - 1) * insertions
+
+    def candidates(self, value: str) -> List[int]:
+        """Return the indexes of choices that can still score above the cutoff"""
+        query_len = len(value)
+        shared = defaultdict(int)
+        for gram, query_count in ngrams(value, self.size).items():
+            for index, choice_count in self._postings.get(gram, ()):
+                shared[index] += min(query_count, choice_count)
+
+        result = []
+        for choice_len, indexes in self._by_length.items():
+            if not self._viable_length(query_len, choice_len):
+                continue
+            threshold = self._min_shared(query_len, choice_len)
+            if threshold <= 0:
+                result.extend(indexes)
+            else:
+                result.extend(i for i in indexes if shared.get(i, 0) >= threshold)
+        return result
+
+    def match(self, value: str) -> Optional[str]:
+        """Return the closest choice scoring at least the cutoff, or None"""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(value)
+        best = None
+        for index in self.candidates(value):
+            choice = self.choices[index]
+            matcher.set_seq1(choice)
+            if (matcher.real_quick_ratio() >= self.cutoff
+                    and matcher.quick_ratio() >= self.cutoff):
+                score = matcher.ratio()
+                # Same ordering as heapq.nlargest over (score, choice) in difflib
+                if score >= self.cutoff and (best is None or (score, choice) > best):
+                    best = (score, choice)
+        return best[1] if best else None
+
+# === VERIFICATION ===
+
+def _perturb(value: str, rng: random.Random) -> str:
+    if len(value) < 2:
+        return value + "x"
+    i = rng.randrange(len(value))
+    op = rng.choice(("delete", "insert", "replace", "swap"))
+    if op == "delete":
+        return value[:i] + value[i + 1:]
+    if op == "insert":
+        return value[:i] + rng.choice("aeiouxyz ") + value[i:]
+    if op == "replace":
+        return value[:i] + rng.choice("aeiouxyz") + value[i + 1:]
+    j = min(i + 1, len(value) - 1)
+    return value[:i] + value[j] + value[i] + value[j + 1:]
+
+def verification_queries(choices: List[str], others: Iterable[str], rng: random.Random) -> List[str]:
+    """Exact choices, values from another list, one- and two-edit typos and junk"""
+    queries = list(choices) + list(others)
+    for _ in range(3):
+        queries += [_perturb(value, rng) for value in choices]
+    queries += [_perturb(_perturb(value, rng), rng) for value in choices]
+    queries += ["", "0", "x", "New", "Unknown"]
+    return queries
+
+def verify_against_difflib(choices: List[str], queries: Iterable[str], cutoff: float = DEFAULT_CUTOFF) -> List[str]:
+    """Return a description of every query where the index disagrees with difflib"""
+    matcher = FuzzyMatcher(choices, cutoff=cutoff)
+    mismatches = []
+    for query in queries:
+        expected = get_close_matches(query, choices, n=1, cutoff=cutoff)
+        expected = expected[0] if expected else None
+        actual = matcher.match(query)
+        if actual != expected:
+            mismatches.append(f"{query!r}: difflib={expected!r} indexed={actual!r}")
+    return mismatches
+
+def main() -> int:
+    import json
+    import os
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(base_dir, "master_country_list.json")) as f:
+        countries = json.load(f)
+    with open(os.path.join(base_dir, "known_cities.json")) as f:
+        cities = json.load(f)
+
+    rng = random.Random(0)
+    failures = 0
+    for name, choices, others in (("countries", countries, cities), ("cities", cities, countries)):
+        queries = verification_queries(choices, others, rng)
+        mismatches = verify_against_difflib(choices, queries)
+        print(f"{name}: {len(queries)} queries, {len(mismatches)} mismatches")
+        for line in mismatches[:20]:
+            print(f"  {line}")
+        failures += len(mismatches)
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
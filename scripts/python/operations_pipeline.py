@@ -0,0 +1,861 @@
+"""In-process API for turning the job history workbook into operations data.
+
+Importing this module has no side effects: it configures no logging, reads no
+environment variables and loads no reference data. `generate_json.py` is a thin
+CLI over it; tests, benchmarks and other tools can drive it directly:
+
+    from operations_pipeline import Config, Pipeline
+
+    pipeline = Pipeline(Config(OUTPUT_DIR="/tmp/out"))
+    result = pipeline.process("/path/to/jobhistory.xlsx")
+    result.df                          # normalized, typed Polars frame
+    result.report.unknown_countries    # anomalies of this run only
+    pipeline.process(other_workbook)   # reuses the loaded reference data
+
+`Config` reads the same environment variables as the CLI when it is created,
+and keyword arguments override them. `ReferenceData` loads the reference
+lists and builds the fuzzy matchers on first use; a `Pipeline` keeps one for
+all of its runs. Each `process()` call gets its own resolution cache, anomaly
+report and metrics, so nothing accumulates between runs.
+"""
+import json
+import logging
+import os
+import time
+from calendar import month_name
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+import columnar_json
+import rollups
+from artifacts import git_blob_sha, write_artifact, write_artifact_chunks, write_manifest
+from deltas import load_previous_build, publish_delta
+from excel_cache import scan_excel_cached
+from fuzzy_matcher import FuzzyMatcher
+from normalization_config import COUNTRY_NORMALIZATION, REGION_NORMALIZATION, SYSTEM_GROUPS, SUCCESS_VALUES, LOCATION_NORMALIZATION
+from operations_schema import cast_operations
+from records_json import iter_records_json
+from resolution_cache import ResolutionCache, reference_fingerprint
+from run_metrics import RunMetrics
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").lower() == "true"
+
+# === CONFIGURATION CLASS ===
+class Config:
+    """Settings for one run, read from the environment when created.
+
+    Keyword arguments override the environment, e.g.
+    Config(OUTPUT_DIR="/tmp/out", OUTPUT_FORMATS=["columnar"]). Output, log and
+    state file paths follow OUTPUT_DIR, LOG_DIR and EXCEL_CACHE_DIR.
+    """
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    REPO_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+
+    # Inputs that ship with the scripts
+    EXCEL_SHEET = "MasterData_Operations"
+    MASTER_COUNTRIES_JSON = os.path.join(BASE_DIR, "master_country_list.json")
+    KNOWN_CITIES_JSON = os.path.join(BASE_DIR, "known_cities.json")
+    NORMALIZATION_CONFIG = os.path.join(BASE_DIR, "normalization_config.py")
+
+    # GitHub targets
+    TARGET_DATA_DIR = "public/data"
+    TARGET_FULL_JSON = "public/data/operations_data.json"
+    TARGET_COLUMNAR_JSON = "public/data/operations_data.columnar.json"
+    TARGET_ROLLUPS_JSON = "public/data/operations_rollups.json"
+    TARGET_DELTA_CHAIN_JSON = "public/data/operations_deltas.json"
+    TARGET_BRANCH = "main"
+
+    def __init__(self, **overrides):
+        # File paths
+        self.EXCEL_PATH = os.getenv("EXCEL_PATH", os.path.join(self.REPO_ROOT, "data", "private", "raw", "jobhistory.xlsx"))
+        self.EXCEL_CACHE_DIR = os.getenv("EXCEL_CACHE_DIR", os.path.join(self.REPO_ROOT, "data", "private", "cache"))
+        self.REFRESH_EXCEL_CACHE = _env_flag("REFRESH_EXCEL_CACHE")
+        self.FULL_REBUILD = _env_flag("FULL_REBUILD")
+        self.OUTPUT_DIR = os.getenv("OUTPUT_DIR", os.path.join(self.REPO_ROOT, "public", "data"))
+        self.DELTA_CHAIN_LENGTH = int(os.getenv("DELTA_CHAIN_LENGTH", "30"))
+        # "legacy" (array of records), "columnar" (dictionary-encoded columns), "delta" (patches between legacy builds)
+        self.OUTPUT_FORMATS = [f.strip() for f in os.getenv("OUTPUT_FORMATS", "legacy,columnar,delta").split(",") if f.strip()]
+        self.RESOLUTION_CACHE_JSON = os.getenv("RESOLUTION_CACHE_JSON", os.path.join(self.BASE_DIR, "resolution_cache.json"))
+        self.LOG_DIR = os.getenv("LOG_DIR", self.BASE_DIR)
+        self.RUN_METRICS_JSON = os.getenv("RUN_METRICS_JSON", os.path.join(self.REPO_ROOT, "data", "private", "metrics", "run_metrics.json"))
+
+        # GitHub config
+        self.GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+        self.REPO_OWNER = os.getenv("REPO_OWNER", "klaratech")
+        self.REPO_NAME = os.getenv("REPO_NAME", "petromac")
+        self.SKIP_GITHUB_PUSH = _env_flag("SKIP_GITHUB_PUSH")
+
+        # Processing config
+        self.CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "10000"))
+        self.STREAMING = _env_flag("STREAMING")
+        self.MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
+
+        for name, value in overrides.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Unknown config option: {name}")
+            setattr(self, name, value)
+
+    @property
+    def INCREMENTAL_STATE(self) -> str:
+        return os.path.join(self.EXCEL_CACHE_DIR, "operations_state.arrow")
+
+    @property
+    def INCREMENTAL_STATE_KEY(self) -> str:
+        return os.path.join(self.EXCEL_CACHE_DIR, "operations_state.json")
+
+    @property
+    def OUTPUT_FULL_JSON(self) -> str:
+        return os.path.join(self.OUTPUT_DIR, "operations_data.json")
+
+    @property
+    def OUTPUT_COLUMNAR_JSON(self) -> str:
+        return os.path.join(self.OUTPUT_DIR, "operations_data.columnar.json")
+
+    @property
+    def OUTPUT_ROLLUPS_JSON(self) -> str:
+        return os.path.join(self.OUTPUT_DIR, "operations_rollups.json")
+
+    @property
+    def OUTPUT_MANIFEST_JSON(self) -> str:
+        return os.path.join(self.OUTPUT_DIR, "data_manifest.json")
+
+    @property
+    def OUTPUT_DELTA_CHAIN_JSON(self) -> str:
+        return os.path.join(self.OUTPUT_DIR, "operations_deltas.json")
+
+    @property
+    def OUTPUT_DELTA_DIR(self) -> str:
+        return os.path.join(self.OUTPUT_DIR, "deltas")
+
+    # Log files
+    @property
+    def FUZZY_MATCH_LOG(self) -> str:
+        return os.path.join(self.LOG_DIR, "fuzzy_matched_countries.txt")
+
+    @property
+    def UNKNOWN_COUNTRY_LOG(self) -> str:
+        return os.path.join(self.LOG_DIR, "unknown_countries.txt")
+
+    @property
+    def FUZZY_MATCHED_LOCATIONS_LOG(self) -> str:
+        return os.path.join(self.LOG_DIR, "fuzzy_matched_locations.txt")
+
+    @property
+    def UNKNOWN_LOCATIONS_LOG(self) -> str:
+        return os.path.join(self.LOG_DIR, "unknown_locations.txt")
+
+    @property
+    def CAST_FAILURES_LOG(self) -> str:
+        return os.path.join(self.LOG_DIR, "cast_failures.txt")
+
+# === VALIDATION FUNCTIONS ===
+def validate_environment(config: Config, workbook_path: Optional[str] = None) -> bool:
+    """Validate required environment and files exist"""
+    required_files = [workbook_path or config.EXCEL_PATH, Config.MASTER_COUNTRIES_JSON, Config.KNOWN_CITIES_JSON]
+    missing_files = [f for f in required_files if not os.path.exists(f)]
+
+    if missing_files:
+        logging.error(f"Missing required files: {missing_files}")
+        return False
+
+    if not config.GITHUB_TOKEN:
+        logging.warning("GITHUB_TOKEN not set - GitHub push will be skipped")
+
+    logging.info("Environment validation passed")
+    return True
+
+def validate_github_token(token: str) -> bool:
+    """Validate GitHub token format"""
+    if not token:
+        return False
+    return token.startswith(('ghp_', 'github_pat_')) and len(token) >= 40
+
+def validate_processed_data(df: pl.DataFrame) -> bool:
+    """Validate the processed data meets quality standards"""
+    if df.is_empty():
+        logging.error("Processed data is empty")
+        return False
+
+    required_columns = ['Country', 'System', 'Year', 'Successful']
+    missing_cols = [col for col in required_columns if col not in df.columns]
+    if missing_cols:
+        logging.error(f"Missing required columns: {missing_cols}")
+        return False
+
+    if 'Year' in df.columns:
+        years = df['Year']
+        invalid_years = years.filter((years < 1990) | (years > 2030)).len()
+        if invalid_years > 0:
+            logging.warning(f"Found {invalid_years} records with invalid years")
+
+    logging.info(f"Data validation passed: {df.height} records")
+    return True
+
+def generate_metrics(df: pl.DataFrame, report: Optional["AnomalyReport"] = None) -> Dict[str, Any]:
+    """Generate processing metrics"""
+    metrics = {
+        "total_records": df.height,
+        "timestamp": datetime.now().isoformat(),
+        "countries": df['Country'].n_unique() if 'Country' in df.columns else 0,
+        "systems": df['System'].n_unique() if 'System' in df.columns else 0,
+        "success_rate": float(df['Successful'].mean()) if 'Successful' in df.columns else 0,
+    }
+
+    if 'Year' in df.columns:
+        years = df['Year'].drop_nulls()
+        metrics["date_range"] = {
+            "min_year": int(years.min()) if years.len() > 0 else None,
+            "max_year": int(years.max()) if years.len() > 0 else None
+        }
+
+    if report is not None and report.cast_failures:
+        metrics["cast_failures"] = {column: failure["count"] for column, failure in report.cast_failures.items()}
+
+    return metrics
+
+# === REFERENCE DATA ===
+class ReferenceData:
+    """Known countries and cities and their fuzzy matchers, loaded on first use.
+
+    One instance can serve any number of runs, so the reference lists are read
+    and indexed once per process. Create a new one to pick up edited lists.
+    """
+
+    def __init__(self, countries_path: str = Config.MASTER_COUNTRIES_JSON, cities_path: str = Config.KNOWN_CITIES_JSON, cutoff: float = 0.85):
+        self.countries_path = countries_path
+        self.cities_path = cities_path
+        self.cutoff = cutoff
+        self._countries: Optional[List[str]] = None
+        self._cities: Optional[List[str]] = None
+        self._country_matcher: Optional[FuzzyMatcher] = None
+        self._location_matcher: Optional[FuzzyMatcher] = None
+        self._fingerprint: Optional[str] = None
+
+    @staticmethod
+    def _read_list(path: str, kind: str) -> List[str]:
+        try:
+            with open(path, "r") as f:
+                values = json.load(f)
+        except Exception as e:
+            logging.error(f"Failed to load reference data: {e}")
+            raise
+        logging.info(f"Loaded {len(values)} known {kind}")
+        return values
+
+    @property
+    def countries(self) -> List[str]:
+        if self._countries is None:
+            self._countries = self._read_list(self.countries_path, "countries")
+        return self._countries
+
+    @property
+    def cities(self) -> List[str]:
+        if self._cities is None:
+            self._cities = self._read_list(self.cities_path, "cities")
+        return self._cities
+
+    @property
+    def country_matcher(self) -> FuzzyMatcher:
+        # Replaces linear difflib scans over the reference list
+        if self._country_matcher is None:
+            self._country_matcher = FuzzyMatcher(self.countries, cutoff=self.cutoff)
+        return self._country_matcher
+
+    @property
+    def location_matcher(self) -> FuzzyMatcher:
+        if self._location_matcher is None:
+            self._location_matcher = FuzzyMatcher(self.cities, cutoff=self.cutoff)
+        return self._location_matcher
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash that invalidates cached resolutions when the reference data changes"""
+        if self._fingerprint is None:
+            self._fingerprint = reference_fingerprint(
+                [self.countries_path, self.cities_path, Config.NORMALIZATION_CONFIG],
+                extra=f"cutoff={self.cutoff}",
+            )
+        return self._fingerprint
+
+    def load(self) -> "ReferenceData":
+        """Load everything now instead of on first use"""
+        for name in ("country_matcher", "location_matcher", "fingerprint"):
+            getattr(self, name)
+        return self
+
+# === ANOMALY REPORT ===
+class AnomalyReport:
+    """Values one run could not resolve exactly, and cells that failed to cast"""
+
+    def __init__(self):
+        self.fuzzy_countries: List[Tuple[str, str]] = []
+        self.unknown_countries: List[str] = []
+        self.fuzzy_locations: List[Tuple[str, str]] = []
+        self.unknown_locations: List[str] = []
+        self.cast_failures: Dict[str, Dict[str, Any]] = {}
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "fuzzyCountries": len(self.fuzzy_countries),
+            "unknownCountries": len(set(self.unknown_countries)),
+            "fuzzyLocations": len(self.fuzzy_locations),
+            "unknownLocations": len(set(self.unknown_locations)),
+            "castFailures": sum(failure["count"] for failure in self.cast_failures.values()),
+        }
+
+    def write(self, config: Config):
+        """Write the anomaly logs to config.LOG_DIR, removing logs this run has nothing for"""
+        try:
+            write_log(
+                config.FUZZY_MATCH_LOG,
+                [f"Fuzzy matched country: '{raw}' -> '{match}'" for raw, match in self.fuzzy_countries],
+            )
+            if self.fuzzy_countries:
+                logging.info(f"Wrote {len(self.fuzzy_countries)} fuzzy country matches")
+
+            write_log(config.UNKNOWN_COUNTRY_LOG, sorted(set(self.unknown_countries)))
+            if self.unknown_countries:
+                logging.warning(f"Found {len(set(self.unknown_countries))} unknown countries")
+
+            write_log(
+                config.FUZZY_MATCHED_LOCATIONS_LOG,
+                [f"Fuzzy matched location: '{raw}' -> '{match}'" for raw, match in self.fuzzy_locations],
+            )
+            if self.fuzzy_locations:
+                logging.info(f"Wrote {len(self.fuzzy_locations)} fuzzy location matches")
+
+            write_log(config.UNKNOWN_LOCATIONS_LOG, sorted(set(self.unknown_locations)))
+            if self.unknown_locations:
+                logging.warning(f"Found {len(set(self.unknown_locations))} unknown locations")
+
+            write_log(config.CAST_FAILURES_LOG, [
+                f"{column}: {failure['count']} values failed to cast, e.g. {failure['samples']}"
+                for column, failure in self.cast_failures.items()
+            ])
+            if self.cast_failures:
+                logging.warning(f"Found uncastable values in {len(self.cast_failures)} columns")
+
+        except Exception as e:
+            logging.error(f"Failed to write anomaly logs: {e}")
+
+def write_log(path: str, lines: List[str]):
+    """Write one anomaly log; an empty one removes the file so no stale entries survive"""
+    if lines:
+        with open(path, "w") as f:
+            f.write("\n".join(lines))
+    elif os.path.exists(path):
+        os.remove(path)
+
+# === HELPERS ===
+
+def push_to_github(local_path: str, github_path: str, config: Config) -> bool:
+    """Push file to GitHub with error handling"""
+    if config.SKIP_GITHUB_PUSH:
+        logging.info("SKIP_GITHUB_PUSH=true, skipping GitHub push")
+        return True
+
+    if not config.GITHUB_TOKEN:
+        logging.warning("Skipping GitHub push: GITHUB_TOKEN not set")
+        return True
+
+    try:
+        from github import Github
+        logging.info(f"Pushing {os.path.basename(local_path)} to GitHub...")
+        g = Github(config.GITHUB_TOKEN)
+        repo = g.get_repo(f"{config.REPO_OWNER}/{config.REPO_NAME}")
+
+        with open(local_path, "rb") as f:
+            content = f.read()
+
+        try:
+            existing = repo.get_contents(github_path, ref=config.TARGET_BRANCH)
+        except Exception:
+            existing = None
+
+        if existing is None:
+            repo.create_file(
+                path=github_path,
+                message=f"Create {os.path.basename(local_path)}",
+                content=content,
+                branch=config.TARGET_BRANCH,
+            )
+            logging.info(f"Created {github_path}")
+        elif existing.sha == git_blob_sha(content):
+            logging.info(f"{github_path} unchanged on GitHub (blob {existing.sha[:12]}), skipping push")
+        else:
+            repo.update_file(
+                path=github_path,
+                message=f"Update {os.path.basename(local_path)} ({datetime.now().isoformat(timespec='seconds')})",
+                content=content,
+                sha=existing.sha,
+                branch=config.TARGET_BRANCH,
+            )
+            logging.info(f"Updated {github_path}")
+
+        return True
+    except Exception as e:
+        logging.error(f"GitHub push failed: {e}")
+        return False
+
+def push_to_github_with_retry(local_path: str, github_path: str, config: Config, max_retries: int = None) -> bool:
+    """Push to GitHub with exponential backoff retry"""
+    if max_retries is None:
+        max_retries = config.MAX_RETRIES
+
+    for attempt in range(max_retries):
+        if push_to_github(local_path, github_path, config):
+            return True
+
+        if attempt < max_retries - 1:
+            wait_time = 2 ** attempt
+            logging.warning(f"Retrying GitHub push in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
+            time.sleep(wait_time)
+
+    logging.error(f"Failed to push to GitHub after {max_retries} attempts")
+    return False
+
+def push_artifacts(paths: List[str], config: Config) -> bool:
+    """Push published files to the same paths under TARGET_DATA_DIR (unchanged blobs are skipped)"""
+    return all([
+        push_to_github_with_retry(path, Path(config.TARGET_DATA_DIR, os.path.relpath(path, config.OUTPUT_DIR)).as_posix(), config)
+        for path in paths
+    ])
+
+def normalize_month(value):
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    if value in ("", "0", "none", "null"):
+        return None
+    try:
+        num = int(float(value))
+        if 1 <= num <= 12:
+            return num
+    except (ValueError, OverflowError):
+        pass
+    for i, name in enumerate(month_name):
+        if name and name.lower().startswith(value[:3]):
+            return i
+    return None
+
+def normalize_region(value):
+    return REGION_NORMALIZATION.get(str(value).strip(), str(value).strip())
+
+def normalize_success(value):
+    return SUCCESS_VALUES.get(str(value).strip().lower(), 0)
+
+def group_system(value):
+    return SYSTEM_GROUPS.get(str(value).strip(), str(value).strip())
+
+class Resolver:
+    """Country and location normalizers for one run: shared reference data, per-run cache and report"""
+
+    def __init__(self, reference: ReferenceData, resolution_cache: ResolutionCache, report: AnomalyReport):
+        self.reference = reference
+        self.resolution_cache = resolution_cache
+        self.report = report
+        # Values resolved this run, so reporting them again doesn't count as more cache lookups
+        self.resolved: Dict[str, Dict[str, dict]] = {"country": {}, "location": {}}
+
+    def _resolve(self, kind: str, value: str, matcher: FuzzyMatcher) -> dict:
+        resolution = self.resolved[kind].get(value)
+        if resolution is not None:
+            return resolution
+        resolution = self.resolution_cache.lookup(kind, value)
+        if resolution is None:
+            match = matcher.match(value)
+            resolution = {"value": match, "method": "fuzzy"} if match else {"value": value, "method": "unknown"}
+            self.resolution_cache.store(kind, value, resolution["value"], resolution["method"])
+        self.resolved[kind][value] = resolution
+        return resolution
+
+    def _pinned(self, kind: str, value: str) -> Optional[dict]:
+        """Operator pin for a raw value; pins override config mappings and exact matches too"""
+        pinned = self.resolution_cache.pinned[kind].get(value)
+        return None if pinned is None else {"value": pinned, "method": "pinned"}
+
+    def _country(self, value) -> Tuple[str, dict]:
+        value = str(value).strip()
+        pinned = self._pinned("country", value)
+        if pinned is not None:
+            return value, pinned
+        if value in COUNTRY_NORMALIZATION:
+            return value, {"value": COUNTRY_NORMALIZATION[value], "method": "config"}
+        return value, self._resolve("country", value, self.reference.country_matcher)
+
+    def _location(self, value) -> Tuple[str, dict]:
+        value = str(value).strip()
+        pinned = self._pinned("location", value)
+        if pinned is not None:
+            return value, pinned
+        if value in LOCATION_NORMALIZATION:
+            return value, {"value": LOCATION_NORMALIZATION[value], "method": "config"}
+        if value in self.reference.location_matcher:
+            return value, {"value": value, "method": "exact"}
+        return value, self._resolve("location", value, self.reference.location_matcher)
+
+    def country(self, value):
+        return self._country(value)[1]["value"]
+
+    def location(self, value):
+        return self._location(value)[1]["value"]
+
+    def record_anomalies(self, countries: list, locations: list):
+        """Rebuild the report's fuzzy and unknown lists from the distinct raw values of every current row"""
+        report = self.report
+        report.fuzzy_countries, report.unknown_countries = [], []
+        for value, resolution in map(self._country, countries):
+            if resolution["method"] == "fuzzy":
+                report.fuzzy_countries.append((value, resolution["value"]))
+            elif resolution["method"] == "unknown":
+                report.unknown_countries.append(value)
+
+        report.fuzzy_locations, report.unknown_locations = [], []
+        for value, resolution in map(self._location, locations):
+            if resolution["method"] == "fuzzy":
+                report.fuzzy_locations.append((value, resolution["value"]))
+            elif resolution["method"] == "unknown":
+                report.unknown_locations.append(value)
+
+# === NORMALIZATION ENGINE ===
+# Each normalizer runs once per distinct value of its column; the results are
+# mapped back onto the frame with a native Polars lookup so per-row work stays in Rust.
+def column_normalizers(resolver: Resolver) -> Dict[str, tuple]:
+    """Column -> (log message, normalizer, dtype) with the reference normalizers bound to a run"""
+    return {
+        "Month": ("Normalizing 'Month' column...", normalize_month, pl.Int64),
+        "Region": ("Normalizing regions...", normalize_region, pl.String),
+        "Country": ("Normalizing countries...", resolver.country, pl.String),
+        "Location": ("Normalizing locations...", resolver.location, pl.String),
+        "Successful": ("Normalizing success values...", normalize_success, pl.Int64),
+        "System": ("Grouping systems...", group_system, pl.String),
+    }
+
+# Normalized before nulls are filled so missing months stay null; the other
+# normalized columns see missing cells as "0", every other column keeps its nulls
+PRE_FILL_COLUMNS = ["Month"]
+
+def distinct_values_expr(column: str) -> pl.Expr:
+    """Distinct raw values of a column as its normalizer will see them"""
+    if column in PRE_FILL_COLUMNS:
+        return pl.col(column).drop_nulls().unique(maintain_order=True)
+    return pl.col(column).fill_null("0").unique(maintain_order=True)
+
+def build_value_maps(lf: pl.LazyFrame, normalizers: Dict[str, tuple], metrics: RunMetrics) -> Dict[str, pl.DataFrame]:
+    """Resolve every distinct value of the normalized columns in one pass"""
+    schema = lf.collect_schema()
+    columns = [column for column in normalizers if column in schema]
+    with metrics.stage("resolve_values") as stage:
+        rows, *distinct = pl.collect_all([lf.select(pl.len())] + [lf.select(distinct_values_expr(column)) for column in columns])
+        rows = rows.item()
+        stage["rowsIn"] = rows
+        stage["columns"] = {}
+
+        value_maps = {}
+        for column, values in zip(columns, distinct):
+            message, normalizer, dtype = normalizers[column]
+            logging.info(message)
+            started = time.perf_counter()
+            raw = values.to_series()
+            value_maps[column] = pl.DataFrame({
+                "raw": raw,
+                "normalized": pl.Series([normalizer(value) for value in raw.to_list()], dtype=dtype),
+            })
+            logging.info(f"Resolved {raw.len()} distinct '{column}' values")
+            # Rows answered from the value map instead of a normalizer call
+            metrics.cache(f"normalize:{column}", hits=max(rows - raw.len(), 0), misses=raw.len())
+            stage["columns"][column] = {"distinct": raw.len(), "seconds": round(time.perf_counter() - started, 4)}
+    return value_maps
+
+def lookup_expr(column: str, value_map: pl.DataFrame) -> pl.Expr:
+    dtype = value_map["normalized"].dtype
+    if value_map.is_empty():
+        # No rows (or only nulls) to map; replace_strict would keep the raw String dtype
+        return pl.col(column).cast(dtype, strict=False).alias(column)
+    return (
+        pl.col(column)
+        .replace_strict(value_map["raw"], value_map["normalized"], return_dtype=dtype)
+        .alias(column)
+    )
+
+def normalize_rows(lf: pl.LazyFrame, normalizers: Dict[str, tuple], metrics: RunMetrics) -> pl.LazyFrame:
+    """Add all column normalizations to a plan of raw rows"""
+    value_maps = build_value_maps(lf, normalizers, metrics)
+
+    pre_fill = [lookup_expr(c, m) for c, m in value_maps.items() if c in PRE_FILL_COLUMNS]
+    post_fill = [lookup_expr(c, m) for c, m in value_maps.items() if c not in PRE_FILL_COLUMNS]
+
+    if pre_fill:
+        lf = lf.with_columns(pre_fill)
+    if post_fill:
+        filled = [c for c in value_maps if c not in PRE_FILL_COLUMNS]
+        lf = lf.with_columns(pl.col(filled).fill_null("0")).with_columns(post_fill)
+    return lf
+
+# === CORE LOGIC ===
+
+FINGERPRINT_COLUMN = "_fingerprint"
+
+def collect(lf: pl.LazyFrame, streaming: bool = False, chunk_size: int = 10000) -> pl.DataFrame:
+    """Execute a plan, in chunk_size batches on the streaming engine if requested"""
+    if streaming:
+        # Scoped so importing callers keep their own Polars config
+        with pl.Config(streaming_chunk_size=chunk_size):
+            return lf.collect(engine="streaming")
+    return lf.collect()
+
+def row_fingerprint_expr(columns: list) -> pl.Expr:
+    """Hash the raw cell values of every row"""
+    return pl.struct(columns).hash(seed=0).alias(FINGERPRINT_COLUMN)
+
+def incremental_state_key(columns: list, reference: ReferenceData, pinned: Dict[str, Dict[str, str]]) -> str:
+    """Key that invalidates cached rows when code, rules, reference data or operator pins change"""
+    return reference_fingerprint(
+        [os.path.abspath(__file__), Config.NORMALIZATION_CONFIG, reference.countries_path, reference.cities_path],
+        extra=f"polars={pl.__version__};columns={json.dumps(columns)};pinned={json.dumps(pinned, sort_keys=True)}",
+    )
+
+def load_incremental_state(config: Config, key: str) -> Optional[tuple]:
+    """Return a scan of the previously normalized rows and their count if built with the same key"""
+    try:
+        with open(config.INCREMENTAL_STATE_KEY, "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("key") != key or not os.path.exists(config.INCREMENTAL_STATE):
+        logging.info("Normalization inputs changed - incremental state discarded")
+        return None
+    return pl.scan_ipc(config.INCREMENTAL_STATE, memory_map=False), meta.get("rows", 0)
+
+def save_incremental_state(config: Config, df: pl.DataFrame, key: str):
+    """Store normalized rows with their raw fingerprints for the next run"""
+    try:
+        os.makedirs(os.path.dirname(config.INCREMENTAL_STATE), exist_ok=True)
+        tmp_path = f"{config.INCREMENTAL_STATE}.tmp"
+        df.write_ipc(tmp_path, compression="uncompressed")
+        os.replace(tmp_path, config.INCREMENTAL_STATE)
+        with open(config.INCREMENTAL_STATE_KEY, "w") as f:
+            json.dump({"key": key, "rows": df.height}, f)
+    except Exception as e:
+        logging.error(f"Failed to save incremental state: {e}")
+
+def scan_raw_operations(workbook_path: str, config: Config, metrics: RunMetrics, refresh_cache: bool = False) -> pl.LazyFrame:
+    """Plan for the raw sheet trimmed to the operations columns"""
+    with metrics.stage("read_excel") as stage:
+        lf = scan_excel_cached(
+            workbook_path,
+            config.EXCEL_SHEET,
+            config.EXCEL_CACHE_DIR,
+            refresh=refresh_cache,
+            infer_schema_length=0,  # read all as strings
+        )
+        columns = lf.collect_schema().names()
+        row_count = lf.select(pl.len()).collect().item()
+        stage["rowsOut"] = row_count
+    logging.info(f"Loaded {row_count} rows from Excel")
+
+    # Strip whitespace from column names
+    logging.info("Trimming to 'Remarks' column...")
+    stripped = [col.strip() for col in columns]
+    if "Remarks" not in stripped:
+        raise ValueError("'Remarks' column not found")
+    remarks_index = stripped.index("Remarks")
+
+    logging.info("Dropping final row (assumed marker) and first 4 columns...")
+    return (
+        lf.select(columns[4:remarks_index + 1])
+        .rename({col: col.strip() for col in columns[4:remarks_index + 1]})
+        .slice(0, max(row_count - 1, 0))
+    )
+
+def normalize_incremental(
+    raw: pl.LazyFrame,
+    resolver: Resolver,
+    config: Config,
+    metrics: RunMetrics,
+    full_rebuild: bool = False,
+    streaming: bool = False,
+) -> pl.DataFrame:
+    """Normalize only rows whose raw fingerprint is not in the previous run's state"""
+    columns = raw.collect_schema().names()
+    key = incremental_state_key(columns, resolver.reference, resolver.resolution_cache.pinned)
+    raw = raw.with_row_index("_row").with_columns(row_fingerprint_expr(columns))
+    state = None if full_rebuild else load_incremental_state(config, key)
+
+    known = None
+    if state is None:
+        logging.info("Full rebuild: normalizing all rows")
+        changed = raw
+    else:
+        known = state[0].unique(FINGERPRINT_COLUMN, keep="first")
+        changed = raw.join(known.select(FINGERPRINT_COLUMN), on=FINGERPRINT_COLUMN, how="anti")
+
+    # Row index and fingerprint ride along untouched: only the normalized columns are rewritten
+    plan = normalize_rows(changed, column_normalizers(resolver), metrics).with_columns(pl.lit(False).alias("_reused"))
+    if known is not None:
+        reused = (
+            raw.select("_row", FINGERPRINT_COLUMN)
+            .join(known, on=FINGERPRINT_COLUMN, how="inner")
+            .with_columns(pl.lit(True).alias("_reused"))
+        )
+        plan = pl.concat([plan, reused], how="diagonal_relaxed")
+
+    df = collect(plan.sort("_row").drop("_row"), streaming=streaming, chunk_size=config.CHUNK_SIZE)
+
+    reused_count = int(df["_reused"].sum())
+    metrics.cache("incremental_state", hits=reused_count, misses=df.height - reused_count)
+    if state is not None:
+        logging.info(
+            f"Incremental: {reused_count} rows reused, {df.height - reused_count} new or changed, "
+            f"{max(state[1] - reused_count, 0)} previous rows no longer present"
+        )
+    df = df.drop("_reused")
+    save_incremental_state(config, df, key)
+
+    # Reused rows never reach the normalizers, so anomalies are collected over all rows
+    reported = [column for column in ("Country", "Location") if column in columns]
+    distinct = pl.collect_all([raw.select(distinct_values_expr(column)) for column in reported])
+    values = {column: frame.to_series().to_list() for column, frame in zip(reported, distinct)}
+    resolver.record_anomalies(values.get("Country", []), values.get("Location", []))
+    return df.drop(FINGERPRINT_COLUMN)
+
+def save_resolution_cache(resolution_cache: ResolutionCache):
+    """Persist fuzzy resolutions for the next run"""
+    try:
+        resolution_cache.save()
+    except Exception as e:
+        logging.error(f"Failed to save resolution cache: {e}")
+
+# === OUTPUTS ===
+def publish(df: pl.DataFrame, config: Config, metrics: RunMetrics) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    """Write the configured output formats, rollups and manifest; returns entries keyed by GitHub target and the manifest entry"""
+    published = {}
+
+    if "legacy" in config.OUTPUT_FORMATS:
+        # Same bytes as json.dumps(df.to_dicts(), indent=2), streamed in CHUNK_SIZE batches
+        previous = None
+        if "delta" in config.OUTPUT_FORMATS:
+            with metrics.stage("read_previous_build"):
+                previous = load_previous_build(config.OUTPUT_FULL_JSON, config.OUTPUT_DELTA_CHAIN_JSON, df.schema)
+        with metrics.stage("write_legacy", rows_in=df.height) as stage:
+            published[config.TARGET_FULL_JSON] = write_artifact_chunks(
+                config.OUTPUT_FULL_JSON, iter_records_json(df, config.CHUNK_SIZE), records=df.height
+            )
+            stage["bytes"] = published[config.TARGET_FULL_JSON]["bytes"]
+
+        if "delta" in config.OUTPUT_FORMATS:
+            # Small patches so clients can catch up without re-downloading everything
+            with metrics.stage("write_delta", rows_in=df.height):
+                published[config.TARGET_DELTA_CHAIN_JSON] = publish_delta(
+                    previous,
+                    df,
+                    published[config.TARGET_FULL_JSON]["sha256"],
+                    config.OUTPUT_DELTA_CHAIN_JSON,
+                    config.OUTPUT_DELTA_DIR,
+                    config.DELTA_CHAIN_LENGTH,
+                )
+    elif "delta" in config.OUTPUT_FORMATS:
+        logging.warning("Delta output requires the legacy format, skipping deltas")
+
+    if "columnar" in config.OUTPUT_FORMATS:
+        with metrics.stage("write_columnar", rows_in=df.height) as stage:
+            content = columnar_json.dumps(df).encode("utf-8")
+            published[config.TARGET_COLUMNAR_JSON] = write_artifact(
+                config.OUTPUT_COLUMNAR_JSON, content, records=df.height
+            )
+            stage["bytes"] = len(content)
+
+    # Pre-aggregated counts so chart views don't aggregate raw records
+    with metrics.stage("write_rollups", rows_in=df.height) as stage:
+        content = rollups.dumps(df).encode("utf-8")
+        published[config.TARGET_ROLLUPS_JSON] = write_artifact(config.OUTPUT_ROLLUPS_JSON, content)
+        stage["bytes"] = len(content)
+
+    manifest = write_manifest(
+        config.OUTPUT_MANIFEST_JSON,
+        {os.path.basename(target): entry for target, entry in published.items()},
+    )
+    return published, manifest
+
+# === PIPELINE ===
+class RunResult:
+    """What one process() call produced"""
+
+    def __init__(self, df: pl.DataFrame, report: AnomalyReport, metrics: RunMetrics):
+        self.df = df
+        self.report = report
+        self.metrics = metrics
+
+class Pipeline:
+    """Workbook -> normalized, typed operations frame, reusing reference data across runs"""
+
+    def __init__(self, config: Optional[Config] = None, reference: Optional[ReferenceData] = None):
+        self.config = config or Config()
+        self.reference = reference or ReferenceData()
+
+    def process(
+        self,
+        workbook_path: Optional[str] = None,
+        refresh_cache: Optional[bool] = None,
+        full_rebuild: Optional[bool] = None,
+        streaming: Optional[bool] = None,
+        metrics: Optional[RunMetrics] = None,
+    ) -> RunResult:
+        """Read, normalize and cast the workbook (config.EXCEL_PATH by default)
+
+        Options left as None take their config value. Raises on any failure;
+        the incremental state and resolution cache are saved on success.
+        """
+        config = self.config
+        workbook_path = workbook_path or config.EXCEL_PATH
+        metrics = metrics or RunMetrics("generate_json")
+        report = AnomalyReport()
+
+        with metrics.stage("load_reference"):
+            # Only the first run of a pipeline reads and indexes the reference lists
+            self.reference.load()
+            # Fuzzy resolutions persisted across runs; invalidated when reference data changes
+            resolution_cache = ResolutionCache(config.RESOLUTION_CACHE_JSON, self.reference.fingerprint)
+
+        logging.info("Reading Excel...")
+        if not os.path.exists(workbook_path):
+            raise FileNotFoundError(f"Excel file not found: {workbook_path}")
+
+        raw = scan_raw_operations(
+            workbook_path,
+            config,
+            metrics,
+            refresh_cache=config.REFRESH_EXCEL_CACHE if refresh_cache is None else refresh_cache,
+        )
+        with metrics.stage("normalize") as stage:
+            df = normalize_incremental(
+                raw,
+                Resolver(self.reference, resolution_cache, report),
+                config,
+                metrics,
+                full_rebuild=config.FULL_REBUILD if full_rebuild is None else full_rebuild,
+                streaming=config.STREAMING if streaming is None else streaming,
+            )
+            stage["rowsOut"] = df.height
+
+        logging.info("Casting columns to their declared types...")
+        with metrics.stage("cast", rows_in=df.height) as stage:
+            df, failures = cast_operations(df)
+            stage["rowsOut"] = df.height
+            stage["failedValues"] = sum(failure["count"] for failure in failures.values())
+        report.cast_failures.update(failures)
+        for column, failure in failures.items():
+            logging.warning(f"{failure['count']} '{column}' values failed to cast, e.g. {failure['samples']}")
+
+        metrics.cache("resolution", resolution_cache.hits, resolution_cache.misses)
+        save_resolution_cache(resolution_cache)
+        logging.info(f"Data processing completed: {df.height} records")
+        return RunResult(df, report, metrics)
+
+def process(workbook_path: Optional[str] = None, config: Optional[Config] = None, **options) -> RunResult:
+    """One-off Pipeline(config).process(); keep a Pipeline to reuse reference data between runs"""
+    return Pipeline(config).process(workbook_path, **options)
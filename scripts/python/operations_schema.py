@@ -0,0 +1,116 @@
+"""Declared column types for the MasterData_Operations sheet.
+
+The workbook is read with every column as a string. After normalization,
+`cast_operations` converts the declared columns in one vectorized pass:
+
+- NUMERIC_COLUMNS are parsed strictly (`Year` must be a whole number, and
+  NaN/infinity count as failures)
+- BOOLEAN_COLUMNS map YES/Y/TRUE/1 to true and NO/N/FALSE/0 to false
+- CATEGORICAL_COLUMNS are trimmed and stored as `pl.Categorical`
+
+Empty cells and NULL_MARKERS (`-`, `N/A`, ...) become null. They are not
+filled with "0". A non-empty value that doesn't parse also becomes null, and
+is counted in the cast report with a few sample values so it can be fixed in
+the workbook. Columns that aren't declared, and the columns the normalizers
+already type (`Month`, `Successful`), are left as they are.
+"""
+from typing import Any, Dict, Tuple
+
+import polars as pl
+
+NUMERIC_COLUMNS = {
+    "Year": pl.Int64,
+    "Depth [m]": pl.Float64,
+    "Temperature (degC)": pl.Float64,
+    "Deviation": pl.Float64,
+    "Dif. Pressure [psi]": pl.Float64,
+    "DLS          [deg/30m]": pl.Float64,
+}
+
+BOOLEAN_COLUMNS = [
+    "New Energy Wells",
+    "TLC Replacement Yes/No",
+    "PathFinder Run (Y/N)",
+    "Thor Run (Y/N)",
+    "Jar included in the Toolstring",
+    "Jar Activation",
+]
+
+CATEGORICAL_COLUMNS = [
+    "Wireline Company",
+    "E&A / Dev",
+    "Land / Offshore",
+    "Mud",
+    "Open Hole /Cased Hole",
+    "Bit size / Csg size [inches]",
+    "Main Application",
+    "Probe/Coring Bit Orientation",
+    "Unsuccessful - Downhole Conditions",
+    "Unsuccessful - Wrong Setup",
+]
+
+TRUE_VALUES = ["YES", "Y", "TRUE", "1"]
+FALSE_VALUES = ["NO", "N", "FALSE", "0"]
+NULL_MARKERS = ["", "-", "N/A", "NA", "NONE", "NULL"]
+
+# Distinct failing values kept per column in the cast report
+REPORT_SAMPLES = 5
+
+def cell_text(column: str) -> pl.Expr:
+    """Trimmed cell text, null for empty cells and NULL_MARKERS"""
+    text = pl.col(column).cast(pl.String).str.strip_chars()
+    return pl.when(text.str.to_uppercase().is_in(NULL_MARKERS)).then(None).otherwise(text)
+
+def numeric_expr(column: str, dtype: pl.DataType) -> pl.Expr:
+    value = cell_text(column).cast(pl.Float64, strict=False)
+    # "nan"/"inf" parse as floats but have no JSON form; they fail like any other bad value
+    value = pl.when(value.is_finite()).then(value)
+    if dtype == pl.Int64:
+        value = pl.when(value == value.floor()).then(value.cast(pl.Int64))
+    return value.alias(column)
+
+def boolean_expr(column: str) -> pl.Expr:
+    text = cell_text(column).str.to_uppercase()
+    return (
+        pl.when(text.is_in(TRUE_VALUES)).then(True)
+        .when(text.is_in(FALSE_VALUES)).then(False)
+        .alias(column)
+    )
+
+def categorical_expr(column: str) -> pl.Expr:
+    return cell_text(column).cast(pl.Categorical).alias(column)
+
+def cast_exprs(columns: list) -> Dict[str, pl.Expr]:
+    """Cast expression for each declared column present in the frame"""
+    exprs = {}
+    for column in columns:
+        if column in NUMERIC_COLUMNS:
+            exprs[column] = numeric_expr(column, NUMERIC_COLUMNS[column])
+        elif column in BOOLEAN_COLUMNS:
+            exprs[column] = boolean_expr(column)
+        elif column in CATEGORICAL_COLUMNS:
+            exprs[column] = categorical_expr(column)
+    return exprs
+
+def cast_operations(df: pl.DataFrame) -> Tuple[pl.DataFrame, Dict[str, Dict[str, Any]]]:
+    """Cast the declared columns; returns the typed frame and {column: {"count", "samples"}} of failed values"""
+    exprs = cast_exprs(df.columns)
+    failed = {column: cell_text(column).is_not_null() & expr.is_null() for column, expr in exprs.items()}
+
+    typed, failures = pl.collect_all([
+        df.lazy().with_columns(list(exprs.values())),
+        df.lazy().select(
+            [mask.sum().alias(f"{column}.count") for column, mask in failed.items()]
+            + [
+                cell_text(column).filter(mask).unique(maintain_order=True).head(REPORT_SAMPLES).implode().alias(f"{column}.samples")
+                for column, mask in failed.items()
+            ]
+        ),
+    ])
+
+    report = {}
+    row = failures.row(0, named=True) if failed else {}
+    for column in failed:
+        if row[f"{column}.count"]:
+            report[column] = {"count": row[f"{column}.count"], "samples": row[f"{column}.samples"]}
+    return typed, report
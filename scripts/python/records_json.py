@@ -0,0 +1,70 @@
+"""Array-of-records JSON written straight from a Polars frame.
+
+`iter_records_json` yields the bytes of
+`json.dumps(df.to_dicts(), indent=2, allow_nan=False)` without building a
+Python dict per row. Each batch of rows is formatted with Polars string
+expressions. Only the distinct string and float values of a batch go through
+`json.dumps`, so escaping and float formatting match the standard encoder
+exactly. NaN and infinity raise `ValueError`, as the standard encoder does with
+`allow_nan=False`, instead of writing `NaN`/`Infinity`, which `JSON.parse`
+rejects. Integers and booleans are formatted natively.
+Memory is bounded by the batch size, not the record count.
+"""
+import json
+from typing import Iterator
+
+import polars as pl
+
+INDENT = "  "
+
+def value_json(series: pl.Series) -> pl.Series:
+    """JSON text of each value, as json.dumps writes it (null for nulls)"""
+    if series.dtype == pl.Categorical:
+        series = series.cast(pl.String)
+    if series.dtype == pl.Null:
+        return pl.Series(series.name, ["null"] * series.len(), dtype=pl.String)
+    if series.dtype.is_nested():
+        raise TypeError(f"Column '{series.name}' has nested type {series.dtype}, which records JSON doesn't support")
+
+    value = pl.col(series.name)
+    if series.dtype == pl.Boolean:
+        text = pl.when(value).then(pl.lit("true")).when(~value).then(pl.lit("false"))
+    elif series.dtype.is_integer():
+        text = value.cast(pl.String)
+    else:
+        distinct = series.drop_nulls()
+        if series.dtype.is_float() and not distinct.is_finite().all():
+            raise ValueError(f"Column '{series.name}' has NaN or infinite values, which are not valid JSON")
+        distinct = distinct.unique(maintain_order=True)
+        encoded = pl.Series([json.dumps(v, allow_nan=False) for v in distinct.to_list()], dtype=pl.String)
+        text = value.replace_strict(distinct, encoded, default=None, return_dtype=pl.String)
+        if series.dtype.is_float():
+            # unique() folds 0.0 and -0.0 together
+            text = (
+                pl.when((value == 0) & (1 / value < 0)).then(pl.lit("-0.0"))
+                .when(value == 0).then(pl.lit("0.0"))
+                .otherwise(text)
+            )
+    return series.to_frame().select(text.fill_null("null").alias(series.name)).to_series()
+
+def encode_batch(df: pl.DataFrame) -> str:
+    """Records of a batch as indented JSON objects joined by commas (no brackets)"""
+    if df.width == 0:
+        return ",\n".join([f"{INDENT}{{}}"] * df.height)
+    fields = [
+        pl.lit(f"{INDENT * 2}{json.dumps(column)}: ") + value_json(df[column])
+        for column in df.columns
+    ]
+    row = pl.concat_str([pl.lit(f"{INDENT}{{\n"), pl.concat_str(fields, separator=",\n"), pl.lit(f"\n{INDENT}}}")])
+    return pl.select(row.str.join(",\n")).item()
+
+def iter_records_json(df: pl.DataFrame, batch_size: int = 10000) -> Iterator[bytes]:
+    """Yield `json.dumps(df.to_dicts(), indent=2, allow_nan=False)` as UTF-8 chunks, one per batch of rows"""
+    if df.height == 0:
+        yield b"[]"
+        return
+    yield b"[\n"
+    for offset in range(0, df.height, batch_size):
+        separator = ",\n" if offset else ""
+        yield (separator + encode_batch(df.slice(offset, batch_size))).encode("utf-8")
+    yield b"\n]"
@@ -0,0 +1,110 @@
+"""On-disk cache of fuzzy country/location resolutions shared across runs.
+
+The cache file maps raw values to the value they resolved to, per kind
+("country" / "location"), and records whether the resolution was a fuzzy
+match or an unknown value. It is stamped with a content hash of the reference
+lists and `normalization_config.py`; when any of them change the cached
+entries are dropped and rebuilt on the next run.
+
+Operators can pin resolutions by editing the "pinned" section, e.g.
+
+    "pinned": {"country": {"Guyanna": "Guyana"}, "location": {}}
+
+Pinned entries take precedence over everything else, including the
+`normalization_config.py` mappings and exact reference matches, and survive
+invalidation.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional
+
+CACHE_FORMAT_VERSION = 1
+KINDS = ("country", "location")
+
+def reference_fingerprint(paths: Iterable[str], extra: str = "") -> str:
+    """Hash the content of the files a resolution depends on"""
+    digest = hashlib.sha256(f"v{CACHE_FORMAT_VERSION}:{extra}".encode())
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+class ResolutionCache:
+    """Raw value -> resolved value cache, invalidated by reference fingerprint"""
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.pinned: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+        self.entries: Dict[str, Dict[str, dict]] = {kind: {} for kind in KINDS}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            self._dirty = True
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable resolution cache {self.path}: {e}")
+            self._dirty = True
+            return
+
+        for kind in KINDS:
+            self.pinned[kind] = dict(data.get("pinned", {}).get(kind, {}))
+
+        if data.get("fingerprint") != self.fingerprint:
+            logging.info("Reference data changed - invalidating resolution cache entries")
+            self._dirty = True
+            return
+
+        for kind in KINDS:
+            self.entries[kind] = dict(data.get("entries", {}).get(kind, {}))
+        logging.info(
+            f"Loaded resolution cache: {sum(len(v) for v in self.entries.values())} entries, "
+            f"{sum(len(v) for v in self.pinned.values())} pinned"
+        )
+
+    def lookup(self, kind: str, value: str) -> Optional[dict]:
+        """Return {"value", "method"} for a raw value, or None on a miss"""
+        if value in self.pinned[kind]:
+            self.hits += 1
+            return {"value": self.pinned[kind][value], "method": "pinned"}
+        entry = self.entries[kind].get(value)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, kind: str, value: str, resolved: str, method: str):
+        """Record the resolution of a raw value ("fuzzy" or "unknown")"""
+        entry = {"value": resolved, "method": method}
+        if self.entries[kind].get(value) != entry:
+            self.entries[kind][value] = entry
+            self._dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        if not self._dirty:
+            return
+        data = {
+            "version": CACHE_FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "pinned": self.pinned,
+            "entries": self.entries,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        logging.info(f"Saved resolution cache ({self.hits} hits, {self.misses} misses this run)")
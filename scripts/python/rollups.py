@@ -0,0 +1,92 @@
+"""Pre-aggregated rollup cube for the kiosk charts.
+
+The cube is grouped by Region x Country x Year x System. It also holds every
+marginal: each subset of those dimensions, down to the grand total. For each
+group it stores the job count, the success count and the PathFinder/Thor run
+counts. To keep the file small, dimension values are stored once in sorted
+`dictionaries`, and rows are arrays of dictionary codes followed by measures:
+
+    {
+      "version": 1,
+      "dimensions": ["Region", "Country", "Year", "System"],
+      "measures": ["jobs", "successes", "pathfinderRuns", "thorRuns"],
+      "dictionaries": {"Region": ["AFR", "APAC", ...], ...},
+      "groupings": [
+        {"by": ["Region", "Country", "Year", "System"], "rows": [[3, 41, 11, 7, 3, 3, 0, 3], ...]},
+        ...
+        {"by": [], "rows": [[3214, 2809, 396, 21]]}
+      ]
+    }
+"""
+import json
+from itertools import combinations
+from typing import Any, Dict
+
+import polars as pl
+
+ROLLUP_VERSION = 1
+DIMENSIONS = ["Region", "Country", "Year", "System"]
+MEASURES = ["jobs", "successes", "pathfinderRuns", "thorRuns"]
+
+PATHFINDER_COLUMN = "PathFinder Run (Y/N)"
+THOR_COLUMN = "Thor Run (Y/N)"
+
+def run_flag(column: str) -> pl.Expr:
+    """1 when a boolean Y/N run column is true (see operations_schema.BOOLEAN_COLUMNS)"""
+    return pl.col(column).fill_null(False).cast(pl.Int64)
+
+def base_cells(df: pl.DataFrame, dictionaries: Dict[str, pl.Series]) -> pl.DataFrame:
+    """Aggregate to the finest grouping; every marginal is rolled up from this"""
+    codes = [
+        pl.col(d).replace_strict(values, pl.int_range(values.len(), eager=True), return_dtype=pl.Int32).alias(d)
+        for d, values in dictionaries.items()
+    ]
+    flags = [
+        pl.lit(1, dtype=pl.Int64).alias("jobs"),
+        pl.col("Successful").cast(pl.Int64, strict=False).fill_null(0).alias("successes"),
+        (run_flag(PATHFINDER_COLUMN) if PATHFINDER_COLUMN in df.columns else pl.lit(0, dtype=pl.Int64)).alias("pathfinderRuns"),
+        (run_flag(THOR_COLUMN) if THOR_COLUMN in df.columns else pl.lit(0, dtype=pl.Int64)).alias("thorRuns"),
+    ]
+    return (
+        df.lazy()
+        .select(*codes, *flags)
+        .group_by(DIMENSIONS)
+        .agg([pl.col(m).sum() for m in MEASURES])
+        .collect()
+    )
+
+def build_rollups(df: pl.DataFrame) -> Dict[str, Any]:
+    """Compute the full cube of groupings over DIMENSIONS"""
+    missing = [column for column in DIMENSIONS + ["Successful"] if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns for rollups: {missing}")
+
+    dictionaries = {d: df[d].drop_nulls().unique().sort() for d in DIMENSIONS}
+    cells = base_cells(df, dictionaries).lazy()
+    queries = []
+    groupings = []
+    for size in range(len(DIMENSIONS), -1, -1):
+        for by in combinations(DIMENSIONS, size):
+            by = list(by)
+            if by:
+                query = cells.group_by(by).agg([pl.col(m).sum() for m in MEASURES]).sort(by)
+            else:
+                query = cells.select([pl.col(m).sum() for m in MEASURES])
+            queries.append(query)
+            groupings.append(by)
+
+    results = pl.collect_all(queries)
+    return {
+        "version": ROLLUP_VERSION,
+        "dimensions": DIMENSIONS,
+        "measures": MEASURES,
+        "dictionaries": {d: values.to_list() for d, values in dictionaries.items()},
+        "groupings": [
+            {"by": by, "rows": [list(row) for row in result.select(by + MEASURES).rows()]}
+            for by, result in zip(groupings, results)
+        ],
+    }
+
+def dumps(df: pl.DataFrame) -> str:
+    """Serialize the rollup cube to compact JSON"""
+    return json.dumps(build_rollups(df), separators=(",", ":"), ensure_ascii=False, allow_nan=False)
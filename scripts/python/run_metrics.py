@@ -0,0 +1,203 @@
+"""Per-stage run metrics for the data and flipbook pipelines (`run_metrics.json`).
+
+    {
+      "version": 1,
+      "script": "generate_json",
+      "startedAt": "2026-01-05T06:00:02",
+      "wallSeconds": 14.2,
+      "cpuSeconds": 12.9,
+      "peakRssMb": 412.3,
+      "stages": [
+        {"name": "read_excel", "wallSeconds": 0.41, "cpuSeconds": 0.39, "peakRssMb": 180.2, "rowsOut": 3215},
+        {"name": "resolve_values", "parent": "normalize", ...},
+        ...
+      ],
+      "caches": {"resolution": {"hits": 120, "misses": 14, "hitRate": 0.8955}, ...},
+      "summary": {...}
+    }
+
+Stages are timed with `perf_counter` (wall) and `os.times` (CPU of this
+process, plus worker processes that exited during the stage). Peak RSS is the
+high-water mark reached inside the stage. Linux resets it at the start of each
+stage through `/proc/self/clear_refs`; elsewhere it is the process peak so far.
+`workerPeakRssMb` is set when a worker process that exited during the stage
+set a new high for the run's workers. With a profile
+mode, every top-level stage runs under cProfile (`cpu`) or tracemalloc
+(`memory`). The reports are written to `profiles/` next to the metrics file,
+and the slowest (or most allocating) stage is named as the hot stage.
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRICS_VERSION = 1
+PROFILE_MODES = ("cpu", "memory")
+PROFILE_TOP = 30
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def _maxrss_mb(who) -> float:
+    if resource is None:
+        return 0.0
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return resource.getrusage(who).ru_maxrss / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+def _peak_rss_mb() -> float:
+    """High-water RSS of this process since the last reset"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return _maxrss_mb(resource.RUSAGE_SELF) if resource else 0.0
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def _hit_rate(counts: Dict[str, int]) -> Optional[float]:
+    total = counts["hits"] + counts["misses"]
+    return round(counts["hits"] / total, 4) if total else None
+
+class RunMetrics:
+    """Collects stage timings, cache counters and optional profiles for one run"""
+
+    def __init__(self, script: str, profile: Optional[str] = None):
+        self.script = script
+        self.profile = profile
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.stages: List[Dict[str, Any]] = []
+        self.caches: Dict[str, Dict[str, int]] = {}
+        self.profiles: Dict[str, Any] = {}
+        self._start_wall = time.perf_counter()
+        self._start_cpu = _cpu_seconds()
+        self._peak_rss = 0.0
+        self._open: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Time a block; the yielded record takes rowsOut and any other counters"""
+        record: Dict[str, Any] = {"name": name}
+        if self._open:
+            record["parent"] = self._open[-1]["name"]
+            self._open[-1]["_peak"] = max(self._open[-1]["_peak"], _peak_rss_mb())
+        if rows_in is not None:
+            record["rowsIn"] = rows_in
+        self.stages.append(record)
+
+        profiler = None
+        if self.profile == "cpu" and not self._open:
+            profiler = cProfile.Profile()
+        elif self.profile == "memory" and not self._open:
+            tracemalloc.start()
+
+        _reset_peak_rss()
+        record["_peak"] = 0.0
+        self._open.append(record)
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        workers_before = _maxrss_mb(resource.RUSAGE_CHILDREN) if resource else 0.0
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record["wallSeconds"] = round(time.perf_counter() - wall, 4)
+            record["cpuSeconds"] = round(_cpu_seconds() - cpu, 4)
+            self._open.pop()
+            record["peakRssMb"] = round(max(record.pop("_peak"), _peak_rss_mb()), 1)
+            self._peak_rss = max(self._peak_rss, record["peakRssMb"])
+            if self._open:
+                self._open[-1]["_peak"] = max(self._open[-1]["_peak"], record["peakRssMb"])
+            worker_peak = _maxrss_mb(resource.RUSAGE_CHILDREN) if resource else 0.0
+            if worker_peak > workers_before:
+                record["workerPeakRssMb"] = round(worker_peak, 1)
+            if profiler:
+                self.profiles[name] = {"stats": pstats.Stats(profiler), "score": record["wallSeconds"]}
+            elif self.profile == "memory" and not self._open:
+                snapshot = tracemalloc.take_snapshot()
+                _, traced_peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.profiles[name] = {"snapshot": snapshot, "score": traced_peak}
+
+    def cache(self, name: str, hits: int, misses: int):
+        """Add hit/miss counts for a cache (summed over calls)"""
+        counts = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+        counts["hits"] += int(hits)
+        counts["misses"] += int(misses)
+
+    def _write_profiles(self, profile_dir: str) -> Dict[str, Any]:
+        os.makedirs(profile_dir, exist_ok=True)
+        files = {}
+        for name, profile in self.profiles.items():
+            stem = os.path.join(profile_dir, f"{self.script}.{name}")
+            with open(f"{stem}.txt", "w") as f:
+                if "stats" in profile:
+                    profile["stats"].dump_stats(f"{stem}.prof")
+                    profile["stats"].stream = f
+                    profile["stats"].sort_stats("cumulative").print_stats(PROFILE_TOP)
+                else:
+                    f.write(f"Peak traced memory: {profile['score'] / (1 << 20):.1f} MB\n\n")
+                    for stat in profile["snapshot"].statistics("lineno")[:PROFILE_TOP]:
+                        f.write(f"{stat}\n")
+            files[name] = f"{stem}.txt"
+        hot = max(self.profiles, key=lambda name: self.profiles[name]["score"]) if self.profiles else None
+        return {"mode": self.profile, "hotStage": hot, "files": files}
+
+    def payload(self, summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {
+            "version": METRICS_VERSION,
+            "script": self.script,
+            "startedAt": self.started_at,
+            "wallSeconds": round(time.perf_counter() - self._start_wall, 4),
+            "cpuSeconds": round(_cpu_seconds() - self._start_cpu, 4),
+            "peakRssMb": round(max(self._peak_rss, _peak_rss_mb()), 1),
+            "stages": self.stages,
+            "caches": {name: {**counts, "hitRate": _hit_rate(counts)} for name, counts in self.caches.items()},
+            "summary": summary or {},
+        }
+
+    def write(self, path: str, summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Write run_metrics.json (and profile reports) atomically; returns the payload"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        payload = self.payload(summary)
+        if self.profile:
+            payload["profile"] = self._write_profiles(os.path.join(os.path.dirname(os.path.abspath(path)), "profiles"))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, default=str)
+            f.write("\n")
+        os.replace(tmp_path, path)
+        return payload
+
+    def summary_lines(self) -> List[str]:
+        """One aligned line per stage for logs"""
+        lines = [f"{'stage':<24} {'wall s':>8} {'cpu s':>8} {'peak MB':>8}  rows"]
+        for stage in self.stages:
+            name = ("  " if "parent" in stage else "") + stage["name"]
+            rows = " -> ".join(str(stage[k]) for k in ("rowsIn", "rowsOut") if k in stage)
+            lines.append(
+                f"{name:<24} {stage.get('wallSeconds', 0):>8.2f} {stage.get('cpuSeconds', 0):>8.2f} "
+                f"{stage.get('peakRssMb', 0):>8.1f}  {rows}"
+            )
+        return lines
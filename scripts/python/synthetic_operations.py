@@ -0,0 +1,247 @@
+"""Seeded synthetic MasterData_Operations workbooks for benchmarks.
+
+`generate_operations` bootstraps rows from the published
+`public/data/operations_data.json`, so the column set, value frequencies and
+joint distribution of Region, Country, Location and System match the real
+sheet. The rows are then made as messy as the raw workbook:
+
+- Locations and countries are misspelled at LOCATION_TYPO_RATE and
+  COUNTRY_TYPO_RATE (one dropped, swapped, doubled or replaced letter).
+  Typos repeat, about TYPO_REPEATS rows each, and new ones appear as the
+  scale grows, so the fuzzy matchers see more distinct values at scale.
+- Some locations are replaced by cities from `known_cities.json`, some by
+  misspelled cities, and some by names the matchers won't know.
+- The aliases in `normalization_config.py` (UAE, MEA, Helix, ...), month
+  names, Yes/No success words and `-`/`N/A` markers are mixed in.
+- Wells get a suffix per replica, so distinct wells grow with the scale.
+
+`write_workbook` lays the sheet out like the real one, with four leading
+columns, the operations columns up to Remarks, one trailing column and a
+marker row. Excel stops at 1,048,576 rows. For larger frames it writes a
+stub workbook and seeds the sheet cache (`excel_cache.write_excel_cache`)
+with the full frame, so the pipeline reads it like a cached workbook.
+"""
+import argparse
+import json
+import math
+import os
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+import polars as pl
+
+from excel_cache import write_excel_cache
+from normalization_config import COUNTRY_NORMALIZATION, LOCATION_NORMALIZATION, REGION_NORMALIZATION, SYSTEM_GROUPS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+PUBLISHED_JSON = os.path.join(REPO_ROOT, "public", "data", "operations_data.json")
+KNOWN_CITIES_JSON = os.path.join(BASE_DIR, "known_cities.json")
+
+SHEET_NAME = "MasterData_Operations"
+EXCEL_MAX_ROWS = 1_048_576
+# Read options generate_json.py passes to the sheet cache
+READ_OPTIONS = {"infer_schema_length": 0}
+LEADING_COLUMNS = ["ID", "Entered By", "Entered On", "Checked"]
+TRAILING_COLUMNS = ["Follow-up"]
+MARKER = "END"
+
+# Share of rows given each kind of raw-sheet noise
+COUNTRY_TYPO_RATE = 0.02
+COUNTRY_ALIAS_RATE = 0.02
+LOCATION_TYPO_RATE = 0.04
+KNOWN_CITY_RATE = 0.02
+UNKNOWN_LOCATION_RATE = 0.005
+REGION_ALIAS_RATE = 0.01
+SYSTEM_VARIANT_RATE = 0.1
+MONTH_NAME_RATE = 0.3
+SUCCESS_WORD_RATE = 0.1
+MARKER_RATE = 0.02
+TYPO_REPEATS = 10
+
+MONTH_NAMES = ["January", "Feb", "mar", "April", "May", "June", "July", "Aug", "Sept", "October", "Nov", "Dec"]
+SUCCESS_WORDS = {"1": ["Yes", "TRUE", "successful", "1"], "0": ["No", "FALSE", "unsuccessful", "0"]}
+NULL_MARKERS = ["-", "N/A"]
+MARKER_COLUMNS = ["Temperature (degC)", "Dif. Pressure [psi]", "Jar Activation", "Mud"]
+
+def misspell(name: str, rng: random.Random) -> str:
+    """One typing slip: a dropped, swapped, doubled or replaced letter"""
+    letters = [i for i, ch in enumerate(name) if ch.isalpha()]
+    if len(letters) < 3:
+        return name + name[-1:]
+    for _ in range(10):
+        i = rng.choice(letters[1:])
+        kind = rng.randrange(4)
+        if kind == 0:
+            typo = name[:i] + name[i + 1:]
+        elif kind == 1 and i + 1 < len(name):
+            typo = name[:i] + name[i + 1] + name[i] + name[i + 2:]
+        elif kind == 2:
+            typo = name[:i] + name[i] + name[i:]
+        else:
+            typo = name[:i] + rng.choice("aeiounrst") + name[i + 1:]
+        if typo != name:
+            return typo
+    return name + "x"
+
+def raw_text(df: pl.DataFrame) -> pl.DataFrame:
+    """The published frame as sheet text: booleans as YES/NO, whole floats without .0"""
+    exprs = []
+    for column, dtype in df.schema.items():
+        value = pl.col(column)
+        if dtype == pl.Boolean:
+            exprs.append(pl.when(value).then(pl.lit("YES")).when(~value).then(pl.lit("NO")).alias(column))
+        elif dtype.is_float():
+            exprs.append(
+                pl.when(value == value.floor()).then(value.cast(pl.Int64).cast(pl.String))
+                .otherwise(value.cast(pl.String)).alias(column)
+            )
+        else:
+            exprs.append(value.cast(pl.String).alias(column))
+    return df.select(exprs)
+
+def replace_where(column: str, mask: np.ndarray, values) -> pl.Expr:
+    """Swap in `values` (an expression or per-row array) on the rows where `mask` is set"""
+    values = values if isinstance(values, pl.Expr) else pl.Series(values, dtype=pl.String)
+    return pl.when(pl.Series(mask)).then(values).otherwise(pl.col(column)).alias(column)
+
+def with_typos(df: pl.DataFrame, column: str, rate: float, seed: int, rng: np.random.Generator) -> pl.DataFrame:
+    """Misspell `rate` of a column; each typo repeats about TYPO_REPEATS times"""
+    mask = rng.random(df.height) < rate
+    variants = max(1, math.ceil(df.height * rate / TYPO_REPEATS / max(df[column].n_unique(), 1)))
+    keys = pl.DataFrame({
+        column: df[column],
+        "_variant": rng.integers(0, variants, df.height),
+    })
+    pairs = keys.filter(pl.Series(mask) & pl.col(column).is_not_null()).unique()
+    typos = pairs.with_columns(pl.Series("_typo", [
+        misspell(value, random.Random(f"{seed}:{column}:{value}:{variant}"))
+        for value, variant in pairs.iter_rows()
+    ], dtype=pl.String))
+    typo = keys.join(typos, on=[column, "_variant"], how="left", maintain_order="left")["_typo"]
+    return df.with_columns(pl.when(pl.Series(mask) & typo.is_not_null()).then(typo).otherwise(pl.col(column)).alias(column))
+
+def inverse(mapping: Dict[str, str]) -> Dict[str, List[str]]:
+    aliases = {}
+    for raw, normalized in mapping.items():
+        if raw != normalized:
+            aliases.setdefault(normalized, []).append(raw)
+    return aliases
+
+def with_aliases(df: pl.DataFrame, column: str, mapping: Dict[str, str], rate: float, rng: np.random.Generator) -> pl.DataFrame:
+    """Write `rate` of the values that have a raw alias in the config as that alias"""
+    aliases = inverse(mapping)
+    if column not in df.columns or not aliases:
+        return df
+    pick = rng.random(df.height)
+    # Several raw spellings can share a normalized value (System groups), so pick one per row
+    count = pl.col(column).replace_strict(
+        {normalized: len(raws) for normalized, raws in aliases.items()}, default=1, return_dtype=pl.Int64
+    )
+    choice = pl.Series(rng.integers(0, 1 << 30, df.height)) % count
+    alias = pl.concat_str([pl.col(column), pl.lit("\x00"), choice.cast(pl.String)]).replace_strict(
+        {f"{normalized}\x00{i}": raw for normalized, raws in aliases.items() for i, raw in enumerate(raws)},
+        default=None, return_dtype=pl.String,
+    )
+    return df.with_columns(pl.when(pl.Series(pick < rate) & alias.is_not_null()).then(alias).otherwise(pl.col(column)).alias(column))
+
+def generate_operations(scale: float = 1.0, seed: int = 7, published_path: str = PUBLISHED_JSON) -> pl.DataFrame:
+    """Operations rows at `scale` × the published row count, as sheet text (no leading columns or marker)"""
+    base = raw_text(pl.read_json(published_path))
+    rows = max(1, round(base.height * scale))
+    rng = np.random.default_rng(seed)
+    df = base[rng.integers(0, base.height, rows)]
+
+    replicas = max(1, math.ceil(scale))
+    if replicas > 1 and "Well" in df.columns:
+        replica = pl.Series(rng.integers(0, replicas, rows)).cast(pl.String)
+        df = df.with_columns(pl.when(replica != "0").then(pl.concat_str([pl.col("Well"), pl.lit("-R"), replica])).otherwise(pl.col("Well")).alias("Well"))
+
+    with open(KNOWN_CITIES_JSON, "r", encoding="utf-8") as f:
+        cities = [city for city in json.load(f) if city]
+    if "Location" in df.columns:
+        draw = rng.random(rows)
+        city = np.array(cities, dtype=object)[rng.integers(0, len(cities), rows)]
+        df = df.with_columns(replace_where("Location", draw < KNOWN_CITY_RATE, city))
+        unknown = [f"Site {code}" for code in rng.integers(0, max(10, rows // 200), rows)]
+        df = df.with_columns(replace_where("Location", (draw >= KNOWN_CITY_RATE) & (draw < KNOWN_CITY_RATE + UNKNOWN_LOCATION_RATE), unknown))
+        df = with_typos(df, "Location", LOCATION_TYPO_RATE, seed, rng)
+        df = with_aliases(df, "Location", LOCATION_NORMALIZATION, LOCATION_TYPO_RATE, rng)
+    if "Country" in df.columns:
+        df = with_aliases(df, "Country", COUNTRY_NORMALIZATION, COUNTRY_ALIAS_RATE, rng)
+        df = with_typos(df, "Country", COUNTRY_TYPO_RATE, seed, rng)
+    df = with_aliases(df, "Region", REGION_NORMALIZATION, REGION_ALIAS_RATE, rng)
+    df = with_aliases(df, "System", SYSTEM_GROUPS, SYSTEM_VARIANT_RATE, rng)
+
+    if "Month" in df.columns:
+        names = pl.col("Month").cast(pl.Int64, strict=False).replace_strict(
+            {i + 1: name for i, name in enumerate(MONTH_NAMES)}, default=None, return_dtype=pl.String
+        )
+        mask = pl.Series(rng.random(rows) < MONTH_NAME_RATE)
+        df = df.with_columns(pl.when(mask & names.is_not_null()).then(names).otherwise(pl.col("Month")).alias("Month"))
+    if "Successful" in df.columns:
+        word = rng.integers(0, 4, rows)
+        words = pl.concat_str([pl.col("Successful"), pl.lit(":"), pl.Series(word).cast(pl.String)]).replace_strict(
+            {f"{value}:{i}": options[i] for value, options in SUCCESS_WORDS.items() for i in range(4)},
+            default=None, return_dtype=pl.String,
+        )
+        mask = pl.Series(rng.random(rows) < SUCCESS_WORD_RATE)
+        df = df.with_columns(pl.when(mask & words.is_not_null()).then(words).otherwise(pl.col("Successful")).alias("Successful"))
+    for column in MARKER_COLUMNS:
+        if column in df.columns:
+            markers = np.array(NULL_MARKERS, dtype=object)[rng.integers(0, len(NULL_MARKERS), rows)]
+            df = df.with_columns(replace_where(column, rng.random(rows) < MARKER_RATE, markers))
+    return df
+
+def sheet_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """The rows laid out like the raw sheet, as read with every column as a string"""
+    columns = LEADING_COLUMNS + df.columns + TRAILING_COLUMNS
+    sheet = df.with_columns(
+        pl.int_range(1, df.height + 1).cast(pl.String).alias("ID"),
+        *[pl.lit(None, dtype=pl.String).alias(column) for column in LEADING_COLUMNS[1:] + TRAILING_COLUMNS],
+    ).select(columns)
+    marker = pl.DataFrame({"ID": [MARKER]}).select(
+        [pl.col("ID") if column == "ID" else pl.lit(None, dtype=pl.String).alias(column) for column in columns]
+    )
+    return pl.concat([sheet, marker])
+
+def write_workbook(df: pl.DataFrame, path: str, cache_dir: Optional[str] = None) -> str:
+    """Write the sheet as xlsx; beyond Excel's row limit, write a stub and seed `cache_dir`. Returns "xlsx" or "seeded" """
+    import xlsxwriter
+
+    sheet = sheet_frame(df)
+    oversized = sheet.height + 1 > EXCEL_MAX_ROWS
+    if oversized and not cache_dir:
+        raise ValueError(f"{sheet.height} rows exceed Excel's {EXCEL_MAX_ROWS}-row limit; pass a cache dir to seed")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    worksheet = workbook.add_worksheet(SHEET_NAME)
+    worksheet.write_row(0, 0, sheet.columns)
+    rows = sheet.head(1) if oversized else sheet
+    for index, row in enumerate(rows.iter_rows(), start=1):
+        for column, value in enumerate(row):
+            if value is not None:
+                worksheet.write_string(index, column, value)
+    workbook.close()
+
+    if oversized:
+        write_excel_cache(sheet, path, SHEET_NAME, cache_dir, **READ_OPTIONS)
+        return "seeded"
+    return "xlsx"
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic MasterData_Operations workbook")
+    parser.add_argument("--out", required=True, help="Workbook path (.xlsx)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Rows as a multiple of the published row count")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--cache-dir", default=None, help="Sheet cache to seed when the rows exceed Excel's limit (EXCEL_CACHE_DIR)")
+    args = parser.parse_args()
+
+    df = generate_operations(args.scale, args.seed)
+    kind = write_workbook(df, args.out, args.cache_dir)
+    print(f"✅ Wrote {df.height} rows to {args.out}" + (f" (stub; sheet cached in {args.cache_dir})" if kind == "seeded" else ""))
+
+if __name__ == "__main__":
+    main()
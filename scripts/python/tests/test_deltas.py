@@ -0,0 +1,157 @@
+"""Applying a published delta to the previous build must reproduce the new build"""
+import json
+import os
+
+import polars as pl
+
+from artifacts import write_artifact_chunks
+from deltas import load_previous_build, publish_delta
+from records_json import iter_records_json
+
+SCHEMA = {
+    "Year": pl.Int64,
+    "Month": pl.Int64,
+    "Country": pl.String,
+    "Location": pl.String,
+    "Operator": pl.String,
+    "Well": pl.String,
+    "Depth [m]": pl.Float64,
+}
+
+def frame(rows):
+    return pl.DataFrame(rows, schema=SCHEMA, orient="row")
+
+BASE = frame([
+    (2023, 1, "Norway", "Stavanger", "Equinor", "A-1", 1500.0),
+    (2023, 1, "Norway", "Stavanger", "Equinor", "A-1", 1600.0),
+    (2023, 1, "Norway", "Stavanger", "Equinor", "A-1", 1700.0),
+    (2023, 2, "Brazil", "Macaé", "Petrobras", "B-7", None),
+    (2023, 3, "Angola", None, "TotalEnergies", "C-2", 2100.5),
+    (2024, 4, "Malaysia", "Miri", "Petronas", "D-9", 900.0),
+    (2024, 5, "Malaysia", "Miri", "Petronas", "D-10", 950.0),
+    (2024, 6, "Oman", "Muscat", "PDO", "E-3", 1200.0),
+] + [
+    # Unchanged rows, so the edits below stay under MAX_DELTA_RATIO
+    (2022, month, "Norway", "Bergen", "Aker BP", f"W-{month}", 100.0 * month)
+    for month in range(1, 13)
+])
+
+def apply_delta(records, delta):
+    """Python port of applyOperationsDelta in src/lib/operationsDeltas.ts"""
+    positions, occurrences = {}, {}
+    for index, record in enumerate(records):
+        values = [record.get(column) for column in delta["keyColumns"]]
+        base = json.dumps(values)
+        occurrence = occurrences.get(base, 0)
+        occurrences[base] = occurrence + 1
+        positions[json.dumps(values + [occurrence])] = index
+
+    patched = list(records)
+    for change in delta["updated"]:
+        patched[positions[json.dumps(change["key"])]] = change["record"]
+    for key in delta["deleted"]:
+        patched[positions[json.dumps(key)]] = None
+    patched = [record for record in patched if record is not None]
+    for change in delta["inserted"]:
+        patched.insert(change["index"], change["record"])
+    assert len(patched) == delta["rowCount"]
+    return patched
+
+class Publisher:
+    """Publishes builds the way operations_pipeline.publish does"""
+
+    def __init__(self, tmp_path, chain_length=30):
+        self.data_path = str(tmp_path / "operations_data.json")
+        self.chain_path = str(tmp_path / "operations_deltas.json")
+        self.delta_dir = str(tmp_path / "deltas")
+        self.chain_length = chain_length
+
+    def publish(self, df):
+        previous = load_previous_build(self.data_path, self.chain_path, df.schema)
+        entry = write_artifact_chunks(self.data_path, iter_records_json(df), records=df.height)
+        return publish_delta(previous, df, entry["sha256"], self.chain_path, self.delta_dir, self.chain_length)
+
+    def records(self):
+        with open(self.data_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def chain(self):
+        with open(self.chain_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def delta(self, entry):
+        with open(os.path.join(os.path.dirname(self.chain_path), entry["file"]), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+def assert_round_trip(publisher, previous, current):
+    publisher.publish(previous)
+    before = publisher.records()
+    publisher.publish(current)
+    chain = publisher.chain()
+    delta = publisher.delta(chain["deltas"][-1])
+    assert apply_delta(before, delta) == publisher.records() == json.loads(json.dumps(current.to_dicts()))
+    return delta
+
+def test_duplicate_keys_are_told_apart_by_occurrence(tmp_path):
+    # Drop the first A-1 duplicate, change the second and append a new one
+    current = pl.concat([
+        BASE[1:2].with_columns(pl.lit(1650.0).alias("Depth [m]")),
+        BASE[2:],
+        BASE[0:1].with_columns(pl.lit(1800.0).alias("Depth [m]")),
+    ])
+    delta = assert_round_trip(Publisher(tmp_path), BASE, current)
+
+    # Occurrences are positional: the remaining duplicates shift down and the last one is deleted
+    key = [2023, 1, "Norway", "Stavanger", "Equinor", "A-1"]
+    assert delta["deleted"] == [key + [2]]
+    assert [(change["key"], change["record"]["Depth [m]"]) for change in delta["updated"]] == [(key + [0], 1650.0), (key + [1], 1700.0)]
+    assert [(change["index"], change["record"]["Depth [m]"]) for change in delta["inserted"]] == [(19, 1800.0)]
+
+def test_updates_deletes_inserts_and_moves(tmp_path):
+    current = pl.concat([
+        BASE[0:4].with_columns(
+            pl.when(pl.col("Country") == "Brazil").then(pl.lit(3000.0)).otherwise(pl.col("Depth [m]")).alias("Depth [m]")
+        ),
+        BASE[5:6],
+        frame([(2025, 1, "Ghana", "Takoradi", "Tullow", "F-1", 1100.0)]),
+        BASE[7:],  # D-10 is deleted
+        BASE[4:5],  # C-2 moves to the end
+    ])
+    delta = assert_round_trip(Publisher(tmp_path), BASE, current)
+    assert delta["updated"] and delta["deleted"] and delta["inserted"]
+
+def test_chain_versions_and_resets(tmp_path):
+    publisher = Publisher(tmp_path, chain_length=2)
+
+    assert publisher.publish(BASE)["dataVersion"] == 1
+    assert publisher.chain()["deltas"] == []
+
+    # Unchanged build: same version, no delta
+    assert publisher.publish(BASE)["dataVersion"] == 1
+
+    for version, depth in enumerate([1510.0, 1520.0, 1530.0], start=2):
+        before = publisher.records()
+        first_depth = pl.when(pl.int_range(pl.len()) == 0).then(depth).otherwise(pl.col("Depth [m]"))
+        entry = publisher.publish(BASE.with_columns(first_depth.alias("Depth [m]")))
+        assert entry["dataVersion"] == version
+        chain = publisher.chain()
+        assert apply_delta(before, publisher.delta(chain["deltas"][-1])) == publisher.records()
+
+    # Only the last chain_length deltas are kept, on disk too
+    assert [(d["from"], d["to"]) for d in chain["deltas"]] == [(2, 3), (3, 4)]
+    assert sorted(name for name in os.listdir(publisher.delta_dir) if name.endswith(".json")) == [
+        "operations_delta.3.json",
+        "operations_delta.4.json",
+    ]
+
+    # A change touching most rows starts a new chain; clients fetch the full file
+    entry = publisher.publish(BASE.with_columns(pl.col("Depth [m]") * 2))
+    assert entry["dataVersion"] == 5
+    assert publisher.chain()["deltas"] == []
+    assert not any(name.endswith(".json") for name in os.listdir(publisher.delta_dir))
+
+    # A hand-edited data file no longer matches the chain, so the next build restarts it too
+    with open(publisher.data_path, "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert publisher.publish(BASE)["dataVersion"] == 6
+    assert publisher.chain()["deltas"] == []
@@ -0,0 +1,16 @@
+"""The trigram index must pick exactly what difflib would on the real reference lists"""
+import random
+
+import pytest
+
+from fuzzy_matcher import verification_queries, verify_against_difflib
+from operations_pipeline import ReferenceData
+
+@pytest.mark.parametrize("kind", ["countries", "cities"])
+def test_index_matches_difflib(kind):
+    reference = ReferenceData()
+    choices, others = (reference.countries, reference.cities) if kind == "countries" else (reference.cities, reference.countries)
+    queries = verification_queries(choices, others, random.Random(0))
+
+    # Same cutoff the pipeline matches with
+    assert verify_against_difflib(choices, queries, cutoff=reference.cutoff) == []
@@ -0,0 +1,58 @@
+"""Country/location resolution and incremental normalization"""
+import json
+
+import pytest
+
+from operations_pipeline import AnomalyReport, Config, Pipeline, ReferenceData, Resolver
+from resolution_cache import ResolutionCache
+from synthetic_operations import generate_operations, write_workbook
+
+@pytest.fixture(scope="module")
+def reference():
+    return ReferenceData().load()
+
+def make_resolver(reference, cache_path, pinned):
+    cache = ResolutionCache(str(cache_path), reference.fingerprint)
+    cache.pinned.update(pinned)
+    return Resolver(reference, cache, AnomalyReport())
+
+def test_pins_override_config_and_exact_matches(reference, tmp_path):
+    resolver = make_resolver(reference, tmp_path / "cache.json", {
+        "country": {"UAE": "Emirates"},
+        "location": {"Yangoon": "Rangoon", "Aberdeen": "Aberdeen City"},
+    })
+
+    # Config mapping, config mapping and exact reference match respectively
+    assert resolver._country("UAE") == ("UAE", {"value": "Emirates", "method": "pinned"})
+    assert resolver.location("Yangoon") == "Rangoon"
+    assert resolver._location("Aberdeen") == ("Aberdeen", {"value": "Aberdeen City", "method": "pinned"})
+    # Unpinned values still resolve as before
+    assert resolver._country("USA")[1] == {"value": "United States of America", "method": "config"}
+    assert resolver._location("Abidjan")[1] == {"value": "Abidjan", "method": "exact"}
+
+def test_incremental_run_applies_new_pins(tmp_path):
+    workbook = str(tmp_path / "jobhistory.xlsx")
+    write_workbook(generate_operations(scale=0.05, seed=3), workbook)
+    config = Config(
+        EXCEL_PATH=workbook,
+        EXCEL_CACHE_DIR=str(tmp_path / "cache"),
+        RESOLUTION_CACHE_JSON=str(tmp_path / "resolution_cache.json"),
+        OUTPUT_DIR=str(tmp_path / "out"),
+        LOG_DIR=str(tmp_path),
+        FULL_REBUILD=False,
+    )
+    pipeline = Pipeline(config)
+    first = pipeline.process().df
+    country = first["Country"].drop_nulls().mode().sort()[0]
+    rows = int((first["Country"] == country).sum())
+
+    # Pin a raw value that resolved to the most common country
+    with open(config.RESOLUTION_CACHE_JSON, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    cache["pinned"]["country"][country] = "PINNEDLAND"
+    with open(config.RESOLUTION_CACHE_JSON, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+
+    second = pipeline.process().df
+    assert second.height == first.height
+    assert 0 < int((second["Country"] == "PINNEDLAND").sum()) <= rows
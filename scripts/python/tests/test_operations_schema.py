@@ -0,0 +1,41 @@
+"""Typed cast stage: bad values become null and are reported, missing values are just null"""
+import polars as pl
+
+from operations_schema import cast_operations
+
+def test_failed_casts_are_nulled_and_reported():
+    df = pl.DataFrame({
+        "Year": ["2019", "20x9", "2019.5", "20x9", "2021"],
+        "Depth [m]": ["1500.5", "nan", "inf", "deep", "-12"],
+        "Thor Run (Y/N)": ["Y", "no", "maybe", "TRUE", "0"],
+    })
+    typed, report = cast_operations(df)
+
+    assert typed["Year"].to_list() == [2019, None, None, None, 2021]
+    assert typed["Depth [m]"].to_list() == [1500.5, None, None, None, -12.0]
+    assert typed["Thor Run (Y/N)"].to_list() == [True, False, None, True, False]
+    assert report == {
+        "Year": {"count": 3, "samples": ["20x9", "2019.5"]},
+        "Depth [m]": {"count": 3, "samples": ["nan", "inf", "deep"]},
+        "Thor Run (Y/N)": {"count": 1, "samples": ["maybe"]},
+    }
+
+def test_missing_values_are_null_not_failures():
+    df = pl.DataFrame({
+        "Year": ["2019", None, " ", "-"],
+        "Deviation": ["N/A", "12.5", None, "null"],
+        "Jar Activation": [None, "yes", "NA", " n "],
+        "Mud": [" OBM ", "", None, "WBM"],
+        "Well": ["A-1", None, "-", "B-2"],
+    })
+    typed, report = cast_operations(df)
+
+    assert report == {}
+    assert typed.schema["Year"] == pl.Int64
+    assert typed["Year"].to_list() == [2019, None, None, None]
+    assert typed["Deviation"].to_list() == [None, 12.5, None, None]
+    assert typed["Jar Activation"].to_list() == [None, True, None, False]
+    assert typed.schema["Mud"] == pl.Categorical
+    assert typed["Mud"].cast(pl.String).to_list() == ["OBM", None, None, "WBM"]
+    # Undeclared columns are left as they are
+    assert typed["Well"].to_list() == ["A-1", None, "-", "B-2"]
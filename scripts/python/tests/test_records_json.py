@@ -0,0 +1,35 @@
+"""Streamed records JSON must be byte-identical to json.dumps(df.to_dicts(), indent=2)"""
+import json
+
+import polars as pl
+import pytest
+
+from records_json import iter_records_json
+
+def stream(df, batch_size=10000):
+    return b"".join(iter_records_json(df, batch_size=batch_size)).decode("utf-8")
+
+def expected(df):
+    return json.dumps(df.to_dicts(), indent=2)
+
+FRAME = pl.DataFrame({
+    "Country": ["Norway", None, "Côte d'Ivoire", "Türkiye", "日本", 'Quote "and" \\ back', "Tab\there\nnewline", "Norway"],
+    "Year": [2019, 2020, None, 2021, 2022, 2023, 2024, 2019],
+    "Depth": [1234.5, None, 0.1 + 0.2, -0.0, 0.0, 1e-7, 1e21, 3.0],
+    "Successful": [True, False, None, True, False, True, None, True],
+    "Empty": pl.Series([None] * 8, dtype=pl.Null),
+    "System": pl.Series(["Helix", "Helix", None, "Thor", "Helix", "Thor", "Thor", None], dtype=pl.Categorical),
+})
+
+@pytest.mark.parametrize("batch_size", [1, 3, 10000])
+def test_matches_json_dumps(batch_size):
+    assert stream(FRAME, batch_size) == expected(FRAME)
+
+def test_empty_frames():
+    assert stream(FRAME.clear()) == expected(FRAME.clear())
+    assert stream(pl.DataFrame({"a": [1, 2]}).select([])) == "[]"
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_rejects_non_finite_floats(value):
+    with pytest.raises(ValueError, match="NaN or infinite"):
+        stream(pl.DataFrame({"Depth": [1.0, value]}))
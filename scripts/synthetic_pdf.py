@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Write a seeded synthetic multi-page PDF for flipbook benchmarks."""
+import argparse
+import random
+from pathlib import Path
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+# Pages in today's catalog; --scale multiplies this
+BASE_PAGES = 62
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+VOCABULARY = [
+    "PathFinder", "Thor", "Wireline", "Express", "Focus", "Helix", "Rocker", "logging", "conveyance",
+    "deviation", "ledges", "washout", "centralization", "stick-slip", "sampling", "coring", "probe",
+    "Norway", "Malaysia", "Kuwait", "Oman", "Mexico", "Brazil", "Aberdeen", "Dammam", "Villahermosa",
+    "temperature", "pressure", "toolstring", "successful", "run", "well", "offshore", "land", "mud",
+]
+
+
+def font_resources() -> DictionaryObject:
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    return DictionaryObject({NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})})
+
+
+def page_content(index: int, rng: random.Random) -> bytes:
+    """A heading, a few filled figure blocks and wrapped body text, like a catalog page"""
+    ops = [f"BT /F1 24 Tf 56 {PAGE_HEIGHT - 72} Td (Synthetic page {index}) Tj ET"]
+    for _ in range(rng.randint(1, 3)):
+        x, y = rng.randint(40, 300), rng.randint(120, 560)
+        width, height = rng.randint(120, 260), rng.randint(80, 200)
+        red, green, blue = (rng.random() for _ in range(3))
+        ops.append(f"{red:.3f} {green:.3f} {blue:.3f} rg {x} {y} {width} {height} re f")
+        for line in range(0, height, 8):
+            ops.append(f"0 0 0 RG 0.3 w {x} {y + line} m {x + width} {y + line + rng.randint(-6, 6)} l S")
+    ops.append("0 0 0 rg")
+    y = PAGE_HEIGHT - 110
+    for _ in range(rng.randint(8, 16)):
+        words = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(6, 12)))
+        ops.append(f"BT /F1 11 Tf 56 {y} Td ({words}) Tj ET")
+        y -= 16
+    return "\n".join(ops).encode("latin-1")
+
+
+def write_pdf(path: Path, pages: int, seed: int = 7) -> Path:
+    writer = PdfWriter()
+    resources = font_resources()
+    for index in range(1, pages + 1):
+        page = writer.add_blank_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        content = DecodedStreamObject()
+        content.set_data(page_content(index, random.Random(f"{seed}:{index}")))
+        page.replace_contents(content)
+        page[NameObject("/Resources")] = resources
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic multi-page PDF")
+    parser.add_argument("--out", required=True, help="PDF path")
+    parser.add_argument("--scale", type=float, default=1.0, help=f"Pages as a multiple of {BASE_PAGES}")
+    parser.add_argument("--pages", type=int, default=None, help="Exact page count (overrides --scale)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    pages = args.pages or max(1, round(BASE_PAGES * args.scale))
+    write_pdf(Path(args.out), pages, args.seed)
+    print(f"✅ Wrote {pages} pages to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -63,7 +63,17 @@ def xlsx_to_tags_csv(xlsx_path: Path, output_csv: Path) -> None:
     print(f"Converted {xlsx_path.name} -> {output_csv.name} ({df.height} rows)")
 
 
-def build_flipbook(input_pdf: Path, output_dir: Path, title: str, tags: Path | None) -> None:
+def build_flipbook(
+    input_pdf: Path,
+    output_dir: Path,
+    title: str,
+    tags: Path | None,
+    jobs: int = 0,
+    variant_widths: str = "",
+    encode_mode: str = "fixed",
+    thumb_atlas: bool = False,
+    profile: str | None = None,
+) -> None:
     if not input_pdf.exists():
         raise FileNotFoundError(f"Source PDF not found: {input_pdf}")
 
@@ -76,8 +86,21 @@ def build_flipbook(input_pdf: Path, output_dir: Path, title: str, tags: Path | N
         str(output_dir),
         "--title",
         title,
+        "--jobs",
+        str(jobs),
+        "--encode-mode",
+        encode_mode,
     ]
 
+    if variant_widths:
+        cmd.extend(["--variant-widths", variant_widths])
+
+    if thumb_atlas:
+        cmd.extend(["--thumbs", "--thumb-atlas"])
+
+    if profile:
+        cmd.extend(["--profile", profile])
+
     if tags:
         if not tags.exists():
             raise FileNotFoundError(f"Tags CSV not found: {tags}")
@@ -93,6 +116,11 @@ def main() -> None:
     parser.add_argument("--tags-xlsx", default=None, help="Path to success stories summary xlsx (preferred)")
     parser.add_argument("--tags", default=None, help="Path to success stories tags CSV (legacy fallback)")
     parser.add_argument("--skip-validate", action="store_true", help="Skip pnpm validation scripts")
+    parser.add_argument("--jobs", type=int, default=0, help="Render worker processes per flipbook (0 = one per CPU core)")
+    parser.add_argument("--variant-widths", default="", help="Responsive page widths to build, e.g. 320,768,1280,2048")
+    parser.add_argument("--encode-mode", choices=["fixed", "optimize", "search"], default="fixed", help="Image encoding mode passed to build_flipbook.py")
+    parser.add_argument("--thumb-atlas", action="store_true", help="Build thumbnails and pack them into sprite sheets")
+    parser.add_argument("--profile", choices=["cpu", "memory"], default=None, help="Profile each build stage (reports in data/private/metrics/profiles)")
 
     args = parser.parse_args()
 
@@ -117,10 +145,10 @@ def main() -> None:
 
     try:
         print("Building Success Stories flipbook...")
-        build_flipbook(success_pdf, DEFAULT_SUCCESS_OUT, "Success Stories", tags_csv_path)
+        build_flipbook(success_pdf, DEFAULT_SUCCESS_OUT, "Success Stories", tags_csv_path, args.jobs, args.variant_widths, args.encode_mode, args.thumb_atlas, args.profile)
 
         print("Building Catalog flipbook...")
-        build_flipbook(catalog_pdf, DEFAULT_CATALOG_OUT, "Product Catalog", None)
+        build_flipbook(catalog_pdf, DEFAULT_CATALOG_OUT, "Product Catalog", None, args.jobs, args.variant_widths, args.encode_mode, args.thumb_atlas, args.profile)
 
         if not args.skip_validate:
             print("Validating flipbooks...")
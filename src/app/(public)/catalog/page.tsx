@@ -2,7 +2,14 @@
 
 import dynamic from "next/dynamic";
 import { EmailPdfButton } from "@/components/shared/EmailPdfButton";
-import { FLIPBOOK_KEYS, buildFlipbookPageUrls, getFlipbookBasePath } from "@/features/flipbooks";
+import {
+  FLIPBOOK_KEYS,
+  buildFlipbookPageInfo,
+  buildFlipbookPageSources,
+  buildFlipbookPageUrls,
+  getFlipbookBasePath,
+  getFlipbookPageHeight,
+} from "@/features/flipbooks";
 import { useFlipbookManifest } from "@/features/flipbooks/hooks/useFlipbookManifest";
 
 const Flipbook = dynamic(() => import("@/components/shared/pdf/Flipbook"), {
@@ -17,6 +24,8 @@ const Flipbook = dynamic(() => import("@/components/shared/pdf/Flipbook"), {
 export default function CatalogPage() {
   const { manifest } = useFlipbookManifest(FLIPBOOK_KEYS.catalog);
   const pages = manifest ? buildFlipbookPageUrls(FLIPBOOK_KEYS.catalog, manifest) : [];
+  const pageSources = manifest ? buildFlipbookPageSources(FLIPBOOK_KEYS.catalog, manifest) : [];
+  const pageInfo = manifest ? buildFlipbookPageInfo(manifest) : [];
 
   return (
     <main className="min-h-screen bg-gray-100">
@@ -44,7 +53,13 @@ export default function CatalogPage() {
         </div>
         <div className="bg-white rounded-lg shadow-lg p-6">
           {manifest ? (
-            <Flipbook pages={pages} width={600} height={840} />
+            <Flipbook
+              pages={pages}
+              pageSources={pageSources}
+              pageInfo={pageInfo}
+              width={600}
+              height={getFlipbookPageHeight(manifest, 600, 840)}
+            />
           ) : (
             <div className="min-h-[700px] flex items-center justify-center text-gray-600">
               Loading catalog...
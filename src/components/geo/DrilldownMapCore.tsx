@@ -9,7 +9,7 @@ import { useDebounce } from '@/hooks/useDebounce';
 import YearlyStatsChart from '@/components/kiosk/YearlyStatsChart';
 import CountryChart from '@/components/kiosk/CountryChart';
 import MapRenderer from '@/components/geo/MapRenderer';
-import { processMapData, calculateCountryStats } from '@/lib/maps';
+import { processMapData, calculateCountryStats, isPathfinderRun } from '@/lib/maps';
 import type { CountryStats, ProcessedMapData } from '@/types/MapTypes';
 import { MAP_CONSTANTS } from '@/constants/mapConstants';
 
@@ -98,10 +98,11 @@ const DrilldownMapCore = memo(function DrilldownMapCore({
     
     const yearGroups = countryData.reduce((acc: Record<string, number>, d: JobRecord) => {
       const year = d.Year;
+      if (year === null) return acc;
       if (!acc[year]) acc[year] = 0;
       
       if (isPathfinderOnly) {
-        acc[year] += (d['PathFinder Run (Y/N)'] || '').trim().toUpperCase() === 'YES' ? 1 : 0;
+        acc[year] += isPathfinderRun(d) ? 1 : 0;
       } else {
         acc[year] += +d.Successful || 0;
       }
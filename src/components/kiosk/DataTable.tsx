@@ -14,6 +14,12 @@ const monthNames = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep
 
 /* Operation type imported from useOperationsData hook */
 
+// Text shown (and filtered on) for a cell: Yes/No for the typed boolean columns, blank for null
+function cellText(value: unknown): string {
+  if (typeof value === 'boolean') return value ? 'Yes' : 'No';
+  return typeof value === 'string' || typeof value === 'number' ? value.toString() : '';
+}
+
 export default function DataTableFull() {
   const { data: rawData } = useOperationsData<Operation>();
   const [columnFilters, setColumnFilters] = useState<Record<string, string>>({});
@@ -59,12 +65,7 @@ export default function DataTableFull() {
             )}
           </div>
         ),
-        cell: ({ getValue }) => {
-          const value = getValue();
-          return typeof value === 'string' || typeof value === 'number'
-            ? value.toString()
-            : '';
-        },
+        cell: ({ getValue }) => cellText(getValue()),
       };
     });
   }, [data, columnFilters]);
@@ -72,7 +73,7 @@ export default function DataTableFull() {
   const filteredData = useMemo(() => {
     return data.filter((row) =>
       Object.entries(columnFilters).every(([key, filterValue]) =>
-        row[key]?.toString().toLowerCase().includes((filterValue as string).toLowerCase())
+        cellText(row[key]).toLowerCase().includes((filterValue as string).toLowerCase())
       )
     );
   }, [data, columnFilters]);
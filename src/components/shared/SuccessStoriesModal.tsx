@@ -3,7 +3,13 @@
 import { useEffect } from "react";
 import { motion, AnimatePresence } from "framer-motion";
 import dynamic from "next/dynamic";
-import { FLIPBOOK_KEYS, buildFlipbookPageUrls } from "@/features/flipbooks";
+import {
+  FLIPBOOK_KEYS,
+  buildFlipbookPageInfo,
+  buildFlipbookPageSources,
+  buildFlipbookPageUrls,
+  getFlipbookPageHeight,
+} from "@/features/flipbooks";
 import { useFlipbookManifest } from "@/features/flipbooks/hooks/useFlipbookManifest";
 
 const Flipbook = dynamic(() => import("@/components/shared/pdf/Flipbook"), {
@@ -18,6 +24,8 @@ interface Props {
 export default function SuccessStoriesModal({ onClose }: Props) {
   const { manifest } = useFlipbookManifest(FLIPBOOK_KEYS.successStories);
   const pages = manifest ? buildFlipbookPageUrls(FLIPBOOK_KEYS.successStories, manifest) : [];
+  const pageSources = manifest ? buildFlipbookPageSources(FLIPBOOK_KEYS.successStories, manifest) : [];
+  const pageInfo = manifest ? buildFlipbookPageInfo(manifest) : [];
 
   useEffect(() => {
     const listener = (e: KeyboardEvent) => {
@@ -64,7 +72,13 @@ export default function SuccessStoriesModal({ onClose }: Props) {
           {/* Flipbook Content */}
           <div className="h-[calc(100%-5rem)] overflow-auto bg-gray-100 flex items-center justify-center">
             {manifest ? (
-              <Flipbook pages={pages} width={500} height={700} />
+              <Flipbook
+                pages={pages}
+                pageSources={pageSources}
+                pageInfo={pageInfo}
+                width={500}
+                height={getFlipbookPageHeight(manifest, 500, 700)}
+              />
             ) : (
               <div className="text-gray-600">Loading flipbook...</div>
             )}
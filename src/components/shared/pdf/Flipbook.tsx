@@ -2,9 +2,17 @@
 
 import { useEffect, useMemo, useRef, useState } from "react";
 import { PageFlip } from "page-flip";
+import type { FlipbookPageInfo, FlipbookPageSource } from "@/features/flipbooks/types";
+
+// Opening pages load eagerly until this many bytes; the rest load when first shown
+const EAGER_LOAD_BYTES = 1_500_000;
 
 type FlipbookProps = {
   pages: string[];
+  /** Optional responsive `<picture>` sources per page (same order as `pages`) */
+  pageSources?: FlipbookPageSource[][];
+  /** Optional recorded size, bytes and placeholder color per page (same order as `pages`) */
+  pageInfo?: (FlipbookPageInfo | undefined)[];
   width?: number;
   height?: number;
   pageNumbers?: number[];
@@ -14,6 +22,8 @@ type FlipbookProps = {
 
 export default function Flipbook({
   pages,
+  pageSources,
+  pageInfo,
   width = 800,
   height = 600,
   pageNumbers,
@@ -53,20 +63,55 @@ export default function Flipbook({
     let cancelled = false;
     setIsLoading(true);
 
+    // With recorded byte sizes, only the opening pages (within a byte budget, at least a spread) load up front
+    let eagerCount = pages.length;
+    if (pageInfo?.length) {
+      let budget = EAGER_LOAD_BYTES;
+      eagerCount = 0;
+      while (eagerCount < pages.length && (eagerCount < 2 || budget >= (pageInfo[eagerCount]?.bytes ?? 0))) {
+        budget -= pageInfo[eagerCount]?.bytes ?? 0;
+        eagerCount += 1;
+      }
+    }
+
     // Create all page elements
     const pageElements: HTMLDivElement[] = [];
-    pages.forEach((src) => {
+    pages.forEach((src, index) => {
       const pageElement = document.createElement("div");
       pageElement.className = "page";
       pageElement.setAttribute("data-density", "hard");
       
       const img = document.createElement("img");
+      const info = pageInfo?.[index];
+      if (info) {
+        // Placeholder color shows until the image has loaded
+        pageElement.style.backgroundColor = info.color;
+        img.width = info.width;
+        img.height = info.height;
+        img.decoding = "async";
+        img.loading = index < eagerCount ? "eager" : "lazy";
+      }
       img.src = src;
       img.style.width = "100%";
       img.style.height = "100%";
       img.style.objectFit = "contain";
       
-      pageElement.appendChild(img);
+      const sources = pageSources?.[index] ?? [];
+      if (sources.length > 0) {
+        // Let the browser pick the smallest adequate variant in the best supported format
+        const picture = document.createElement("picture");
+        sources.forEach(({ type, srcSet }) => {
+          const source = document.createElement("source");
+          source.type = type;
+          source.srcset = srcSet;
+          source.sizes = `${pageWidth}px`;
+          picture.appendChild(source);
+        });
+        picture.appendChild(img);
+        pageElement.appendChild(picture);
+      } else {
+        pageElement.appendChild(img);
+      }
       pageElements.push(pageElement);
     });
 
@@ -133,7 +178,7 @@ export default function Flipbook({
         flipRef.current = null;
       }
     };
-  }, [pages, pageWidth, pageHeight, isMobile, instanceKey]);
+  }, [pages, pageSources, pageInfo, pageWidth, pageHeight, isMobile, instanceKey]);
 
   const goToNextPage = () => {
     if (flipRef.current) {
@@ -40,6 +40,9 @@ export const EXTERNAL_URLS = {
   WORLD_MAP_DATA: '/data/world-110m.json',
   COUNTRY_LABELS: '/data/country_labels.json',
   OPERATIONS_DATA: '/data/operations_data.json',
+  OPERATIONS_DATA_COLUMNAR: '/data/operations_data.columnar.json',
+  DATA_MANIFEST: '/data/data_manifest.json',
+  OPERATIONS_DELTAS: '/data/operations_deltas.json',
 } as const;
 
 // Device types
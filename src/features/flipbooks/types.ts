@@ -1,3 +1,94 @@
+export type FlipbookVariantFormat = 'avif' | 'webp' | 'jpg' | 'png';
+
+/** Responsive page sizes written by build_flipbook.py (`<path>/<width>/<page>.<format>`). */
+export type FlipbookVariants = {
+  path: string;
+  widths: number[];
+  formats: FlipbookVariantFormat[];
+};
+
+type FlipbookImageInfo = {
+  width: number;
+  height: number;
+  bytes: number;
+};
+
+/**
+ * Per-page metadata recorded by build_flipbook.py, so the viewer can lay out the book
+ * and show placeholders before any image arrives. `variants` follows `variants.widths`
+ * (ascending) with the byte size of each format.
+ */
+export type FlipbookPageInfo = FlipbookImageInfo & {
+  color: string;
+  thumb?: FlipbookImageInfo;
+  variants?: (Omit<FlipbookImageInfo, 'bytes'> & { bytes: Partial<Record<FlipbookVariantFormat, number>> })[];
+};
+
+/** One `<source>` of a page `<picture>`: every width of a single format. */
+export type FlipbookPageSource = {
+  type: string;
+  srcSet: string;
+};
+
+/** Size and tile grid of one Deep Zoom level; level 0 is 1x1, the last is full size. */
+export type FlipbookTileLevel = {
+  level: number;
+  width: number;
+  height: number;
+  columns: number;
+  rows: number;
+};
+
+export type FlipbookTilePyramid = {
+  width: number;
+  height: number;
+  levels: FlipbookTileLevel[];
+};
+
+/**
+ * DZI tile pyramids (`<path>/<page>.dzi`, `<path>/<page>_files/<level>/<col>_<row>.<format>`).
+ * `pages[i]` is the index into `pyramids` for page i + 1.
+ */
+export type FlipbookTiles = {
+  path: string;
+  format: string;
+  tileSize: number;
+  overlap: number;
+  dpi: number;
+  pyramids: FlipbookTilePyramid[];
+  pages: number[];
+};
+
+/**
+ * Inverted text index written by build_flipbook.py (`search_index.json`).
+ * `terms[word]` lists `[page, position, ...]` per page containing the word;
+ * positions count words from the start of the page.
+ */
+export type FlipbookSearchIndex = {
+  version: number;
+  pageCount: number;
+  snippets: string[];
+  terms: Record<string, number[][]>;
+};
+
+export type FlipbookAtlasSheet = {
+  file: string;
+  width: number;
+  height: number;
+  bytes: number;
+};
+
+/**
+ * Thumbnail sprite sheets (`<path>/<file>`). `pages[i]` is
+ * `[sheet, x, y, width, height]` for page i + 1.
+ */
+export type FlipbookThumbAtlas = {
+  path: string;
+  format: 'webp' | 'jpg';
+  sheets: FlipbookAtlasSheet[];
+  pages: [number, number, number, number, number][];
+};
+
 export type FlipbookManifest = {
   docKey: string;
   title: string;
@@ -8,4 +99,10 @@ export type FlipbookManifest = {
   thumbsPath?: string | null;
   sourcePdf: string;
   updatedAt?: string;
+  searchIndex?: string;
+  facets?: string;
+  pages?: FlipbookPageInfo[];
+  thumbAtlas?: FlipbookThumbAtlas;
+  variants?: FlipbookVariants;
+  tiles?: FlipbookTiles;
 };
@@ -1,4 +1,9 @@
-import type { FlipbookManifest } from './types';
+import type {
+  FlipbookManifest,
+  FlipbookPageInfo,
+  FlipbookPageSource,
+  FlipbookVariantFormat,
+} from './types';
 import type { FlipbookKey } from './constants';
 import { getFlipbookBasePath } from './constants';
 
@@ -20,3 +25,61 @@ export function buildFlipbookPageUrls(
     getFlipbookPageUrl(docKey, manifest, index + 1)
   );
 }
+
+export function getFlipbookPageInfo(
+  manifest: FlipbookManifest,
+  pageNumber: number
+): FlipbookPageInfo | undefined {
+  return manifest.pages?.[pageNumber - 1];
+}
+
+export function buildFlipbookPageInfo(manifest: FlipbookManifest): (FlipbookPageInfo | undefined)[] {
+  return Array.from({ length: manifest.pageCount }, (_, index) => getFlipbookPageInfo(manifest, index + 1));
+}
+
+/** Page height for a given display width, from the first page's recorded size. */
+export function getFlipbookPageHeight(
+  manifest: FlipbookManifest,
+  width: number,
+  fallbackHeight: number
+): number {
+  const first = getFlipbookPageInfo(manifest, 1);
+  if (!first || first.width <= 0) return fallbackHeight;
+  return Math.round((width * first.height) / first.width);
+}
+
+const VARIANT_MIME_TYPES: Record<FlipbookVariantFormat, string> = {
+  avif: 'image/avif',
+  webp: 'image/webp',
+  jpg: 'image/jpeg',
+  png: 'image/png',
+};
+
+/**
+ * `<picture>` sources for a page, best format first, each with a width-based srcset
+ * so the browser downloads the smallest variant that fills the slot.
+ */
+export function getFlipbookPageSources(
+  docKey: FlipbookKey,
+  manifest: FlipbookManifest,
+  pageNumber: number
+): FlipbookPageSource[] {
+  const variants = manifest.variants;
+  if (!variants || variants.widths.length === 0) return [];
+
+  const pad = String(pageNumber).padStart(manifest.pageDigits, '0');
+  const base = `${getFlipbookBasePath(docKey)}/${variants.path}`;
+  return variants.formats.map((format) => ({
+    type: VARIANT_MIME_TYPES[format],
+    srcSet: variants.widths.map((width) => `${base}/${width}/${pad}.${format} ${width}w`).join(', '),
+  }));
+}
+
+export function buildFlipbookPageSources(
+  docKey: FlipbookKey,
+  manifest: FlipbookManifest
+): FlipbookPageSource[][] {
+  return Array.from({ length: manifest.pageCount }, (_, index) =>
+    getFlipbookPageSources(docKey, manifest, index + 1)
+  );
+}
@@ -8,14 +8,28 @@ import { useDebounce } from '@/hooks/useDebounce';
 import SuccessStoriesFilters from './SuccessStoriesFilters';
 import {
   loadSuccessStoriesData,
+  loadSuccessStoriesFacets,
 } from '../services/successStories.service';
 import {
   getAvailableOptions,
+  getFacetOptions,
+  getFacetPageNumbers,
   getFilteredPageNumbers,
   getTotalStoryCount,
 } from '../services/successStories.shared';
-import type { SuccessStoriesFilters as FiltersState, SuccessStoryRow } from '../types';
-import { FLIPBOOK_KEYS, buildFlipbookPageUrls, getFlipbookBasePath } from '@/features/flipbooks';
+import type {
+  SuccessStoriesFacetIndex,
+  SuccessStoriesFilters as FiltersState,
+  SuccessStoryRow,
+} from '../types';
+import {
+  FLIPBOOK_KEYS,
+  buildFlipbookPageUrls,
+  getFlipbookBasePath,
+  getFlipbookPageHeight,
+  getFlipbookPageInfo,
+  getFlipbookPageSources,
+} from '@/features/flipbooks';
 import { useFlipbookManifest } from '@/features/flipbooks/hooks/useFlipbookManifest';
 
 const Flipbook = dynamic(() => import('@/components/shared/pdf/Flipbook'), {
@@ -35,6 +49,7 @@ interface SuccessStoriesFlipbookProps {
 export default function SuccessStoriesFlipbook({ backHref, backLabel }: SuccessStoriesFlipbookProps) {
   const [filters, setFilters] = useState<FiltersState>({});
   const [csvData, setCsvData] = useState<SuccessStoryRow[]>([]);
+  const [facets, setFacets] = useState<SuccessStoriesFacetIndex | null>(null);
   const [isLoadingData, setIsLoadingData] = useState(true);
   const [loadError, setLoadError] = useState<string | null>(null);
   const [selectedPages, setSelectedPages] = useState<number[]>([]);
@@ -46,9 +61,15 @@ export default function SuccessStoriesFlipbook({ backHref, backLabel }: SuccessS
   const debouncedFilters = useDebounce(filters, 200);
 
   useEffect(() => {
-    loadSuccessStoriesData()
-      .then((data) => {
-        setCsvData(data);
+    // Filter with the precomputed facet index; parse tags.csv only if it hasn't been built
+    loadSuccessStoriesFacets()
+      .catch(() => null)
+      .then(async (index) => {
+        if (index) {
+          setFacets(index);
+        } else {
+          setCsvData(await loadSuccessStoriesData());
+        }
         setIsLoadingData(false);
       })
       .catch((err) => {
@@ -57,14 +78,20 @@ export default function SuccessStoriesFlipbook({ backHref, backLabel }: SuccessS
       });
   }, []);
 
-  const options = useMemo(() => getAvailableOptions(csvData, debouncedFilters), [csvData, debouncedFilters]);
+  const options = useMemo(
+    () => (facets ? getFacetOptions(facets, debouncedFilters) : getAvailableOptions(csvData, debouncedFilters)),
+    [facets, csvData, debouncedFilters]
+  );
 
   const allowedPages = useMemo(
-    () => getFilteredPageNumbers(csvData, debouncedFilters),
-    [csvData, debouncedFilters]
+    () => (facets ? getFacetPageNumbers(facets, debouncedFilters) : getFilteredPageNumbers(csvData, debouncedFilters)),
+    [facets, csvData, debouncedFilters]
   );
 
-  const totalStories = useMemo(() => getTotalStoryCount(csvData), [csvData]);
+  const totalStories = useMemo(
+    () => (facets ? facets.pages.length : getTotalStoryCount(csvData)),
+    [facets, csvData]
+  );
 
   useEffect(() => {
     if (!manifest) return;
@@ -80,6 +107,8 @@ export default function SuccessStoriesFlipbook({ backHref, backLabel }: SuccessS
     const allPages = buildFlipbookPageUrls(FLIPBOOK_KEYS.successStories, manifest).map((url, index) => ({
       pageNumber: index + 1,
       url,
+      sources: getFlipbookPageSources(FLIPBOOK_KEYS.successStories, manifest, index + 1),
+      info: getFlipbookPageInfo(manifest, index + 1),
     }));
 
     const coverPages = new Set<number>([1, allPages.length]);
@@ -89,6 +118,8 @@ export default function SuccessStoriesFlipbook({ backHref, backLabel }: SuccessS
   }, [allowedPages, manifest]);
 
   const pageUrls = useMemo(() => displayPages.map((page) => page.url), [displayPages]);
+  const pageSources = useMemo(() => displayPages.map((page) => page.sources), [displayPages]);
+  const pageInfo = useMemo(() => displayPages.map((page) => page.info), [displayPages]);
   const pageNumbers = useMemo(() => displayPages.map((page) => page.pageNumber), [displayPages]);
 
   const handleToggleSelection = (pageNumber: number) => {
@@ -253,9 +284,11 @@ export default function SuccessStoriesFlipbook({ backHref, backLabel }: SuccessS
           <div className="bg-white rounded-lg shadow-lg p-6">
             <Flipbook
               pages={pageUrls}
+              pageSources={pageSources}
+              pageInfo={pageInfo}
               pageNumbers={pageNumbers}
               width={600}
-              height={800}
+              height={manifest ? getFlipbookPageHeight(manifest, 600, 800) : 800}
               selectedPages={selectedPages}
               onToggleSelect={handleToggleSelection}
             />
@@ -1,10 +1,12 @@
-import type { SuccessStoryRow, SuccessStoriesValidationReport } from '../types';
+import type { SuccessStoryRow, SuccessStoriesFacetIndex, SuccessStoriesValidationReport } from '../types';
 import { buildValidationReport, parseSuccessStoriesTagsCsv } from './successStories.shared';
 import { FLIPBOOK_KEYS } from '@/features/flipbooks';
 
 const TAGS_URL = `/flipbooks/${FLIPBOOK_KEYS.successStories}/tags.csv`;
+const FACETS_URL = `/flipbooks/${FLIPBOOK_KEYS.successStories}/facets.json`;
 
 let cachedData: SuccessStoryRow[] | null = null;
+let cachedFacets: SuccessStoriesFacetIndex | null = null;
 let cachedValidation: SuccessStoriesValidationReport | null = null;
 let hasLoggedValidation = false;
 
@@ -43,6 +45,27 @@ export async function loadSuccessStoriesData(): Promise<SuccessStoryRow[]> {
   return data;
 }
 
+/** Load the precomputed facet index; null when it hasn't been built, so callers can fall back to tags.csv. */
+export async function loadSuccessStoriesFacets(): Promise<SuccessStoriesFacetIndex | null> {
+  if (cachedFacets) return cachedFacets;
+
+  const response = await fetch(FACETS_URL, { cache: 'force-cache' });
+  if (response.status === 404) return null;
+  if (!response.ok) {
+    throw new Error(`Failed to load success stories facets: ${response.status}`);
+  }
+
+  cachedFacets = (await response.json()) as SuccessStoriesFacetIndex;
+
+  // The index carries the build-time report, so tags.csv issues still surface without parsing it
+  if (cachedFacets.validation) {
+    cachedValidation = cachedFacets.validation;
+    logValidationIfNeeded(cachedValidation);
+  }
+
+  return cachedFacets;
+}
+
 export function getValidationReport(): SuccessStoriesValidationReport | null {
   return cachedValidation;
 }
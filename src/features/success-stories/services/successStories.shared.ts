@@ -4,6 +4,8 @@ import type {
   SuccessStoriesFilters,
   SuccessStoriesOptions,
   SuccessStoriesValidationReport,
+  SuccessStoriesFacet,
+  SuccessStoriesFacetIndex,
   OptionWithCount,
 } from '../types';
 
@@ -255,3 +257,60 @@ export function getAvailableOptions(
 export function getTotalStoryCount(data: SuccessStoryRow[]): number {
   return new Set(data.map((row) => row.page)).size;
 }
+
+const FILTER_FACETS = ['areas', 'companies', 'techs'] as const;
+type FilterFacet = (typeof FILTER_FACETS)[number];
+
+function getFacetValuePages(
+  index: SuccessStoriesFacetIndex,
+  facet: SuccessStoriesFacet,
+  selected: string[]
+): Set<number> {
+  const pages = new Set<number>();
+  (index.facets[facet] ?? []).forEach((entry) => {
+    if (selected.includes(entry.value)) entry.pages.forEach((page) => pages.add(page));
+  });
+  return pages;
+}
+
+// Union of the selected values within a facet, intersected across facets
+function intersectFacetPages(
+  index: SuccessStoriesFacetIndex,
+  filters: SuccessStoriesFilters,
+  skip?: FilterFacet
+): number[] {
+  let pages = index.pages;
+  FILTER_FACETS.forEach((facet) => {
+    const selected = filters[facet] ?? [];
+    if (facet === skip || selected.length === 0) return;
+    const allowed = getFacetValuePages(index, facet, selected);
+    pages = pages.filter((page) => allowed.has(page));
+  });
+  return pages;
+}
+
+/** Same result as getFilteredPageNumbers, from the precomputed facet index. */
+export function getFacetPageNumbers(
+  index: SuccessStoriesFacetIndex,
+  filters: SuccessStoriesFilters
+): number[] {
+  return intersectFacetPages(index, filters);
+}
+
+/** Same result as getAvailableOptions, from the precomputed facet index. */
+export function getFacetOptions(
+  index: SuccessStoriesFacetIndex,
+  filters: SuccessStoriesFilters
+): SuccessStoriesOptions {
+  const optionsFor = (facet: FilterFacet): OptionWithCount[] => {
+    const allowed = new Set(intersectFacetPages(index, filters, facet));
+    return (index.facets[facet] ?? [])
+      .map((entry) => ({
+        value: entry.value,
+        count: entry.pages.filter((page) => allowed.has(page)).length,
+      }))
+      .sort((a, b) => a.value.localeCompare(b.value));
+  };
+
+  return { areas: optionsFor('areas'), companies: optionsFor('companies'), techs: optionsFor('techs') };
+}
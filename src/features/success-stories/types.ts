@@ -29,6 +29,35 @@ export interface SuccessStoriesOptions {
   techs: OptionWithCount[];
 }
 
+export type SuccessStoriesFacet =
+  | 'areas'
+  | 'companies'
+  | 'techs'
+  | 'years'
+  | 'countries'
+  | 'category1'
+  | 'category2';
+
+export interface SuccessStoriesFacetValue {
+  value: string;
+  count: number;
+  pages: number[];
+}
+
+/**
+ * Precomputed facet index (`facets.json`, written by scripts/flipbook_facets.py).
+ * Each facet value lists its sorted story pages; `pairs` holds co-occurrence
+ * counts keyed by `"<facet>|<facet>"`. `validation` is the buildValidationReport
+ * result for the same rows (absent in indexes built before it was added).
+ */
+export interface SuccessStoriesFacetIndex {
+  version: number;
+  pages: number[];
+  facets: Partial<Record<SuccessStoriesFacet, SuccessStoriesFacetValue[]>>;
+  pairs: Record<string, { values: [string, string]; count: number }[]>;
+  validation?: SuccessStoriesValidationReport;
+}
+
 export interface SuccessStoriesValidationReport {
   unknownAreas: string[];
   unknownCompanies: string[];
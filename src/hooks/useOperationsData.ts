@@ -1,7 +1,10 @@
-import { useCallback, useEffect, useState } from 'react';
+import { useCallback, useEffect, useRef, useState } from 'react';
 import type { JobRecord } from '@/types/JobRecord';
+import { fetchOperationsRecords } from '@/lib/operationsColumnar';
+import { fetchDataManifest, getOperationsDataVersion, getOperationsDeltaVersion } from '@/lib/dataManifest';
+import { catchUpOperationsRecords, fetchOperationsDeltaChain } from '@/lib/operationsDeltas';
 
-export type Operation = Record<string, string | number>;
+export type Operation = Record<string, string | number | boolean | null>;
 
 interface UseOperationsDataOptions {
   refreshIntervalMs?: number;
@@ -13,16 +16,43 @@ export default function useOperationsData<T = JobRecord>(options: UseOperationsD
   const [data, setData] = useState<T[] | null>(null);
   const [isLoading, setIsLoading] = useState<boolean>(enabled);
   const [error, setError] = useState<Error | null>(null);
+  const versionRef = useRef<string | null>(null);
+  const recordsRef = useRef<T[] | null>(null);
+  const deltaVersionRef = useRef<number | null>(null);
 
   const load = useCallback(async () => {
     try {
       setError(null);
-      const res = await fetch('/data/operations_data.json');
-      if (!res.ok) {
-        throw new Error(`Failed to load operations data: ${res.status}`);
+      // Poll the small manifest and only download the payload when its hash changed
+      const manifest = await fetchDataManifest();
+      const version = getOperationsDataVersion(manifest);
+      if (version !== null && version === versionRef.current) return;
+      const deltaVersion = getOperationsDeltaVersion(manifest);
+
+      // Catch up with the published deltas when we already hold an older version
+      if (recordsRef.current && deltaVersionRef.current !== null && deltaVersion !== null) {
+        const chain = await fetchOperationsDeltaChain();
+        if (chain?.current === deltaVersion) {
+          try {
+            const patched = await catchUpOperationsRecords(recordsRef.current, deltaVersionRef.current, chain);
+            if (patched) {
+              recordsRef.current = patched;
+              deltaVersionRef.current = deltaVersion;
+              versionRef.current = version;
+              setData(patched);
+              return;
+            }
+          } catch {
+            // Records don't match the delta base; fall back to a full download
+          }
+        }
       }
-      const json = (await res.json()) as T[];
+
+      const json = await fetchOperationsRecords<T>();
+      recordsRef.current = json;
+      deltaVersionRef.current = deltaVersion;
       setData(json);
+      versionRef.current = version;
     } catch (err) {
       setError(err instanceof Error ? err : new Error('Unknown error while loading operations data'));
     } finally {
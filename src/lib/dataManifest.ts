@@ -0,0 +1,46 @@
+import { EXTERNAL_URLS } from '@/constants/app';
+
+/**
+ * Content-hash manifest written by scripts/python/artifacts.py.
+ * Polling it (a few hundred bytes) tells clients whether a payload changed.
+ */
+export interface DataArtifact {
+  sha256: string;
+  bytes: number;
+  records?: number;
+  dataVersion?: number;
+  gz?: { bytes: number };
+  br?: { bytes: number };
+}
+
+export interface DataManifest {
+  version: number;
+  artifacts: Record<string, DataArtifact>;
+}
+
+export async function fetchDataManifest(): Promise<DataManifest | null> {
+  try {
+    const response = await fetch(EXTERNAL_URLS.DATA_MANIFEST, { cache: 'no-store' });
+    if (!response.ok) return null;
+    return (await response.json()) as DataManifest;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Version token for the operations payload, or null if the manifest is unavailable.
+ */
+export function getOperationsDataVersion(manifest: DataManifest | null): string | null {
+  if (!manifest) return null;
+  const columnar = manifest.artifacts['operations_data.columnar.json'];
+  const legacy = manifest.artifacts['operations_data.json'];
+  return [columnar?.sha256, legacy?.sha256].filter(Boolean).join(':') || null;
+}
+
+/**
+ * Version number of the operations data in the delta chain, or null if deltas aren't published.
+ */
+export function getOperationsDeltaVersion(manifest: DataManifest | null): number | null {
+  return manifest?.artifacts['operations_deltas.json']?.dataVersion ?? null;
+}
@@ -1,17 +1,12 @@
 import type { JobRecord } from '@/types/JobRecord';
+import { fetchOperationsRecords } from '@/lib/operationsColumnar';
 
 /**
  * Fetch operations data from the public data directory
  * Always fetch fresh operations data so track-record reflects latest generated output
  */
 export async function fetchOperationsData(): Promise<JobRecord[]> {
-  const response = await fetch('/data/operations_data.json');
-  
-  if (!response.ok) {
-    throw new Error(`Failed to load operations_data.json: ${response.status}`);
-  }
-  
-  return response.json();
+  return fetchOperationsRecords<JobRecord>();
 }
 
 /**
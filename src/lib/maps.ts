@@ -22,6 +22,15 @@ export function processMapData(
   };
 }
 
+/**
+ * Whether a job was a PathFinder run (boolean column, or "YES" in files built before typed columns)
+ */
+export function isPathfinderRun(record: JobRecord): boolean {
+  const value: unknown = record['PathFinder Run (Y/N)'];
+  if (typeof value === 'string') return value.trim().toUpperCase() === 'YES';
+  return value === true;
+}
+
 /**
  * Calculate country statistics based on data and filters
  */
@@ -36,7 +45,7 @@ export function calculateCountryStats(
     source,
     (entries) => sum(entries, (d) => {
       if (isPathfinderOnly) {
-        return (d['PathFinder Run (Y/N)'] || '').trim().toUpperCase() === 'YES' ? 1 : 0;
+        return isPathfinderRun(d) ? 1 : 0;
       }
       return +d.Successful || 0;
     }),
@@ -0,0 +1,78 @@
+import { EXTERNAL_URLS } from '@/constants/app';
+import type { JobRecord } from '@/types/JobRecord';
+
+/**
+ * Column-oriented operations payload written by scripts/python/columnar_json.py.
+ * Low-cardinality columns are stored as a dictionary plus integer codes (null may
+ * be a dictionary entry, or a null code in older files), everything else as plain arrays.
+ */
+export type ColumnarValue = string | number | boolean | null;
+
+export type ColumnarColumn =
+  | { name: string; encoding: 'plain'; values: ColumnarValue[] }
+  | { name: string; encoding: 'dictionary'; dictionary: ColumnarValue[]; codes: (number | null)[] };
+
+export interface ColumnarOperations {
+  format: 'operations-columnar';
+  version: number;
+  rowCount: number;
+  columns: ColumnarColumn[];
+}
+
+export const OPERATIONS_COLUMNAR_FORMAT = 'operations-columnar';
+export const OPERATIONS_COLUMNAR_VERSION = 1;
+
+function columnValues(column: ColumnarColumn): ColumnarValue[] {
+  if (column.encoding === 'plain') return column.values;
+  const { dictionary, codes } = column;
+  const values = new Array<ColumnarValue>(codes.length);
+  for (let i = 0; i < codes.length; i += 1) {
+    const code = codes[i];
+    values[i] = code === null ? null : dictionary[code];
+  }
+  return values;
+}
+
+/**
+ * Rebuild the legacy array-of-records layout from a columnar payload.
+ * Records have the same keys, key order and values as operations_data.json.
+ */
+export function decodeColumnarOperations<T = JobRecord>(payload: ColumnarOperations): T[] {
+  if (payload.format !== OPERATIONS_COLUMNAR_FORMAT) {
+    throw new Error(`Unexpected operations data format: ${String(payload.format)}`);
+  }
+  if (payload.version > OPERATIONS_COLUMNAR_VERSION) {
+    throw new Error(`Unsupported operations data version: ${payload.version}`);
+  }
+
+  const names = payload.columns.map((column) => column.name);
+  const columns = payload.columns.map(columnValues);
+  const records = new Array<T>(payload.rowCount);
+
+  for (let row = 0; row < payload.rowCount; row += 1) {
+    const record: Record<string, ColumnarValue> = {};
+    for (let col = 0; col < names.length; col += 1) {
+      record[names[col]] = columns[col][row];
+    }
+    records[row] = record as T;
+  }
+
+  return records;
+}
+
+/**
+ * Load operations records, preferring the compact columnar file and falling back
+ * to the legacy array-of-records file while both are published.
+ */
+export async function fetchOperationsRecords<T = JobRecord>(init?: RequestInit): Promise<T[]> {
+  const columnar = await fetch(EXTERNAL_URLS.OPERATIONS_DATA_COLUMNAR, init);
+  if (columnar.ok) {
+    return decodeColumnarOperations<T>((await columnar.json()) as ColumnarOperations);
+  }
+
+  const legacy = await fetch(EXTERNAL_URLS.OPERATIONS_DATA, init);
+  if (!legacy.ok) {
+    throw new Error(`Failed to load operations data: ${legacy.status}`);
+  }
+  return (await legacy.json()) as T[];
+}
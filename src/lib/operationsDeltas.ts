@@ -0,0 +1,125 @@
+import { EXTERNAL_URLS } from '@/constants/app';
+import type { JobRecord } from '@/types/JobRecord';
+
+/**
+ * Record-level patches between consecutive operations_data.json builds,
+ * written by scripts/python/deltas.py. Rows are keyed by the key columns plus
+ * their occurrence among rows with the same key values, in file order.
+ */
+type RecordValue = string | number | boolean | null;
+type OperationsRecord = Record<string, RecordValue>;
+
+export interface OperationsDelta {
+  format: 'operations-delta';
+  version: number;
+  from: number;
+  to: number;
+  keyColumns: string[];
+  rowCount: number;
+  baseSha256: string;
+  sha256: string;
+  deleted: RecordValue[][];
+  updated: { key: RecordValue[]; record: OperationsRecord }[];
+  inserted: { index: number; record: OperationsRecord }[];
+}
+
+export interface OperationsDeltaChain {
+  format: 'operations-delta-chain';
+  version: number;
+  current: number;
+  sha256: string;
+  deltas: {
+    from: number;
+    to: number;
+    file: string;
+    sha256: string;
+    bytes: number;
+    deleted: number;
+    updated: number;
+    inserted: number;
+  }[];
+}
+
+const OPERATIONS_DELTA_VERSION = 1;
+
+function keyString(values: RecordValue[]): string {
+  return JSON.stringify(values);
+}
+
+/**
+ * Apply one delta to the records of version `delta.from`, returning version `delta.to`.
+ * Throws if the records don't match the delta's base, so callers can fall back to a full fetch.
+ */
+export function applyOperationsDelta<T = JobRecord>(records: T[], delta: OperationsDelta): T[] {
+  if (delta.format !== 'operations-delta' || delta.version > OPERATIONS_DELTA_VERSION) {
+    throw new Error(`Unsupported operations delta: ${String(delta.format)} v${delta.version}`);
+  }
+
+  const positions = new Map<string, number>();
+  const occurrences = new Map<string, number>();
+  records.forEach((record, index) => {
+    const values = delta.keyColumns.map((column) => (record as OperationsRecord)[column] ?? null);
+    const base = keyString(values);
+    const occurrence = occurrences.get(base) ?? 0;
+    occurrences.set(base, occurrence + 1);
+    positions.set(keyString([...values, occurrence]), index);
+  });
+
+  const locate = (key: RecordValue[]): number => {
+    const index = positions.get(keyString(key));
+    if (index === undefined) throw new Error(`Delta v${delta.to} references a missing record`);
+    return index;
+  };
+
+  const next: (T | undefined)[] = records.slice();
+  for (const { key, record } of delta.updated) {
+    next[locate(key)] = record as T;
+  }
+  for (const key of delta.deleted) {
+    next[locate(key)] = undefined;
+  }
+
+  const patched = next.filter((record): record is T => record !== undefined);
+  for (const { index, record } of delta.inserted) {
+    patched.splice(index, 0, record as T);
+  }
+
+  if (patched.length !== delta.rowCount) {
+    throw new Error(`Delta v${delta.to} produced ${patched.length} records, expected ${delta.rowCount}`);
+  }
+  return patched;
+}
+
+export async function fetchOperationsDeltaChain(): Promise<OperationsDeltaChain | null> {
+  try {
+    const response = await fetch(EXTERNAL_URLS.OPERATIONS_DELTAS, { cache: 'no-store' });
+    if (!response.ok) return null;
+    return (await response.json()) as OperationsDeltaChain;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Bring records at `fromVersion` up to date by applying the published deltas.
+ * Returns null when the chain doesn't reach back to `fromVersion`; fetch the full file instead.
+ */
+export async function catchUpOperationsRecords<T = JobRecord>(
+  records: T[],
+  fromVersion: number,
+  chain: OperationsDeltaChain,
+): Promise<T[] | null> {
+  if (chain.current === fromVersion) return records;
+
+  const start = chain.deltas.findIndex((entry) => entry.from === fromVersion);
+  if (start === -1) return null;
+
+  const baseUrl = EXTERNAL_URLS.OPERATIONS_DELTAS.slice(0, EXTERNAL_URLS.OPERATIONS_DELTAS.lastIndexOf('/') + 1);
+  let patched = records;
+  for (const entry of chain.deltas.slice(start)) {
+    const response = await fetch(`${baseUrl}${entry.file}`);
+    if (!response.ok) return null;
+    patched = applyOperationsDelta(patched, (await response.json()) as OperationsDelta);
+  }
+  return patched;
+}
@@ -1,10 +1,26 @@
+/**
+ * One record of operations_data.json, typed by scripts/python/operations_schema.py.
+ * Empty cells and values that failed to cast are null. Columns without a declared
+ * type stay strings, and normalized ones hold "0" for an empty cell.
+ */
 export interface JobRecord {
   Region: string;
   Country: string;
   Location: string;
   Successful: number;
   System: string;
-  Month: number;
-  Year: number;
-  "PathFinder Run (Y/N)": string; // <-- required for the year-wise chart
-}
\ No newline at end of file
+  Month: number | null;
+  Year: number | null;
+  'Depth [m]': number | null;
+  'Temperature (degC)': number | null;
+  Deviation: number | null;
+  'Dif. Pressure [psi]': number | null;
+  'DLS          [deg/30m]': number | null;
+  'New Energy Wells': boolean | null;
+  'TLC Replacement Yes/No': boolean | null;
+  'PathFinder Run (Y/N)': boolean | null; // <-- required for the year-wise chart
+  'Thor Run (Y/N)': boolean | null;
+  'Jar included in the Toolstring': boolean | null;
+  'Jar Activation': boolean | null;
+  [column: string]: string | number | boolean | null;
+}